@@ -5,11 +5,13 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import json
 import math
 import os
 import sqlite3
-import urllib.parse
-import urllib.request
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import closing
 from collections import defaultdict
 from dataclasses import dataclass
@@ -26,7 +28,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib import colormaps, colors
 from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
-from PIL import Image
+from PIL import Image, ImageDraw
+
+# Share the Mapbox image cache and path simplification with the KML plotter in this directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mapbox_cache import DEFAULT_CACHE_DIRECTORY, StaticMapCache  # noqa: E402
+from path_decimation import decimation_indices  # noqa: E402
 
 
 BACKGROUND_COLOUR = "#10151c"
@@ -36,6 +44,11 @@ TEXT_COLOUR = "#e6edf3"
 MUTED_TEXT_COLOUR = "#5f6b76"
 PATH_COLOUR_MAP = "plasma"
 EARTH_RADIUS_METRES = 6_371_000.0
+MAP_PREFETCH_WORKERS = 8
+FLAT_CELL_PIXELS = (480, 480)
+FLAT_PROFILE_FRACTION = 0.2
+FLAT_COLOUR_LEVELS = 32
+MANIFEST_NAME = "contact-sheets-manifest.json"
 
 
 @dataclass(frozen=True)
@@ -93,6 +106,18 @@ def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespac
     parser.add_argument("-od", "--output-directory", type=Path, default=default_output,
                         help="PNG destination directory")
     parser.add_argument("-t", "--token", default=None, help="Mapbox token")
+    parser.add_argument("-mc", "--map-cache", type=Path, default=DEFAULT_CACHE_DIRECTORY,
+                        help="directory caching downloaded Mapbox images")
+    parser.add_argument("-off", "--offline", action="store_true",
+                        help="texture ground planes only from cached Mapbox images")
+    parser.add_argument("-s", "--style", choices=("3d", "flat"), default="3d",
+                        help="perspective cells, or faster top-down cells with an altitude strip")
+    parser.add_argument("-mp", "--max-points", type=positive_integer, default=None,
+                        help="simplify longer flight paths to this many points")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="render every page, ignoring the manifest of unchanged pages")
+    parser.add_argument("-j", "--jobs", type=positive_integer, default=1,
+                        help="pages to render in parallel processes")
     return parser.parse_args(arguments)
 
 
@@ -144,6 +169,125 @@ def resolve_database_path(argument_path: Path | None) -> Path:
     return configured_path
 
 
+def stage_requested_addresses(connection: sqlite3.Connection, addresses: Sequence[str]) -> None:
+    """Create the CONTACT_SHEET_REQUEST temp table holding addresses and their display positions.
+
+    :param connection: Open tracker SQLite connection.
+    :param addresses: Distinct upper-case addresses in display order.
+    :return: None; the caller drops the table once its query has run.
+    """
+    connection.execute(
+        "CREATE TEMP TABLE CONTACT_SHEET_REQUEST (Address TEXT PRIMARY KEY, Position INTEGER NOT NULL)"
+    )
+    connection.executemany(
+        "INSERT INTO temp.CONTACT_SHEET_REQUEST (Address, Position) VALUES (?, ?)",
+        ((address, position) for position, address in enumerate(addresses)),
+    )
+
+
+def load_session_position_stats(
+    connection: sqlite3.Connection,
+    session_id: int,
+    requests: Sequence[AircraftRequest],
+) -> dict[str, tuple]:
+    """Summarise each requested aircraft's positions and callsign without loading them.
+
+    :param connection: Open tracker SQLite connection.
+    :param session_id: Observation session shared by the requests.
+    :param requests: Aircraft requests in the session.
+    :return: Position count, highest position Id, coordinate counts and sums, and callsigns for each address.
+    """
+    # New POSITION rows raise the count or the highest Id. Positions filled in place later, as the
+    # retrospective populator does, change the coordinate counts or sums, and the callsign is drawn
+    # in each cell's title.
+    addresses = list(dict.fromkeys(request.address for request in requests))
+    stage_requested_addresses(connection, addresses)
+    try:
+        rows = connection.execute(
+            """
+            SELECT r.Address, COUNT(p.Id), MAX(p.Id), COUNT(p.Latitude), COUNT(p.Altitude),
+                   TOTAL(p.Latitude), TOTAL(p.Longitude), TOTAL(p.Altitude),
+                   GROUP_CONCAT(DISTINCT NULLIF(UPPER(TRIM(ta.Callsign)), ''))
+            FROM TRACKED_AIRCRAFT AS ta
+            INNER JOIN temp.CONTACT_SHEET_REQUEST AS r ON r.Address = UPPER(ta.Address)
+            LEFT OUTER JOIN POSITION AS p ON p.AircraftId = ta.Id
+            WHERE ta.SessionId = ?
+            GROUP BY r.Address
+            """,
+            (session_id,),
+        ).fetchall()
+    finally:
+        connection.execute("DROP TABLE temp.CONTACT_SHEET_REQUEST")
+    # Round the sums so a different summation order can never look like changed data.
+    stats: dict[str, tuple] = {address: (0, None, 0, 0, 0.0, 0.0, 0.0, None) for address in addresses}
+    for address, *counts, latitude_total, longitude_total, altitude_total, callsigns in rows:
+        totals = (round(latitude_total, 6), round(longitude_total, 6), round(altitude_total, 6))
+        stats[address] = (*counts, *totals, callsigns)
+    return stats
+
+
+def load_session_flight_paths(
+    connection: sqlite3.Connection,
+    session_id: int,
+    requests: Sequence[AircraftRequest],
+) -> list[FlightPath]:
+    """Load the recorded positions and callsigns of several aircraft in one session.
+
+    :param connection: Open tracker SQLite connection.
+    :param session_id: Observation session shared by the requests.
+    :param requests: Aircraft requests in desired display order.
+    :return: One flight path per request, in request order; arrays are empty when no positions exist.
+    """
+    # Stage the requested addresses so one query serves the whole session; the session's
+    # aircraft are scanned once and each is matched on its upper-cased address.
+    addresses = list(dict.fromkeys(request.address for request in requests))
+    stage_requested_addresses(connection, addresses)
+    try:
+        # Values SQLite does not hold as numbers become NULL, so they are rejected below with NaNs.
+        rows = connection.execute(
+            """
+            SELECT r.Position,
+                   NULLIF(UPPER(TRIM(ta.Callsign)), ''),
+                   CASE WHEN typeof(p.Latitude) IN ('integer', 'real') THEN p.Latitude END,
+                   CASE WHEN typeof(p.Longitude) IN ('integer', 'real') THEN p.Longitude END,
+                   CASE WHEN p.Altitude IS NULL THEN 0.0
+                        WHEN typeof(p.Altitude) IN ('integer', 'real') THEN p.Altitude END
+            FROM TRACKED_AIRCRAFT AS ta
+            INNER JOIN temp.CONTACT_SHEET_REQUEST AS r ON r.Address = UPPER(ta.Address)
+            LEFT OUTER JOIN POSITION AS p ON p.AircraftId = ta.Id
+            WHERE ta.SessionId = ?
+            ORDER BY r.Position ASC, p.Timestamp ASC
+            """,
+            (session_id,),
+        ).fetchall()
+    finally:
+        connection.execute("DROP TABLE temp.CONTACT_SHEET_REQUEST")
+
+    # Transpose once and convert every coordinate in a single NumPy call; NULL becomes NaN.
+    columns = list(zip(*rows)) or [(), (), (), (), ()]
+    owners = np.asarray(columns[0], dtype=np.int64)
+    callsigns = columns[1]
+    positions = np.array(columns[2:], dtype=float).reshape(3, -1)
+    positions[2] *= 0.3048
+
+    # Rows arrive grouped by request position, so each aircraft is one contiguous slice.
+    bounds = np.searchsorted(owners, np.arange(len(addresses) + 1))
+    flight_paths: dict[str, FlightPath] = {}
+    for position, address in enumerate(addresses):
+        start, end = int(bounds[position]), int(bounds[position + 1])
+        callsign = next((callsign for callsign in callsigns[start:end] if callsign is not None), "NONE")
+        aircraft_positions = positions[:, start:end]
+        aircraft_positions = aircraft_positions[:, np.isfinite(aircraft_positions).all(axis=0)]
+        flight_paths[address] = FlightPath(
+            address,
+            callsign,
+            aircraft_positions[0],
+            aircraft_positions[1],
+            aircraft_positions[2],
+        )
+    return [flight_paths[request.address] for request in requests]
+
+
 def load_flight_path(connection: sqlite3.Connection, request: AircraftRequest) -> FlightPath:
     """Load one aircraft's recorded positions and callsign.
 
@@ -151,43 +295,7 @@ def load_flight_path(connection: sqlite3.Connection, request: AircraftRequest) -
     :param request: Aircraft address and observation session to query.
     :return: Flight path ready to plot; arrays are empty when no positions exist.
     """
-    # Parameter binding prevents an address or session value from changing query semantics.
-    rows = connection.execute(
-        """
-        SELECT ta.Callsign, p.Latitude, p.Longitude, p.Altitude
-        FROM TRACKED_AIRCRAFT AS ta
-        LEFT OUTER JOIN POSITION AS p ON p.AircraftId = ta.Id
-        WHERE ta.SessionId = ? AND UPPER(ta.Address) = ?
-        ORDER BY p.Timestamp ASC
-        """,
-        (request.session_id, request.address),
-    ).fetchall()
-
-    # Choose the first observed non-empty callsign and independently retain valid coordinates.
-    callsign = next(
-        (str(row[0]).strip().upper() for row in rows if row[0] is not None and str(row[0]).strip()),
-        "NONE",
-    )
-    valid_positions: list[tuple[float, float, float]] = []
-    for row in rows:
-        try:
-            latitude, longitude = float(row[1]), float(row[2])
-            altitude = (float(row[3]) * 0.3048) if row[3] is not None else 0.0
-        except (TypeError, ValueError):
-            continue
-        if math.isfinite(latitude) and math.isfinite(longitude) and math.isfinite(altitude):
-            valid_positions.append((latitude, longitude, altitude))
-
-    positions = np.asarray(valid_positions, dtype=float)
-    if positions.size == 0:
-        positions = np.empty((0, 3), dtype=float)
-    return FlightPath(
-        request.address,
-        callsign,
-        positions[:, 0],
-        positions[:, 1],
-        positions[:, 2],
-    )
+    return load_session_flight_paths(connection, request.session_id, [request])[0]
 
 
 def coordinates_to_local_xy(flight_path: FlightPath) -> tuple[np.ndarray, np.ndarray]:
@@ -221,35 +329,82 @@ def padded_range(values: np.ndarray, padding_ratio: float = 0.06) -> tuple[float
     return minimum - padding, maximum + padding
 
 
-def fetch_ground_map(flight_path: FlightPath, token: str) -> np.ndarray:
-    """Download a Mapbox static map covering a flight path.
+def fetch_ground_map(
+    flight_path: FlightPath, token: str | None, map_cache: StaticMapCache | None = None
+) -> np.ndarray | None:
+    """Fetch a Mapbox static map covering the area a cell draws around a flight path.
 
     :param flight_path: Geographic flight path used to calculate map bounds.
     :param token: Mapbox API access token.
-    :return: RGB image array with its origin at the north-west corner.
+    :param map_cache: Optional on-disk cache; defaults to the shared report cache.
+    :return: RGB image array with its origin at the north-west corner, or None when offline and uncached.
     """
-    # Pad the geographic bounds so the track is not tight against the map edge.
-    latitude_minimum = float(np.min(flight_path.latitudes))
-    latitude_maximum = float(np.max(flight_path.latitudes))
-    longitude_minimum = float(np.min(flight_path.longitudes))
-    longitude_maximum = float(np.max(flight_path.longitudes))
-    latitude_padding = max((latitude_maximum - latitude_minimum) * 0.06, 0.001)
-    longitude_padding = max((longitude_maximum - longitude_minimum) * 0.06, 0.001)
-    south, north = latitude_minimum - latitude_padding, latitude_maximum + latitude_padding
-    west, east = longitude_minimum - longitude_padding, longitude_maximum + longitude_padding
-    bounds = f"[{west},{south},{east},{north}]"
-    quoted_token = urllib.parse.quote(token, safe="")
-    url = (
-        "https://api.mapbox.com/styles/v1/mapbox/outdoors-v12/static/"
-        f"{bounds}/512x512?access_token={quoted_token}"
+    # Request the padded plotting ranges, which the cells stretch the map across, converted back to degrees.
+    x, y = coordinates_to_local_xy(flight_path)
+    x_minimum, x_maximum = padded_range(x)
+    y_minimum, y_maximum = padded_range(y)
+    reference_latitude = float(flight_path.latitudes[0])
+    reference_longitude = float(flight_path.longitudes[0])
+    metres_per_longitude_radian = math.cos(math.radians(reference_latitude)) * EARTH_RADIUS_METRES
+    bounds = (
+        reference_longitude + math.degrees(x_minimum / metres_per_longitude_radian),
+        reference_latitude + math.degrees(y_minimum / EARTH_RADIUS_METRES),
+        reference_longitude + math.degrees(x_maximum / metres_per_longitude_radian),
+        reference_latitude + math.degrees(y_maximum / EARTH_RADIUS_METRES),
     )
-    with urllib.request.urlopen(url, timeout=30) as response:
-        image = Image.open(BytesIO(response.read())).convert("RGB")
+    static_map = (map_cache or StaticMapCache()).fetch("outdoors-v12", "512x512", bounds, token)
+    if static_map is None:
+        return None
+    image = Image.open(BytesIO(static_map.content)).convert("RGB")
+    # The cache widens the bounds to share images, so crop back to the requested area.
+    image = image.crop(tuple(round(edge) for edge in static_map.pixel_box(image.size, bounds)))
     # Downsample because a dense surface in every contact-sheet cell is unnecessarily expensive.
     image.thumbnail((64, 64), Image.Resampling.LANCZOS)
     return np.asarray(image, dtype=float) / 255.0
 
 
+def fetch_ground_map_or_none(
+    flight_path: FlightPath, token: str | None, map_cache: StaticMapCache | None = None
+) -> np.ndarray | None:
+    """Fetch a ground map, treating an empty path or any retrieval failure as no map.
+
+    :param flight_path: Geographic flight path used to calculate map bounds.
+    :param token: Mapbox API access token.
+    :param map_cache: Optional on-disk cache; defaults to the shared report cache.
+    :return: RGB image array, or None when no map is available.
+    """
+    # Map retrieval is best-effort: report generation remains useful if Mapbox is unavailable.
+    if flight_path.latitudes.size == 0:
+        return None
+    try:
+        return fetch_ground_map(flight_path, token, map_cache)
+    except (OSError, ValueError):
+        return None
+
+
+def prefetch_ground_maps(
+    flight_paths: Sequence[FlightPath],
+    token: str | None,
+    map_cache: StaticMapCache | None = None,
+    workers: int = MAP_PREFETCH_WORKERS,
+) -> list[np.ndarray | None]:
+    """Fetch the ground maps for many flight paths concurrently.
+
+    :param flight_paths: Flight paths whose bounds select the maps.
+    :param token: Mapbox API access token.
+    :param map_cache: Optional on-disk cache; defaults to the shared report cache.
+    :param workers: Maximum number of downloads in flight at once.
+    :return: Downsampled RGB image arrays, or None where no map is available, in flight-path order.
+    """
+    # Downloads wait on the network rather than the CPU, so threads overlap their latency.
+    if not flight_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(flight_paths))) as executor:
+        return list(
+            executor.map(lambda flight_path: fetch_ground_map_or_none(flight_path, token, map_cache), flight_paths)
+        )
+
+
 def draw_ground_plane(
     axis: plt.Axes,
     x_range: tuple[float, float],
@@ -297,12 +452,22 @@ def draw_ground_plane(
     )
 
 
-def plot_flight_path(axis: plt.Axes, flight_path: FlightPath, mapbox_token: str | None = None) -> None:
+def plot_flight_path(
+    axis: plt.Axes,
+    flight_path: FlightPath,
+    mapbox_token: str | None = None,
+    map_cache: StaticMapCache | None = None,
+    ground_map: np.ndarray | None = None,
+    max_points: int | None = None,
+) -> None:
     """Draw one flight path and its caption into a contact-sheet cell.
 
     :param axis: Matplotlib axis representing the cell.
     :param flight_path: Flight path and caption values to draw.
     :param mapbox_token: Optional token used to texture the ground with a Mapbox map.
+    :param map_cache: Optional Mapbox image cache; an offline cache textures without a token.
+    :param ground_map: Optional prefetched RGB map, used instead of fetching one here.
+    :param max_points: Optional cap on drawn vertices; longer paths are simplified to fit.
     :return: None.
     """
     # Every axis gets an explicit face colour and transparent 3D panes for the dark theme.
@@ -341,22 +506,23 @@ def plot_flight_path(axis: plt.Axes, flight_path: FlightPath, mapbox_token: str
         z_floor = max(0.0, float(np.min(z)) - max(altitude_span * 0.10, 250.0))
         z_ceiling = float(np.max(z)) + max(altitude_span * 0.10, 250.0)
 
-        # Map retrieval is best-effort: report generation remains useful if Mapbox is unavailable.
-        map_image = None
-        if mapbox_token:
-            try:
-                map_image = fetch_ground_map(flight_path, mapbox_token)
-            except (OSError, ValueError):
-                map_image = None
+        map_image = ground_map
+        if map_image is None and (mapbox_token or (map_cache is not None and map_cache.offline)):
+            map_image = fetch_ground_map_or_none(flight_path, mapbox_token, map_cache)
         draw_ground_plane(axis, x_range, y_range, z_floor, map_image)
 
+        # Colour against the full altitude range, then simplify in projected metres to bound render time.
+        normaliser = colors.Normalize(vmin=float(np.min(z)), vmax=max(float(np.max(z)), float(np.min(z)) + 1.0))
+        if max_points is not None and len(x) > max_points:
+            retained = decimation_indices(np.column_stack((x, y, z)), max_points)
+            x, y, z = x[retained], y[retained], z[retained]
+
         if len(x) == 1:
             axis.scatter(x, y, z, color="#f0f921", s=10, zorder=4)
         else:
             # Draw an altitude-coloured path, its ground trace, and a translucent vertical ribbon.
             points = np.column_stack((x, y, z))
             segments = np.stack((points[:-1], points[1:]), axis=1)
-            normaliser = colors.Normalize(vmin=float(np.min(z)), vmax=max(float(np.max(z)), float(np.min(z)) + 1.0))
             collection = Line3DCollection(
                 segments,
                 cmap=PATH_COLOUR_MAP,
@@ -380,10 +546,13 @@ def plot_flight_path(axis: plt.Axes, flight_path: FlightPath, mapbox_token: str
             ribbon_colours = colormaps[PATH_COLOUR_MAP](normaliser((z[:-1] + z[1:]) / 2.0))
             # Match the notebook ribbon's rich, largely opaque appearance.
             ribbon_colours[:, 3] = 0.85
-            ribbon_faces = [
-                [(x[i], y[i], z_floor), (x[i], y[i], z[i]), (x[i + 1], y[i + 1], z[i + 1]), (x[i + 1], y[i + 1], z_floor)]
-                for i in range(len(x) - 1)
-            ]
+            # Each face runs floor, path, next path point, floor; build all of them in one array.
+            ribbon_faces = np.empty((len(points) - 1, 4, 3))
+            ribbon_faces[:, 1] = points[:-1]
+            ribbon_faces[:, 2] = points[1:]
+            ribbon_faces[:, 0] = ribbon_faces[:, 1]
+            ribbon_faces[:, 3] = ribbon_faces[:, 2]
+            ribbon_faces[:, (0, 3), 2] = z_floor
             axis.add_collection3d(
                 Poly3DCollection(
                     ribbon_faces,
@@ -408,6 +577,222 @@ def plot_flight_path(axis: plt.Axes, flight_path: FlightPath, mapbox_token: str
     )
 
 
+def draw_coloured_polyline(
+    draw: ImageDraw.ImageDraw,
+    points: np.ndarray,
+    colour_indices: np.ndarray,
+    palette: Sequence[tuple[int, int, int]],
+    width: int,
+) -> None:
+    """Draw a polyline whose segments take palette colours, one draw call per run of equal colour.
+
+    :param draw: Pillow drawing context.
+    :param points: Vertex pixel coordinates as an (N, 2) array.
+    :param colour_indices: Palette index of each of the N - 1 segments.
+    :param palette: RGB colour tuples indexed by colour_indices.
+    :param width: Line width in pixels.
+    :return: None.
+    """
+    # Neighbouring segments usually share a quantised colour, so runs need far fewer calls than segments.
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(colour_indices)) + 1))
+    run_ends = np.append(run_starts[1:], len(colour_indices))
+    for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+        draw.line(
+            points[start : end + 1].ravel().tolist(),
+            fill=palette[colour_indices[start]],
+            width=width,
+            joint="curve",
+        )
+
+
+def rasterise_flat_cell(
+    flight_path: FlightPath,
+    ground_map: np.ndarray | None = None,
+    max_points: int | None = None,
+    size: tuple[int, int] = FLAT_CELL_PIXELS,
+) -> np.ndarray:
+    """Rasterise a top-down track above an altitude profile strip.
+
+    :param flight_path: Flight path with at least one position.
+    :param ground_map: Optional RGB map placed under the track.
+    :param max_points: Optional cap on drawn vertices; longer paths are simplified to fit.
+    :param size: Raster width and height in pixels.
+    :return: RGB image array for the cell.
+    """
+    width, height = size
+    track_height = round(height * (1.0 - FLAT_PROFILE_FRACTION))
+    image = Image.new("RGB", size, CELL_COLOUR)
+    if ground_map is not None:
+        map_image = Image.fromarray(np.clip(ground_map * 255.0, 0, 255).astype(np.uint8))
+        image.paste(map_image.resize((width, track_height), Image.Resampling.BILINEAR), (0, 0))
+    draw = ImageDraw.Draw(image)
+
+    x, y = coordinates_to_local_xy(flight_path)
+    z = flight_path.altitudes
+    x_range = padded_range(x)
+    y_range = padded_range(y)
+    normaliser = colors.Normalize(vmin=float(np.min(z)), vmax=max(float(np.max(z)), float(np.min(z)) + 1.0))
+    if max_points is not None and len(x) > max_points:
+        retained = decimation_indices(np.column_stack((x, y, z)), max_points)
+        x, y, z = x[retained], y[retained], z[retained]
+
+    # Map the projected track into the upper area, north up.
+    track = np.column_stack(
+        (
+            (x - x_range[0]) / (x_range[1] - x_range[0]) * (width - 1),
+            (y_range[1] - y) / (y_range[1] - y_range[0]) * (track_height - 1),
+        )
+    )
+    if len(x) == 1:
+        column, row = track[0]
+        draw.ellipse((column - 3, row - 3, column + 3, row + 3), fill="#f0f921")
+        return np.asarray(image)
+
+    # A coarse palette is indistinguishable at cell size and lets long runs share one draw call.
+    levels = np.linspace(0.0, 1.0, FLAT_COLOUR_LEVELS)
+    palette = [tuple(colour) for colour in (colormaps[PATH_COLOUR_MAP](levels)[:, :3] * 255).round().astype(int).tolist()]
+    scaled = np.asarray(normaliser((z[:-1] + z[1:]) / 2.0)) * (FLAT_COLOUR_LEVELS - 1)
+    colour_indices = np.clip(scaled.round(), 0, FLAT_COLOUR_LEVELS - 1).astype(np.intp)
+    draw_coloured_polyline(draw, track, colour_indices, palette, 3)
+
+    # Plot altitude against along-track distance in the strip below the track.
+    draw.rectangle((0, track_height, width - 1, height - 1), fill="#f3f5f7")
+    draw.line((0, track_height, width - 1, track_height), fill="#c9ced3", width=1)
+    distance = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+    strip_top, strip_bottom = track_height + 4, height - 3
+    profile = np.column_stack(
+        (
+            distance / max(float(distance[-1]), 1.0) * (width - 1),
+            strip_bottom - np.asarray(normaliser(z)) * (strip_bottom - strip_top),
+        )
+    )
+    draw.polygon(
+        [(0, strip_bottom), *map(tuple, profile.tolist()), (float(profile[-1, 0]), strip_bottom)],
+        fill="#c9ced3",
+    )
+    draw_coloured_polyline(draw, profile, colour_indices, palette, 2)
+    return np.asarray(image)
+
+
+def plot_flat_flight_path(
+    axis: plt.Axes,
+    flight_path: FlightPath,
+    mapbox_token: str | None = None,
+    map_cache: StaticMapCache | None = None,
+    ground_map: np.ndarray | None = None,
+    max_points: int | None = None,
+) -> None:
+    """Draw one flight path top-down with an altitude profile strip, for quick triage.
+
+    :param axis: Two-dimensional Matplotlib axis representing the cell.
+    :param flight_path: Flight path and caption values to draw.
+    :param mapbox_token: Optional token used to place a Mapbox map under the track.
+    :param map_cache: Optional Mapbox image cache; an offline cache places maps without a token.
+    :param ground_map: Optional prefetched RGB map, used instead of fetching one here.
+    :param max_points: Optional cap on drawn vertices; longer paths are simplified to fit.
+    :return: None.
+    """
+    # The cell is drawn by Pillow and placed as one image, so Matplotlib has a single artist to render.
+    axis.set_facecolor(CELL_COLOUR)
+    axis.set_xticks([])
+    axis.set_yticks([])
+    for spine in axis.spines.values():
+        spine.set_visible(False)
+
+    if flight_path.latitudes.size == 0:
+        axis.text(
+            0.5,
+            0.5,
+            "NO POSITION DATA",
+            color=MUTED_TEXT_COLOUR,
+            fontsize=7,
+            ha="center",
+            va="center",
+            transform=axis.transAxes,
+        )
+    else:
+        map_image = ground_map
+        if map_image is None and (mapbox_token or (map_cache is not None and map_cache.offline)):
+            map_image = fetch_ground_map_or_none(flight_path, mapbox_token, map_cache)
+        axis.imshow(rasterise_flat_cell(flight_path, map_image, max_points), aspect="auto")
+    axis.set_title(
+        f"{flight_path.address.upper()}-{flight_path.callsign.upper() or 'NONE'}",
+        color=TEXT_COLOUR,
+        fontsize=8,
+        pad=5,
+        y=-0.16,
+    )
+
+
+def page_path(output_directory: Path, session_id: int, page_number: int) -> Path:
+    """Return the PNG path for one contact-sheet page.
+
+    :param output_directory: Directory containing generated images.
+    :param session_id: Observation session represented by the page.
+    :param page_number: One-based page number.
+    :return: Page image path.
+    """
+    return output_directory / f"contact-sheet-{session_id}-{page_number}.png"
+
+
+def page_fingerprint(
+    session_id: int,
+    page_number: int,
+    page_requests: Sequence[AircraftRequest],
+    position_stats: dict[str, tuple],
+    options: dict[str, object],
+) -> str:
+    """Hash everything that determines a page's image.
+
+    :param session_id: Observation session represented by the page.
+    :param page_number: One-based page number.
+    :param page_requests: Aircraft requests placed on the page, in cell order.
+    :param position_stats: Position and callsign summary for each address in the session.
+    :param options: Layout, style and map settings applied to the page.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    inputs = {
+        "session": session_id,
+        "page": page_number,
+        "aircraft": [[request.address, *position_stats[request.address]] for request in page_requests],
+        "options": options,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def read_manifest(output_directory: Path) -> dict[str, str]:
+    """Read the page fingerprints recorded by an earlier run.
+
+    :param output_directory: Directory containing generated images.
+    :return: Fingerprint for each page filename; empty when there is no readable manifest.
+    """
+    # A missing or damaged manifest only costs a full regeneration, so it is never an error.
+    try:
+        manifest = json.loads((output_directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    pages = manifest.get("pages") if isinstance(manifest, dict) else None
+    return {str(name): str(value) for name, value in pages.items()} if isinstance(pages, dict) else {}
+
+
+def write_manifest(output_directory: Path, fingerprints: dict[str, str]) -> None:
+    """Record page fingerprints beside the generated images.
+
+    :param output_directory: Directory containing generated images.
+    :param fingerprints: Fingerprint for each page filename.
+    :return: None.
+    """
+    # Replace the manifest in one step so an interrupted run never leaves it half written.
+    output_directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_directory / MANIFEST_NAME
+    temporary_path = manifest_path.with_suffix(".tmp")
+    temporary_path.write_text(
+        json.dumps({"version": 1, "pages": dict(sorted(fingerprints.items()))}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(temporary_path, manifest_path)
+
+
 def render_page(
     flight_paths: Sequence[FlightPath],
     session_id: int,
@@ -417,6 +802,10 @@ def render_page(
     orientation: str,
     output_directory: Path,
     mapbox_token: str | None = None,
+    map_cache: StaticMapCache | None = None,
+    ground_maps: Sequence[np.ndarray | None] | None = None,
+    max_points: int | None = None,
+    style: str = "3d",
 ) -> Path:
     """Render one page of flight paths to a PNG file.
 
@@ -428,6 +817,10 @@ def render_page(
     :param orientation: Portrait or landscape page orientation.
     :param output_directory: Directory in which to create the PNG.
     :param mapbox_token: Optional token used to texture chart ground planes.
+    :param map_cache: Optional Mapbox image cache.
+    :param ground_maps: Optional prefetched maps, one per flight path; replaces fetching while rendering.
+    :param max_points: Optional cap on vertices drawn per flight path.
+    :param style: "3d" for perspective cells, or "flat" for faster top-down cells.
     :return: Path of the generated PNG file.
     """
     # A4 proportions provide a predictable sheet shape while PNG keeps output device-independent.
@@ -438,24 +831,29 @@ def render_page(
         figsize=figure_size,
         squeeze=False,
         facecolor=BACKGROUND_COLOUR,
-        subplot_kw={"projection": "3d"},
+        subplot_kw={"projection": "3d"} if style == "3d" else None,
     )
+    plot_cell = plot_flight_path if style == "3d" else plot_flat_flight_path
     # Leave a stronger bottom border while keeping captions visually connected to the next row.
     figure.subplots_adjust(left=0.025, right=0.975, top=0.975, bottom=0.050, wspace=0.10, hspace=0.22)
 
     for index, axis in enumerate(axes.flat):
         if index < len(flight_paths):
-            plot_flight_path(axis, flight_paths[index], mapbox_token)
+            if ground_maps is not None:
+                plot_cell(axis, flight_paths[index], ground_map=ground_maps[index], max_points=max_points)
+            else:
+                plot_cell(axis, flight_paths[index], mapbox_token, map_cache, max_points=max_points)
         else:
             # Empty cells remain visibly part of the dark contact-sheet grid.
             axis.set_facecolor(EMPTY_CELL_COLOUR)
             axis.set_xticks([])
             axis.set_yticks([])
-            axis.set_zticks([])
+            if style == "3d":
+                axis.set_zticks([])
             axis.set_axis_off()
 
     output_directory.mkdir(parents=True, exist_ok=True)
-    output_path = output_directory / f"contact-sheet-{session_id}-{page_number}.png"
+    output_path = page_path(output_directory, session_id, page_number)
     figure.savefig(output_path, dpi=200, facecolor=figure.get_facecolor())
     plt.close(figure)
     return output_path
@@ -469,8 +867,13 @@ def generate_contact_sheets(
     rows: int = 6,
     columns: int = 4,
     mapbox_token: str | None = None,
+    jobs: int = 1,
+    map_cache: StaticMapCache | None = None,
+    max_points: int | None = None,
+    style: str = "3d",
+    force: bool = False,
 ) -> list[Path]:
-    """Generate all requested contact-sheet pages, grouped by session.
+    """Generate contact-sheet pages grouped by session, skipping pages whose inputs are unchanged.
 
     :param requests: Aircraft requests in desired display order.
     :param database_path: Tracker SQLite database path.
@@ -479,33 +882,98 @@ def generate_contact_sheets(
     :param rows: Number of rows per page.
     :param columns: Number of columns per page.
     :param mapbox_token: Optional token used to texture chart ground planes.
-    :return: Generated PNG paths in session and page order.
+    :param jobs: Number of processes rendering pages; 1 renders in this process.
+    :param map_cache: Optional Mapbox image cache.
+    :param max_points: Optional cap on vertices drawn per flight path.
+    :param style: "3d" for perspective cells, or "flat" for faster top-down cells.
+    :param force: Render every page even when the manifest shows it is up to date.
+    :return: Generated or retained PNG paths in session and page order.
     """
     # Preserve both the CSV's session order and aircraft order within each session.
     grouped_requests: dict[int, list[AircraftRequest]] = defaultdict(list)
     for request in requests:
         grouped_requests[request.session_id].append(request)
 
+    # Everything except the positions that can change how a page looks; the token itself is not stored.
+    options = {
+        "orientation": orientation,
+        "rows": rows,
+        "columns": columns,
+        "style": style,
+        "max_points": max_points,
+        "maps": bool(mapbox_token) or (map_cache is not None and map_cache.offline),
+        "offline": map_cache is not None and map_cache.offline,
+    }
+    # Forced runs still start from the manifest, so pages of sessions not in this run keep their entries.
+    manifest = read_manifest(output_directory)
+    fingerprints = dict(manifest)
+
     generated_paths: list[Path] = []
+    pages: list[tuple[int, list[FlightPath], int, int, list[np.ndarray | None] | None]] = []
     cells_per_page = rows * columns
     # closing is required because sqlite's context manager controls transactions but not connection lifetime.
     with closing(sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)) as connection:
         for session_id, session_requests in grouped_requests.items():
-            flight_paths = [load_flight_path(connection, request) for request in session_requests]
-            for start in range(0, len(flight_paths), cells_per_page):
+            # Compare cheap per-aircraft summaries first so unchanged sessions load no positions at all.
+            position_stats = load_session_position_stats(connection, session_id, session_requests)
+            stale_pages: list[tuple[int, int]] = []
+            for start in range(0, len(session_requests), cells_per_page):
                 page_number = start // cells_per_page + 1
-                generated_paths.append(
-                    render_page(
-                        flight_paths[start : start + cells_per_page],
-                        session_id,
-                        page_number,
-                        rows,
-                        columns,
-                        orientation,
-                        output_directory,
-                        mapbox_token,
-                    )
+                output_path = page_path(output_directory, session_id, page_number)
+                fingerprint = page_fingerprint(
+                    session_id, page_number, session_requests[start : start + cells_per_page], position_stats, options
                 )
+                fingerprints[output_path.name] = fingerprint
+                generated_paths.append(output_path)
+                if force or manifest.get(output_path.name) != fingerprint or not output_path.is_file():
+                    stale_pages.append((len(generated_paths) - 1, start))
+            if not stale_pages:
+                continue
+
+            flight_paths = load_session_flight_paths(connection, session_id, session_requests)
+            # Fetch the stale pages' maps together so slow responses overlap instead of stalling each page.
+            ground_maps = None
+            if options["maps"]:
+                stale_paths = [path for _, start in stale_pages for path in flight_paths[start : start + cells_per_page]]
+                fetched = iter(prefetch_ground_maps(stale_paths, mapbox_token, map_cache))
+                ground_maps = {
+                    start: [next(fetched) for _ in flight_paths[start : start + cells_per_page]]
+                    for _, start in stale_pages
+                }
+            for index, start in stale_pages:
+                page_maps = ground_maps[start] if ground_maps is not None else None
+                # A page drawn without a map it should have had is left out of the manifest, so the next
+                # run retries its maps instead of treating it as current.
+                if page_maps is not None and any(
+                    ground_map is None and flight_path.latitudes.size
+                    for flight_path, ground_map in zip(flight_paths[start : start + cells_per_page], page_maps)
+                ):
+                    fingerprints.pop(generated_paths[index].name, None)
+                pages.append(
+                    (index, flight_paths[start : start + cells_per_page], session_id,
+                     start // cells_per_page + 1, page_maps)
+                )
+
+    if jobs == 1 or len(pages) < 2:
+        for index, page_paths, session_id, page_number, page_maps in pages:
+            generated_paths[index] = render_page(
+                page_paths, session_id, page_number, rows, columns, orientation,
+                output_directory, mapbox_token, map_cache, page_maps, max_points, style,
+            )
+    else:
+        # Workers receive the already-loaded NumPy arrays, so none of them opens the database.
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pages))) as executor:
+            futures = [
+                (index, executor.submit(
+                    render_page, page_paths, session_id, page_number, rows, columns, orientation,
+                    output_directory, mapbox_token, map_cache, page_maps, max_points, style,
+                ))
+                for index, page_paths, session_id, page_number, page_maps in pages
+            ]
+            for index, future in futures:
+                generated_paths[index] = future.result()
+
+    write_manifest(output_directory, fingerprints)
     return generated_paths
 
 
@@ -528,6 +996,11 @@ def main(arguments: Sequence[str] | None = None) -> int:
             parsed.rows,
             parsed.columns,
             parsed.token or os.environ.get("MAPBOX_API_KEY"),
+            parsed.jobs,
+            StaticMapCache(parsed.map_cache, offline=parsed.offline),
+            parsed.max_points,
+            parsed.style,
+            parsed.force,
         )
     except (OSError, ValueError, sqlite3.Error) as error:
         raise SystemExit(f"Error: {error}") from error
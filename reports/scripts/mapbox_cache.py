@@ -0,0 +1,207 @@
+"""Cache Mapbox static map images on disk for the report scripts."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+
+MAPBOX_STATIC_URL = "https://api.mapbox.com/styles/v1/mapbox"
+DEFAULT_CACHE_DIRECTORY = Path(__file__).resolve().parents[2] / "data" / "cache" / "mapbox"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+BOUNDS_DIVISIONS = 32
+
+
+def quantise_bounds(
+    bounds: tuple[float, float, float, float], divisions: int = BOUNDS_DIVISIONS
+) -> tuple[float, float, float, float]:
+    """Expand bounds outwards to a grid so nearly identical requests share one image.
+
+    :param bounds: West, south, east and north in decimal degrees.
+    :param divisions: Approximate number of grid steps across the larger span.
+    :return: Quantised west, south, east and north, each covering the original bounds.
+    """
+    # A power-of-two step keeps the snapped values exact in binary and stable between runs.
+    west, south, east, north = (float(value) for value in bounds)
+    span = max(east - west, north - south, 1e-9)
+    step = 2.0 ** math.floor(math.log2(span / divisions))
+    return (
+        math.floor(west / step) * step,
+        math.floor(south / step) * step,
+        math.ceil(east / step) * step,
+        math.ceil(north / step) * step,
+    )
+
+
+def mercator_y(latitude: float) -> float:
+    """Project a latitude to the Web Mercator northing used by Mapbox images.
+
+    :param latitude: Latitude in decimal degrees.
+    :return: Northing in radians of the projection.
+    """
+    return math.log(math.tan(math.pi / 4 + math.radians(latitude) / 2))
+
+
+@dataclass(frozen=True)
+class StaticMap:
+    """An encoded static map image and the quantised bounds it was requested for."""
+
+    content: bytes
+    bounds: tuple[float, float, float, float]
+
+    def pixel_box(
+        self, size: tuple[int, int], bounds: tuple[float, float, float, float]
+    ) -> tuple[float, float, float, float]:
+        """Locate geographic bounds within the decoded image.
+
+        :param size: Decoded image width and height in pixels.
+        :param bounds: West, south, east and north inside the image's bounds.
+        :return: Left, upper, right and lower pixel edges, suitable for cropping the image.
+        """
+        # Mapbox centres the requested bounds and widens the shorter side to the image's aspect ratio.
+        width, height = size
+        west, south, east, north = self.bounds
+        left, right = math.radians(west), math.radians(east)
+        bottom, top = mercator_y(south), mercator_y(north)
+        scale = max((right - left) / width, (top - bottom) / height)
+        centre_x, centre_y = (left + right) / 2, (bottom + top) / 2
+        west, south, east, north = bounds
+        return (
+            width / 2 + (math.radians(west) - centre_x) / scale,
+            height / 2 - (mercator_y(north) - centre_y) / scale,
+            width / 2 + (math.radians(east) - centre_x) / scale,
+            height / 2 - (mercator_y(south) - centre_y) / scale,
+        )
+
+
+class StaticMapCache:
+    """Fetch Mapbox static images through a size-capped, expiring on-disk cache.
+
+    Files are written once and keep their modification time as the fetch time, which the TTL
+    is measured against; their access time is set on every hit and orders LRU eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIRECTORY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        offline: bool = False,
+        base_url: str = MAPBOX_STATIC_URL,
+    ) -> None:
+        """Configure the cache; the directory is created on the first download.
+
+        :param directory: Directory holding cached images.
+        :param max_bytes: Total image size retained before least recently used files are removed.
+        :param ttl_seconds: Age after which an image is downloaded again when online.
+        :param offline: Use only cached images, including expired ones, and never download.
+        :param base_url: Styles endpoint, replaceable so tests can use a local server.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.offline = offline
+        self.base_url = base_url.rstrip("/")
+
+    def path_for(self, style: str, size: str, bounds: tuple[float, float, float, float]) -> Path:
+        """Return the cache file for a style, image size and already quantised bounds.
+
+        :param style: Mapbox style identifier, such as outdoors-v12.
+        :param size: Static image size, such as 512x512 or 1024x1024@2x.
+        :param bounds: Quantised west, south, east and north.
+        :return: Path of the cached image, which may not exist.
+        """
+        # The token is deliberately not part of the key, so any valid token can reuse an image.
+        key = "|".join((style, size, *(f"{value:.9f}" for value in bounds)))
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.img"
+
+    def fetch(
+        self,
+        style: str,
+        size: str,
+        bounds: tuple[float, float, float, float],
+        token: str | None,
+        timeout: float = 30,
+    ) -> StaticMap | None:
+        """Return a static map covering the bounds, downloading it only on a cache miss.
+
+        :param style: Mapbox style identifier, such as outdoors-v12.
+        :param size: Static image size, such as 512x512 or 1024x1024@2x.
+        :param bounds: West, south, east and north in decimal degrees.
+        :param token: Mapbox API access token; unused when offline.
+        :param timeout: Network timeout in seconds.
+        :return: The image with the widened bounds it shows, or None when offline and nothing is cached.
+        :raises OSError: If the download or cache write fails.
+        :raises ValueError: If a download is needed but no token was supplied.
+        """
+        quantised = quantise_bounds(bounds)
+        path = self.path_for(style, size, quantised)
+        now = time.time()
+        with suppress(FileNotFoundError):
+            status = path.stat()
+            if self.offline or now - status.st_mtime <= self.ttl_seconds:
+                content = path.read_bytes()
+                os.utime(path, (now, status.st_mtime))
+                return StaticMap(content, quantised)
+        if self.offline:
+            return None
+        if not token:
+            raise ValueError("a Mapbox token is required to download uncached maps")
+
+        west, south, east, north = quantised
+        quoted_token = urllib.parse.quote(token, safe="")
+        url = (
+            f"{self.base_url}/{style}/static/"
+            f"[{west:.9f},{south:.9f},{east:.9f},{north:.9f}]/{size}?access_token={quoted_token}"
+        )
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            content = response.read()
+        self.store(path, content)
+        return StaticMap(content, quantised)
+
+    def store(self, path: Path, content: bytes) -> None:
+        """Write an image atomically, then evict least recently used images over the size cap.
+
+        :param path: Destination cache file.
+        :param content: Encoded image bytes.
+        :return: None.
+        """
+        # Parallel renderers may fetch the same map, so publish complete files with os.replace.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                temporary_file.write(content)
+            os.replace(temporary_name, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(temporary_name)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used images until the cache fits its size cap.
+
+        :return: None.
+        """
+        entries = []
+        for path in self.directory.glob("*.img"):
+            with suppress(FileNotFoundError):
+                status = path.stat()
+                entries.append((status.st_atime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
@@ -0,0 +1,43 @@
+"""Simplify plotted flight paths to a fixed vertex budget."""
+
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+
+
+def decimation_indices(points: np.ndarray, max_points: int) -> np.ndarray:
+    """Choose at most max_points shape-defining points with a budgeted Ramer-Douglas-Peucker pass.
+
+    :param points: Path vertices as an (N, 3) array in consistent units.
+    :param max_points: Maximum number of vertices to keep; at least the two endpoints are kept.
+    :return: Sorted indices of the retained vertices, always including the first and last.
+    """
+    # Repeatedly split the segment whose farthest point deviates most, so the budget is spent
+    # on the largest shape errors first and the loop runs once per retained point.
+    count = len(points)
+    if count <= max(max_points, 2):
+        return np.arange(count)
+    kept = [0, count - 1]
+    candidates: list[tuple[float, int, int, int]] = []
+
+    def add_candidate(start: int, end: int) -> None:
+        if end - start < 2:
+            return
+        origin = points[start]
+        direction = points[end] - origin
+        offsets = points[start + 1 : end] - origin
+        length_squared = float(direction @ direction)
+        fraction = np.clip(offsets @ direction / length_squared, 0.0, 1.0) if length_squared else 0.0
+        deviations = np.linalg.norm(offsets - np.multiply.outer(fraction, direction), axis=1)
+        farthest = int(np.argmax(deviations))
+        heapq.heappush(candidates, (-float(deviations[farthest]), start, end, start + 1 + farthest))
+
+    add_candidate(0, count - 1)
+    while candidates and len(kept) < max_points:
+        _, start, end, index = heapq.heappop(candidates)
+        kept.append(index)
+        add_candidate(start, index)
+        add_candidate(index, end)
+    return np.sort(np.asarray(kept))
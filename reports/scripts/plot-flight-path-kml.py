@@ -4,24 +4,62 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import html
 import io
 import math
 import os
 from dataclasses import dataclass
 from pathlib import Path
-import xml.etree.ElementTree as ET
+import sys
+import time
+import urllib.parse
+import webbrowser
 
 import numpy as np
 from PIL import Image
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import requests
+
+# Share the streaming KML reader used by the retrospective flight-path populator,
+# and the Mapbox image cache and path simplification used by the contact-sheet generator.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from kml_reader import iter_placemarks  # noqa: E402
+from mapbox_cache import DEFAULT_CACHE_DIRECTORY, StaticMap, StaticMapCache  # noqa: E402
+from path_decimation import decimation_indices  # noqa: E402
 
 
 EARTH_RADIUS_M = 6_371_000.0
 METRES_PER_NAUTICAL_MILE = 1_852.0
-KML_NAMESPACE = "http://www.opengis.net/kml/2.2"
-GX_NAMESPACE = "http://www.google.com/kml/ext/2.2"
+DEFAULT_MAP_PIXELS = 512
+MAP_FLOOR_COLOURS = 256
+
+
+@dataclass(frozen=True)
+class PlotOptions:
+    """Settings shared by every KML file rendered in one run."""
+
+    mapbox_token: str = ""
+    map_cache: Path = DEFAULT_CACHE_DIRECTORY
+    offline: bool = False
+    max_points: int | None = None
+    max_pixels: int = DEFAULT_MAP_PIXELS
+    range_filter: tuple[float, float, float] | None = None
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one KML file, as listed in the batch index."""
+
+    source: Path
+    output: Path
+    tracks: int = 0
+    points: int = 0
+    seconds: float = 0.0
+    error: str | None = None
 
 
 @dataclass
@@ -55,60 +93,55 @@ def load_kml(path: Path) -> list[Track]:
     Flightradar24 KML exports contain the same path twice: timestamped Point
     placemarks and separate two-point LineStrings. Prefer the Points when they
     are present so the result is one continuous, timestamped track rather than
-    hundreds of duplicated fragments.
+    hundreds of duplicated fragments. Placemarks are streamed and discarded as
+    they are read, so memory use does not grow with the size of the archive.
     """
-    root = ET.parse(path).getroot()
-    namespaces = {"kml": KML_NAMESPACE, "gx": GX_NAMESPACE}
+    folders: dict[int, tuple[str, list[tuple[float, float, float, str]]]] = {}
     tracks: list[Track] = []
 
-    point_tracks: list[Track] = []
-    for folder_number, folder in enumerate(root.findall(".//kml:Folder", namespaces), 1):
-        points: list[tuple[float, float, float, str]] = []
-        for placemark in folder.findall("kml:Placemark", namespaces):
-            point = placemark.find("kml:Point", namespaces)
-            if point is None:
-                continue
-            longitude, latitude, altitude = _coordinates(
-                point.findtext("kml:coordinates", namespaces=namespaces)
-            )
-            if not len(longitude):
-                continue
-            timestamp = placemark.findtext("kml:TimeStamp/kml:when", default="", namespaces=namespaces).strip()
-            points.append((longitude[0], latitude[0], altitude[0], timestamp))
-
-        if points:
-            folder_name = folder.findtext("kml:name", default="", namespaces=namespaces).strip()
-            values = np.asarray([point[:3] for point in points], dtype=float)
-            timestamps = [point[3] for point in points]
-            label = folder_name or f"Track {folder_number}"
-            point_tracks.append(Track(label, values[:, 0], values[:, 1], values[:, 2], timestamps))
-
-    if point_tracks:
-        return point_tracks
-
-    for placemark_number, placemark in enumerate(root.findall(".//kml:Placemark", namespaces), 1):
-        name_node = placemark.find("kml:name", namespaces)
-        name = (name_node.text or "").strip() if name_node is not None else ""
-        name = name or f"Track {placemark_number}"
+    for placemark in iter_placemarks(path):
+        element = placemark.element
+        point = element.find("{*}Point") if placemark.folder_number is not None else None
+        if point is not None:
+            longitude, latitude, altitude = _coordinates(point.findtext("{*}coordinates"))
+            if len(longitude):
+                timestamp = element.findtext("{*}TimeStamp/{*}when", default="").strip()
+                _, points = folders.setdefault(placemark.folder_number, (placemark.folder_name or "", []))
+                points.append((longitude[0], latitude[0], altitude[0], timestamp))
+                # Geometry tracks are only a fallback, so stop retaining them once Points exist.
+                tracks.clear()
+            continue
+        if folders:
+            continue
 
-        for track_number, geometry in enumerate(placemark.findall(".//gx:Track", namespaces), 1):
-            coordinate_nodes = geometry.findall("gx:coord", namespaces)
+        name = (element.findtext("{*}name") or "").strip() or f"Track {placemark.number}"
+        for track_number, geometry in enumerate(element.iterfind(".//{*}Track"), 1):
+            coordinate_nodes = geometry.findall("{*}coord")
             points = [tuple(map(float, (node.text or "").split())) for node in coordinate_nodes if node.text]
             if not points:
                 continue
             values = np.asarray(points, dtype=float)
             if values.shape[1] == 2:
                 values = np.column_stack((values, np.zeros(len(values))))
-            when = [(node.text or "").strip() for node in geometry.findall("kml:when", namespaces)]
+            when = [(node.text or "").strip() for node in geometry.findall("{*}when")]
             label = name if track_number == 1 else f"{name} ({track_number})"
             tracks.append(Track(label, values[:, 0], values[:, 1], values[:, 2], when))
 
-        for line_number, geometry in enumerate(placemark.findall(".//kml:LineString", namespaces), 1):
-            longitude, latitude, altitude = _coordinates(geometry.findtext("kml:coordinates", namespaces=namespaces))
+        for line_number, geometry in enumerate(element.iterfind(".//{*}LineString"), 1):
+            longitude, latitude, altitude = _coordinates(geometry.findtext("{*}coordinates"))
             if len(longitude):
                 label = name if line_number == 1 else f"{name} ({line_number})"
                 tracks.append(Track(label, longitude, latitude, altitude, []))
 
+    if folders:
+        point_tracks: list[Track] = []
+        for folder_number, (folder_name, points) in sorted(folders.items()):
+            values = np.asarray([point[:3] for point in points], dtype=float)
+            timestamps = [point[3] for point in points]
+            label = folder_name or f"Track {folder_number}"
+            point_tracks.append(Track(label, values[:, 0], values[:, 1], values[:, 2], timestamps))
+        return point_tracks
+
     if not tracks:
         raise ValueError("The KML file contains no gx:Track or LineString coordinates")
     return tracks
@@ -168,6 +201,21 @@ def coordinates_to_local_xy(latitude, longitude, reference_latitude, reference_l
     return x, y
 
 
+def decimate_track(track: Track, max_points: int) -> Track:
+    """Simplify a track to at most max_points vertices, measured in local metres."""
+    if len(track.latitude) <= max_points:
+        return track
+    x, y = coordinates_to_local_xy(track.latitude, track.longitude, float(track.latitude[0]), float(track.longitude[0]))
+    indices = decimation_indices(np.column_stack((x, y, track.altitude)), max_points)
+    timestamps = [track.timestamps[index] for index in indices] if len(track.timestamps) == len(track.latitude) else []
+    return Track(track.name, track.longitude[indices], track.latitude[indices], track.altitude[indices], timestamps)
+
+
+def typed(values) -> np.ndarray:
+    """Return trace data as float32, which Plotly writes as a compact base64 typed array."""
+    return np.asarray(values, dtype=np.float32)
+
+
 def altitude_range(tracks: list[Track]) -> tuple[float, float]:
     altitude = np.concatenate([track.altitude for track in tracks])
     minimum, maximum = float(np.nanmin(altitude)), float(np.nanmax(altitude))
@@ -183,60 +231,100 @@ def bounding_box(tracks: list[Track], padding=0.06):
     return longitude.min() - longitude_pad, latitude.min() - latitude_pad, longitude.max() + longitude_pad, latitude.max() + latitude_pad
 
 
-def fetch_mapbox(bbox, token: str) -> bytes:
-    west, south, east, north = bbox
-    url = f"https://api.mapbox.com/styles/v1/mapbox/streets-v12/static/[{west},{south},{east},{north}]/1024x1024@2x"
-    response = requests.get(url, params={"access_token": token}, timeout=30)
-    response.raise_for_status()
-    return response.content
+def fetch_mapbox(bbox, token: str, map_cache: StaticMapCache | None = None) -> StaticMap | None:
+    """Return a map image covering the bounds, or None when offline and it is not cached."""
+    return (map_cache or StaticMapCache()).fetch("streets-v12", "1024x1024@2x", tuple(bbox), token)
 
 
-def add_map_floor(fig, image_bytes, x_min, x_max, y_min, y_max, z_floor, max_pixels=512):
+def add_map_floor(fig, image_bytes, x_min, x_max, y_min, y_max, z_floor, max_pixels=DEFAULT_MAP_PIXELS, box=None):
+    """Draw the image, or the pixel box of it that shows the floor, across the floor extent."""
     image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    if box is not None:
+        image = image.crop(tuple(round(edge) for edge in box))
     scale = max(image.size) / max_pixels
     if scale > 1:
         image = image.resize(tuple(round(value / scale) for value in image.size), Image.Resampling.LANCZOS)
-    rgb = np.asarray(image)
-    height, width, _ = rgb.shape
-    xx, yy = np.meshgrid(np.linspace(x_min, x_max, width), np.linspace(y_max, y_min, height))
-    index = np.arange(height * width).reshape(height, width)
-    i = np.column_stack((index[:-1, :-1].ravel(), index[:-1, :-1].ravel())).ravel()
-    j = np.column_stack((index[1:, :-1].ravel(), index[1:, 1:].ravel())).ravel()
-    k = np.column_stack((index[1:, 1:].ravel(), index[:-1, 1:].ravel())).ravel()
-    colours = [f"rgb({red},{green},{blue})" for red, green, blue in rgb.reshape(-1, 3)]
-    fig.add_trace(go.Mesh3d(x=xx.ravel(), y=yy.ravel(), z=np.full(xx.size, z_floor), i=i, j=j, k=k,
-                            vertexcolor=colours, name="Map", flatshading=True, showscale=False, hoverinfo="skip"))
-
-
-def build_figure(tracks: list[Track], title: str, mapbox_token: str = "") -> go.Figure:
+    # The floor is a flat grid, so a Surface needs only its axes and one palette index per pixel, where a
+    # Mesh3d needs every vertex, three triangle index arrays and an "rgb()" string per pixel.
+    quantised = image.quantize(colors=MAP_FLOOR_COLOURS)
+    palette = np.asarray(quantised.getpalette()[:3 * MAP_FLOOR_COLOURS], dtype=np.uint8).reshape(-1, 3)
+    pixels = np.asarray(quantised)
+    used = np.unique(pixels)
+    # Neighbouring pixels blend through the indices between theirs, so order the palette by luminance.
+    used = used[np.argsort(palette[used] @ np.array([299, 587, 114]), kind="stable")]
+    remap = np.zeros(len(palette), dtype=np.uint8)
+    remap[used] = np.arange(len(used))
+    # Two stops per index give each one a flat band, and cmin/cmax put every index at its band's centre.
+    count = len(used)
+    colourscale = [[(index + edge) / count, f"rgb({red},{green},{blue})"]
+                   for index, (red, green, blue) in enumerate(palette[used]) for edge in (0, 1)]
+    height, width = pixels.shape
+    fig.add_trace(go.Surface(
+        x=np.linspace(x_min, x_max, width, dtype=np.float32), y=np.linspace(y_max, y_min, height, dtype=np.float32),
+        z=np.full((height, width), z_floor, dtype=np.float32), surfacecolor=remap[pixels], colorscale=colourscale,
+        cmin=-0.5, cmax=count - 0.5, name="Map", showscale=False, hoverinfo="skip",
+        contours={axis: {"highlight": False} for axis in ("x", "y", "z")},
+    ))
+
+
+def build_figure(
+    tracks: list[Track],
+    title: str,
+    mapbox_token: str = "",
+    map_cache: StaticMapCache | None = None,
+    max_points: int | None = None,
+    max_pixels: int = DEFAULT_MAP_PIXELS,
+) -> go.Figure:
+    # The altitude scale, map bounds and floor extent come from the full tracks; only the drawn vertices
+    # are simplified.
+    bbox = bounding_box(tracks)
+    z_min, z_max = altitude_range(tracks)
     reference_latitude = float(tracks[0].latitude[0])
     reference_longitude = float(tracks[0].longitude[0])
-    z_min, z_max = altitude_range(tracks)
-    figure = go.Figure()
     all_x, all_y = [], []
+    for track in tracks:
+        x, y = coordinates_to_local_xy(track.latitude, track.longitude, reference_latitude, reference_longitude)
+        all_x.extend((x.min(), x.max()))
+        all_y.extend((y.min(), y.max()))
+    full_tracks = tracks
+    if max_points is not None:
+        tracks = [decimate_track(track, max_points) for track in tracks]
+    figure = go.Figure()
 
     for number, track in enumerate(tracks):
         x, y = coordinates_to_local_xy(track.latitude, track.longitude, reference_latitude, reference_longitude)
-        all_x.extend(x)
-        all_y.extend(y)
-        if len(track.altitude) > 1:
-            ribbon_z = np.vstack((track.altitude, np.full(len(track.altitude), z_min)))
+        x, y, z = typed(x), typed(y), typed(track.altitude)
+        if len(z) > 1:
+            ribbon_z = np.vstack((z, np.full(len(z), z_min, dtype=np.float32)))
             figure.add_trace(go.Surface(
                 x=np.vstack((x, x)), y=np.vstack((y, y)), z=ribbon_z, surfacecolor=ribbon_z,
                 cmin=z_min, cmax=z_max, colorscale="Plasma", opacity=0.85, name=f"{track.name} ribbon",
                 showscale=number == 0, colorbar={"title": "Altitude (m)", "x": 1.05},
                 lighting={"ambient": 0.6, "diffuse": 0.8, "specular": 0.3, "roughness": 0.5},
             ))
-        hover = None
+        # The browser formats hover labels from the timestamps and binary altitudes on demand.
+        hover = {"hoverinfo": "x+y+z+name"}
         if len(track.timestamps) == len(track.altitude):
-            hover = [f"{timestamp}<br>Altitude: {altitude:.0f} m" for timestamp, altitude in zip(track.timestamps, track.altitude)]
-        figure.add_trace(go.Scatter3d(x=x, y=y, z=track.altitude, mode="lines", line={"width": 5},
-                                      name=track.name, text=hover, hoverinfo="text" if hover else "x+y+z+name"))
-        figure.add_trace(go.Scatter3d(x=x, y=y, z=np.full(len(x), z_min), mode="lines",
+            hover = {"customdata": np.asarray(track.timestamps, dtype=object),
+                     "hovertemplate": "%{customdata}<br>Altitude: %{z:.0f} m<extra></extra>"}
+        figure.add_trace(go.Scatter3d(x=x, y=y, z=z, mode="lines", line={"width": 5}, name=track.name, **hover))
+        figure.add_trace(go.Scatter3d(x=x, y=y, z=np.full(len(x), z_min, dtype=np.float32), mode="lines",
                                       line={"width": 2, "dash": "dash"}, name=f"{track.name} ground trace"))
 
-    if mapbox_token:
-        add_map_floor(figure, fetch_mapbox(bounding_box(tracks), mapbox_token), min(all_x), max(all_x), min(all_y), max(all_y), z_min)
+    if mapbox_token or (map_cache is not None and map_cache.offline):
+        static_map = fetch_mapbox(bbox, mapbox_token, map_cache)
+        if static_map is None:
+            print("No cached Mapbox image for these bounds; plotting without a map floor", file=sys.stderr)
+        else:
+            # The image covers the padded bounds widened by the cache, so crop it to the floor, whose edges
+            # are the tracks' extreme longitudes and latitudes.
+            floor_bounds = (min(float(track.longitude.min()) for track in full_tracks),
+                            min(float(track.latitude.min()) for track in full_tracks),
+                            max(float(track.longitude.max()) for track in full_tracks),
+                            max(float(track.latitude.max()) for track in full_tracks))
+            box = static_map.pixel_box(Image.open(io.BytesIO(static_map.content)).size, floor_bounds)
+            add_map_floor(figure, static_map.content, min(all_x), max(all_x), min(all_y), max(all_y), z_min,
+                          max_pixels, box)
 
     figure.update_layout(
         title={"text": title, "x": 0.5, "xanchor": "center"},
@@ -269,12 +357,123 @@ def add_info_strip(figure: go.Figure, source: Path, tracks: list[Track]) -> go.F
     return combined
 
 
+def render_kml(source: Path, output: Path, title: str | None, options: PlotOptions, auto_open: bool = False) -> RenderResult:
+    """Render one KML file to HTML, timing the work done for it."""
+    started = time.perf_counter()
+    tracks = load_kml(source)
+    if options.range_filter is not None:
+        tracks = filter_tracks_by_range(tracks, *options.range_filter)
+    map_cache = StaticMapCache(options.map_cache, offline=options.offline)
+    figure = build_figure(tracks, title or f"Flight Path — {source.stem}", options.mapbox_token, map_cache,
+                          options.max_points, options.max_pixels)
+    final_figure = add_info_strip(figure, source, tracks)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    final_figure.write_html(output, include_plotlyjs="cdn", auto_open=auto_open)
+    return RenderResult(source, output, len(tracks), sum(len(track.latitude) for track in tracks),
+                        time.perf_counter() - started)
+
+
+def find_kml_files(pattern: Path) -> list[Path] | None:
+    """Return the KML files in a directory or matching a glob, or None for a single file path."""
+    if pattern.is_dir():
+        return sorted(path.resolve() for path in pattern.glob("*.kml") if path.is_file())
+    if any(character in str(pattern) for character in "*?["):
+        return sorted(Path(path).resolve() for path in glob.glob(str(pattern), recursive=True) if Path(path).is_file())
+    return None
+
+
+def render_batch(
+    sources: list[Path], output_directory: Path | None, options: PlotOptions, jobs: int = 1
+) -> list[RenderResult]:
+    """Render KML files to HTML in a worker pool, returning results in input order.
+
+    Each worker imports Plotly, NumPy and Pillow once and then renders many files. Without an
+    output directory each plot is written beside its KML; otherwise the layout below the
+    sources' common directory is mirrored, so equal file names in different folders never clash.
+    """
+    root = Path(os.path.commonpath([source.parent for source in sources]))
+    outputs = [
+        source.with_suffix(".html") if output_directory is None
+        else output_directory / source.relative_to(root).with_suffix(".html")
+        for source in sources
+    ]
+    results: list[RenderResult] = []
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(sources))) if jobs > 1 else None
+    try:
+        if executor is None:
+            pending = [(source, output, None) for source, output in zip(sources, outputs)]
+        else:
+            pending = [(source, output, executor.submit(render_kml, source, output, None, options))
+                       for source, output in zip(sources, outputs)]
+        for source, output, future in pending:
+            # Any failure, including a worker crash that breaks the pool, is reported in the index rather
+            # than stopping the batch, so the index is always written.
+            try:
+                result = render_kml(source, output, None, options) if future is None else future.result()
+            except Exception as error:
+                result = RenderResult(source, output, error=str(error) or type(error).__name__)
+                print(f"Failed to plot {source}: {error}", file=sys.stderr)
+            else:
+                print(f"Plotted {result.points} points from {result.tracks} track(s) in {result.seconds:.1f} s: {output}")
+            results.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return results
+
+
+def write_index(path: Path, title: str, results: list[RenderResult]) -> None:
+    """Write an HTML page linking every rendered plot with its point count and timing."""
+    rows = []
+    for result in results:
+        name = html.escape(result.source.name)
+        if result.error is None:
+            link = urllib.parse.quote(Path(os.path.relpath(result.output, path.parent)).as_posix())
+            rows.append(f'<tr><td><a href="{link}">{name}</a></td><td>{result.tracks}</td>'
+                        f'<td>{result.points}</td><td>{result.seconds:.2f}</td><td></td></tr>')
+        else:
+            rows.append(f"<tr><td>{name}</td><td></td><td></td><td></td><td>{html.escape(result.error)}</td></tr>")
+    rendered = [result for result in results if result.error is None]
+    summary = (f"{len(rendered)} of {len(results)} KML file(s), {sum(result.points for result in rendered)} points, "
+               f"{sum(result.seconds for result in rendered):.1f} s of rendering")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ padding: 0.3em 0.8em; border-bottom: 1px solid #ddd; text-align: left; }}
+td:nth-child(2), td:nth-child(3), td:nth-child(4) {{ text-align: right; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>{summary}</p>
+<table>
+<tr><th>KML</th><th>Tracks</th><th>Points</th><th>Seconds</th><th>Error</th></tr>
+{chr(10).join(rows)}
+</table>
+</body>
+</html>
+""", encoding="utf-8")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("-k", "--kml", type=Path, help="KML file containing gx:Track or LineString geometry")
-    parser.add_argument("-o", "--output", type=Path, help="Output HTML path (default: beside the input KML)")
-    parser.add_argument("-t", "--title", help="Plot title (default: derived from the KML filename)")
+    parser.add_argument("-k", "--kml", type=Path,
+                        help="KML file containing gx:Track or LineString geometry, or a directory or quoted glob of them")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="Output HTML path, or the output directory in batch mode (default: beside the input KML)")
+    parser.add_argument("-t", "--title", help="Plot title, or the index title in batch mode (default: derived from the KML filename)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of KML files to render in parallel in batch mode")
     parser.add_argument("-tk", "--mapbox-token", default=os.environ.get("MAPBOX_API_KEY", ""), help="Optional Mapbox API token")
+    parser.add_argument("-mc", "--map-cache", type=Path, default=DEFAULT_CACHE_DIRECTORY, help="Directory caching downloaded Mapbox images")
+    parser.add_argument("-off", "--offline", action="store_true", help="Use only cached Mapbox images, never the network")
+    parser.add_argument("-px", "--max-pixels", type=int, default=DEFAULT_MAP_PIXELS, help="Longest side of the map floor image, in pixels")
+    parser.add_argument("-mp", "--max-points", type=int, help="Simplify each track to at most this many points")
     parser.add_argument("-la", "--latitude", type=float, help="Latitude of the range-filter centre, in decimal degrees")
     parser.add_argument("-lo", "--longitude", type=float, help="Longitude of the range-filter centre, in decimal degrees")
     parser.add_argument("-r", "--max-range-nm", type=float, help="Maximum distance from the filter centre, in nautical miles")
@@ -293,20 +492,37 @@ def main() -> int:
         raise SystemExit("--longitude must be between -180 and 180")
     if args.max_range_nm is not None and args.max_range_nm < 0:
         raise SystemExit("--max-range-nm must not be negative")
+    if args.max_points is not None and args.max_points < 2:
+        raise SystemExit("--max-points must be at least 2")
+    if args.max_pixels < 2:
+        raise SystemExit("--max-pixels must be at least 2")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
     if args.kml is None:
         raise SystemExit("A KML file must be supplied with --kml")
+    options = PlotOptions(args.mapbox_token, args.map_cache, args.offline, args.max_points, args.max_pixels,
+                          range_arguments if args.latitude is not None else None)
+
+    sources = find_kml_files(args.kml.expanduser())
+    if sources is not None:
+        if not sources:
+            raise SystemExit(f"No KML files found: {args.kml}")
+        output_directory = args.output.expanduser().resolve() if args.output else None
+        results = render_batch(sources, output_directory, options, args.jobs)
+        index = (output_directory or Path(os.path.commonpath([source.parent for source in sources]))) / "index.html"
+        write_index(index, args.title or "Flight Paths", results)
+        failures = sum(result.error is not None for result in results)
+        print(f"Plotted {len(results) - failures} of {len(results)} KML file(s): {index}")
+        if args.open:
+            webbrowser.open(index.as_uri())
+        return 1 if failures else 0
+
     source = args.kml.expanduser().resolve()
     if not source.is_file():
         raise SystemExit(f"KML file not found: {source}")
     output = (args.output or source.with_suffix(".html")).expanduser().resolve()
-    tracks = load_kml(source)
-    if args.latitude is not None:
-        tracks = filter_tracks_by_range(tracks, args.latitude, args.longitude, args.max_range_nm)
-    figure = build_figure(tracks, args.title or f"Flight Path — {source.stem}", args.mapbox_token)
-    final_figure = add_info_strip(figure, source, tracks)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    final_figure.write_html(output, include_plotlyjs="cdn", auto_open=args.open)
-    print(f"Plotted {sum(len(track.latitude) for track in tracks)} points from {len(tracks)} track(s): {output}")
+    result = render_kml(source, output, args.title, options, args.open)
+    print(f"Plotted {result.points} points from {result.tracks} track(s): {output}")
     return 0
 
 
@@ -2,15 +2,20 @@
 
 usage() {
     cat <<EOF
-Usage: $(basename "$0") [--session <session>] [--address <address>]
+Usage: $(basename "$0") [--session <session>] [--address <address>] [--jobs <N>] [--warm]
 
 Run aggregate notebooks when no arguments are supplied, session notebooks when
 --session is supplied, or aircraft notebooks when both options are supplied.
+--jobs runs up to N notebooks at the same time (default: 1). --warm runs them on
+reused kernels that have already imported the report libraries and loaded the
+shared helper notebooks, instead of starting a kernel per notebook.
 EOF
 }
 
 session_id=""
 aircraft_address=""
+jobs="1"
+warm_option=""
 
 while [[ $# -gt 0 ]]; do
     case "$1" in
@@ -32,6 +37,19 @@ while [[ $# -gt 0 ]]; do
             aircraft_address="$2"
             shift 2
             ;;
+        --jobs)
+            if [[ $# -lt 2 || -z "$2" ]]; then
+                echo "Error: --jobs requires a value." >&2
+                usage >&2
+                exit 2
+            fi
+            jobs="$2"
+            shift 2
+            ;;
+        --warm)
+            warm_option="--warm"
+            shift
+            ;;
         -h|--help)
             usage
             exit 0
@@ -54,6 +72,11 @@ if [[ -n "$aircraft_address" && ! "$aircraft_address" =~ ^[[:xdigit:]]{6}$ ]]; t
     exit 2
 fi
 
+if [[ ! "$jobs" =~ ^[1-9][0-9]*$ ]]; then
+    echo "Error: --jobs must be a positive integer." >&2
+    exit 2
+fi
+
 if [[ -n "$aircraft_address" && -z "$session_id" ]]; then
     echo "Error: --address can only be used with --session." >&2
     exit 2
@@ -72,67 +95,16 @@ PROJECT_ROOT=$(cd "$REPORTS_ROOT/.." && pwd)
 # Suppress warnings about the output file extension.
 export PYTHONWARNINGS="ignore"
 
-# Notebook basenames that should never be executed by this runner.
-declare -a exclusions=(
-    "database.ipynb"
-    "export.ipynb"
-    "pathutils.ipynb"
-    "report-header.ipynb"
-    "session-report-utils.ipynb"
-)
-
-is_excluded() {
-    local filename="$1"
-    local excluded
-
-    for excluded in "${exclusions[@]}"; do
-        if [[ "$filename" == "$excluded" ]]; then
-            return 0
-        fi
-    done
-
-    return 1
-}
-
 run_notebooks() {
     local notebook_group="$1"
     local output_folder="$2"
     shift 2
 
-    local notebook_root="$REPORTS_ROOT/notebooks/$notebook_group"
-    local file
-    local filename
-    local notebook_dir
-
-    if [[ ! -d "$notebook_root" ]]; then
-        echo "Error: notebook folder not found: $notebook_root" >&2
-        return 1
-    fi
-
-    # The shared notebook helper creates this folder and directs every report
-    # export into it.
-    export REPORT_OUTPUT_FOLDER="$output_folder"
-
-    while IFS= read -r -d '' file; do
-        filename=$(basename -- "$file")
-
-        if is_excluded "$filename"; then
-            continue
-        fi
-
-        notebook_dir=$(dirname -- "$file")
-        echo "Running $notebook_group/$filename"
-
-        # Run from the notebook's folder so its relative paths resolve there.
-        if ! (
-            cd "$notebook_dir" || exit 1
-            papermill "$@" "$filename" /dev/null \
-                2> >(sed '/Kernel is running over TCP without encryption/d' >&2)
-        ); then
-            echo "Error: notebook failed: $file" >&2
-            return 1
-        fi
-    done < <(find "$notebook_root" -type f -name '*.ipynb' -print0 | sort -z)
+    # The runner skips the shared helper notebooks, runs up to --jobs of the rest
+    # at once from their own folders, and points every report export at the
+    # group's output folder.
+    python "$REPORTS_ROOT/scripts/run-notebooks.py" --jobs "$jobs" $warm_option \
+        "$REPORTS_ROOT/notebooks/$notebook_group" "$output_folder" -- "$@"
 }
 
 if [[ -n "$aircraft_address" ]]; then
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""Run a group of report notebooks with papermill, several at a time."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+
+# Shared helpers are %run by the reports and must never be executed on their own.
+EXCLUDED_NOTEBOOKS = frozenset({
+    "database.ipynb",
+    "export.ipynb",
+    "pathutils.ipynb",
+    "report-header.ipynb",
+    "session-report-utils.ipynb",
+})
+PAPERMILL_COMMAND = (sys.executable, "-m", "papermill")
+KERNEL_WARNING = "Kernel is running over TCP without encryption"
+# Defined in each warm kernel once the helpers have run: __warm_reset__(folder) returns the
+# namespace and matplotlib settings to that point, closes leftover figures and output history,
+# and moves to the notebook's folder so its relative paths resolve as they would under papermill.
+WARM_RESET_SETUP = """
+def __make_warm_reset__():
+    import os
+    import matplotlib
+    import matplotlib.pyplot
+
+    shell = get_ipython()
+    user_ns = shell.user_ns
+    rc_params = matplotlib.rcParams.copy()
+    environment = dict(os.environ)
+
+    def reset(folder):
+        for name in [name for name in user_ns if name not in snapshot]:
+            del user_ns[name]
+        user_ns.update(snapshot)
+        shell.run_line_magic("reset", "-f out")
+        matplotlib.pyplot.close("all")
+        matplotlib.rcParams.update(rc_params)
+        # Reports may set variables such as REPORT_OUTPUT_FOLDER, which must not reach the next report.
+        os.environ.clear()
+        os.environ.update(environment)
+        os.chdir(folder)
+
+    user_ns["__warm_reset__"] = reset
+    snapshot = dict(user_ns)
+
+__make_warm_reset__()
+"""
+RUN_MAGIC = re.compile(r"^\s*%run\s+(\S+\.ipynb)\s*$")
+# Worker threads announce progress through one lock, so their lines never run together.
+OUTPUT_LOCK = threading.Lock()
+# Libraries every report imports; a warm kernel pays for them once rather than per notebook.
+WARM_IMPORTS = ("numpy", "pandas", "matplotlib.pyplot", "plotly.graph_objects", "sqlparse")
+
+
+@dataclass(frozen=True)
+class NotebookResult:
+    """Record how one notebook run finished."""
+
+    notebook: Path
+    seconds: float
+    return_code: int
+    output: str
+
+
+def positive_integer(value: str) -> int:
+    """Parse a command-line value that must be a positive integer.
+
+    :param value: Text supplied on the command line.
+    :return: The parsed positive integer.
+    """
+    try:
+        result = int(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError("must be a positive integer") from error
+    if result < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return result
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse runner command-line arguments.
+
+    :param arguments: Optional argument sequence; defaults to the process arguments.
+    :return: Parsed command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        epilog="Arguments after -- are passed to papermill, such as: -- --parameters session_id 1",
+    )
+    parser.add_argument("notebook_root", type=Path, help="folder searched recursively for notebooks")
+    parser.add_argument("output_folder", type=Path, help="REPORT_OUTPUT_FOLDER for every notebook in the group")
+    parser.add_argument("-j", "--jobs", type=positive_integer, default=1, help="notebooks to run at the same time")
+    parser.add_argument("-w", "--warm", action="store_true",
+                        help="run notebooks on reused kernels with the shared helper notebooks preloaded")
+    # Split before parsing, so papermill options are never mistaken for the runner's own.
+    arguments = list(sys.argv[1:] if arguments is None else arguments)
+    separator = arguments.index("--") if "--" in arguments else len(arguments)
+    parsed = parser.parse_args(arguments[:separator])
+    parsed.papermill_arguments = arguments[separator + 1:]
+    return parsed
+
+
+def find_notebooks(notebook_root: Path) -> list[Path]:
+    """List the notebooks to run below a folder, in path order.
+
+    :param notebook_root: Folder searched recursively.
+    :return: Notebook paths, omitting the shared helper notebooks.
+    """
+    return sorted(path for path in notebook_root.rglob("*.ipynb")
+                  if path.is_file() and path.name not in EXCLUDED_NOTEBOOKS)
+
+
+def run_notebook(notebook: Path, output_folder: Path, papermill_arguments: Sequence[str]) -> NotebookResult:
+    """Execute one notebook from its own folder, discarding the executed copy.
+
+    :param notebook: Notebook to execute.
+    :param output_folder: Folder the notebook's exports are written to.
+    :param papermill_arguments: Extra papermill arguments, such as parameters.
+    :return: Wall-clock time, exit status and combined papermill output.
+    """
+    # Each notebook starts its own kernel, so runs only share the output folder they write into.
+    announce(f"Running {notebook.parent.name}/{notebook.name}")
+    environment = dict(os.environ, REPORT_OUTPUT_FOLDER=str(output_folder))
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [*PAPERMILL_COMMAND, *papermill_arguments, notebook.name, os.devnull],
+        cwd=notebook.parent,
+        env=environment,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    output = "".join(line for line in completed.stdout.splitlines(keepends=True) if KERNEL_WARNING not in line)
+    return NotebookResult(notebook, time.perf_counter() - started, completed.returncode, output)
+
+
+def run_notebooks(
+    notebooks: Sequence[Path], output_folder: Path, papermill_arguments: Sequence[str], jobs: int = 1
+) -> list[NotebookResult]:
+    """Run notebooks in parallel, reporting each as it finishes.
+
+    :param notebooks: Notebooks to execute.
+    :param output_folder: Folder the notebooks' exports are written to.
+    :param papermill_arguments: Extra papermill arguments, such as parameters.
+    :param jobs: Maximum number of notebooks running at once.
+    :return: Results in the order the notebooks were supplied.
+    """
+    # Papermill output is buffered per notebook, so parallel runs never interleave their logs.
+    output_folder.mkdir(parents=True, exist_ok=True)
+    results: dict[Path, NotebookResult] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(notebooks)))) as executor:
+        futures = [executor.submit(run_notebook, notebook, output_folder, papermill_arguments) for notebook in notebooks]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.notebook] = result
+            report_result(result)
+    return [results[notebook] for notebook in notebooks]
+
+
+def report_result(result: NotebookResult) -> None:
+    """Print a notebook's timing, and its output if it failed.
+
+    :param result: Finished notebook run.
+    :return: None.
+    """
+    name = f"{result.notebook.parent.name}/{result.notebook.name}"
+    if result.return_code == 0:
+        announce(f"Finished {name} in {result.seconds:.1f} s")
+    else:
+        announce(f"{result.output}Error: notebook failed after {result.seconds:.1f} s: {result.notebook}", sys.stderr)
+
+
+def announce(message: str, stream=None) -> None:
+    """Print a progress line from any worker thread.
+
+    :param message: Text to print.
+    :param stream: Destination stream; defaults to standard output.
+    :return: None.
+    """
+    with OUTPUT_LOCK:
+        print(message, file=stream or sys.stdout, flush=True)
+
+
+def resolve_parameter(value: str) -> Any:
+    """Convert a --parameters value the way the papermill command line does.
+
+    :param value: Text supplied on the command line.
+    :return: A bool, None, int or float when the text spells one, otherwise the text.
+    """
+    if value in ("True", "False", "None"):
+        return {"True": True, "False": False, "None": None}[value]
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_parameters(papermill_arguments: Sequence[str]) -> dict[str, Any]:
+    """Read notebook parameters from papermill command-line arguments.
+
+    :param papermill_arguments: Arguments that would otherwise be passed to papermill.
+    :return: Parameter values by name.
+    :raises SystemExit: If an argument other than a parameter is supplied.
+    """
+    parser = argparse.ArgumentParser(prog="papermill arguments", add_help=False)
+    parser.add_argument("-p", "--parameters", nargs=2, action="append", default=[])
+    parser.add_argument("-r", "--parameters_raw", nargs=2, action="append", default=[])
+    parsed = parser.parse_args(papermill_arguments)
+    parameters = {name: resolve_parameter(value) for name, value in parsed.parameters}
+    parameters.update(dict(parsed.parameters_raw))
+    return parameters
+
+
+def helper_path(notebook: Path, line: str) -> Path | None:
+    """Return the notebook loaded by a "%run other.ipynb" line.
+
+    :param notebook: Notebook containing the line.
+    :param line: One line of a code cell.
+    :return: Resolved path of the notebook it runs, or None for any other line.
+    """
+    match = RUN_MAGIC.match(line)
+    return (notebook.parent / match.group(1)).resolve() if match else None
+
+
+def find_helpers(notebooks: Sequence[Path]) -> list[Path]:
+    """List the helper notebooks that the reports load with %run, in first-use order.
+
+    :param notebooks: Report notebooks to scan.
+    :return: Resolved helper notebook paths.
+    """
+    helpers: dict[Path, None] = {}
+    for notebook in notebooks:
+        cells = json.loads(notebook.read_text(encoding="utf-8")).get("cells", [])
+        for cell in cells:
+            if cell.get("cell_type") != "code":
+                continue
+            for line in "".join(cell.get("source", [])).splitlines():
+                helper = helper_path(notebook, line)
+                if helper is not None:
+                    helpers[helper] = None
+    return list(helpers)
+
+
+class KernelFailure(Exception):
+    """Raised when code sent to a warm kernel fails."""
+
+    def __init__(self, output: str) -> None:
+        """Record the kernel output leading up to the failure.
+
+        :param output: Streams and traceback produced by the failing code.
+        """
+        super().__init__(output)
+        self.output = output
+
+
+class WarmKernel:
+    """Own one kernel that has imported the report libraries and run the helper notebooks.
+
+    After warming, the kernel's namespace is saved. Each report starts from a copy of it, so
+    names a report defines never leak into the next one, while the helpers are already loaded.
+    """
+
+    def __init__(self, helpers: Sequence[Path], output_folder: Path) -> None:
+        """Start and warm the kernel.
+
+        :param helpers: Helper notebooks to %run before any report.
+        :param output_folder: Folder the reports' exports are written to.
+        :raises KernelFailure: If a library import or helper notebook fails.
+        """
+        # Imported here, so the default subprocess mode needs nothing beyond the standard library.
+        from jupyter_client import KernelManager
+
+        self.helpers = frozenset(helpers)
+        self.manager = KernelManager(kernel_name="python3")
+        # Failures are reported from the kernel's messages; its own log holds only the TCP warning.
+        self.manager.start_kernel(env=dict(os.environ, REPORT_OUTPUT_FOLDER=str(output_folder)),
+                                  stderr=subprocess.DEVNULL)
+        self.client = self.manager.client()
+        self.client.start_channels()
+        try:
+            self.client.wait_for_ready(timeout=60)
+            for module in WARM_IMPORTS:
+                self.execute(f"import contextlib\nwith contextlib.suppress(ImportError):\n    import {module}")
+            for helper in helpers:
+                self.execute(f"import os\nos.chdir({str(helper.parent)!r})\n%run {shlex.quote(str(helper))}")
+            self.execute(WARM_RESET_SETUP)
+        except BaseException:
+            self.close()
+            raise
+
+    def execute(self, code: str) -> str:
+        """Run code in the kernel, waiting for it to finish.
+
+        :param code: Python source, which may use IPython magics.
+        :return: Text written to the kernel's output streams.
+        :raises KernelFailure: If the code raises an exception.
+        """
+        # Poll rather than block, so a kernel that dies mid-cell fails the notebook instead of hanging.
+        message_id = self.client.execute(code, allow_stdin=False)
+        output: list[str] = []
+        failed = False
+        while True:
+            try:
+                message = self.client.get_iopub_msg(timeout=1)
+            except queue.Empty:
+                if not self.manager.is_alive():
+                    raise KernelFailure("".join(output) + "The kernel died.\n") from None
+                continue
+            if message["parent_header"].get("msg_id") != message_id:
+                continue
+            content = message["content"]
+            if message["msg_type"] == "stream":
+                output.append(content["text"])
+            elif message["msg_type"] == "error":
+                output.append("\n".join(content["traceback"]) + "\n")
+                failed = True
+            elif message["msg_type"] == "status" and content["execution_state"] == "idle":
+                break
+        # Consume the matching reply, so the shell channel does not accumulate one per cell.
+        while self.client.get_shell_msg(timeout=60)["parent_header"].get("msg_id") != message_id:
+            pass
+        if failed:
+            raise KernelFailure("".join(output))
+        return "".join(output)
+
+    def run(self, notebook: Path, parameters: dict[str, Any]) -> NotebookResult:
+        """Run one report notebook in a fresh copy of the warmed namespace.
+
+        :param notebook: Report notebook to execute.
+        :param parameters: Values injected after the notebook's parameters cell.
+        :return: Wall-clock time, exit status and any output from a failure.
+        """
+        from papermill.iorw import load_notebook_node
+        from papermill.parameterize import parameterize_notebook
+
+        announce(f"Running {notebook.parent.name}/{notebook.name}")
+        started = time.perf_counter()
+        document = load_notebook_node(str(notebook))
+        if parameters:
+            document = parameterize_notebook(document, parameters)
+        try:
+            self.execute(f"__warm_reset__({str(notebook.resolve().parent)!r})")
+            for cell in document.cells:
+                if cell.cell_type != "code":
+                    continue
+                # The helpers this notebook would %run are already loaded in the warm namespace.
+                source = "\n".join(
+                    line for line in cell.source.splitlines() if helper_path(notebook, line) not in self.helpers
+                )
+                if source.strip():
+                    self.execute(source)
+        except KernelFailure as failure:
+            return NotebookResult(notebook, time.perf_counter() - started, 1, failure.output)
+        return NotebookResult(notebook, time.perf_counter() - started, 0, "")
+
+    def close(self) -> None:
+        """Stop the kernel.
+
+        :return: None.
+        """
+        self.client.stop_channels()
+        self.manager.shutdown_kernel(now=True)
+
+
+def run_notebooks_warm(
+    notebooks: Sequence[Path], output_folder: Path, papermill_arguments: Sequence[str], jobs: int = 1
+) -> list[NotebookResult]:
+    """Run notebooks on a pool of warm kernels, reporting each as it finishes.
+
+    :param notebooks: Notebooks to execute.
+    :param output_folder: Folder the notebooks' exports are written to.
+    :param papermill_arguments: Papermill parameter arguments, such as --parameters session_id 1.
+    :param jobs: Number of warm kernels, and so of notebooks running at once.
+    :return: Results in the order the notebooks were supplied.
+    """
+    output_folder.mkdir(parents=True, exist_ok=True)
+    parameters = parse_parameters(papermill_arguments)
+    helpers = find_helpers(notebooks)
+    pending: queue.Queue[Path] = queue.Queue()
+    for notebook in notebooks:
+        pending.put(notebook)
+    results: dict[Path, NotebookResult] = {}
+    lock = threading.Lock()
+
+    def finish(result: NotebookResult) -> None:
+        with lock:
+            results[result.notebook] = result
+            report_result(result)
+
+    def start(number: int) -> WarmKernel | None:
+        started = time.perf_counter()
+        try:
+            kernel = WarmKernel(helpers, output_folder)
+        except Exception as error:
+            # Without a kernel this worker cannot run anything, so fail what is still queued.
+            output = error.output if isinstance(error, KernelFailure) else f"{type(error).__name__}: {error}\n"
+            while True:
+                try:
+                    notebook = pending.get_nowait()
+                except queue.Empty:
+                    return None
+                finish(NotebookResult(notebook, 0.0, 1, f"Kernel {number} failed to start:\n{output}"))
+        announce(f"Warmed kernel {number} in {time.perf_counter() - started:.1f} s")
+        return kernel
+
+    def work(number: int) -> None:
+        # Each thread owns its kernel, because kernel clients must not be shared between threads.
+        kernel = start(number)
+        while kernel is not None:
+            try:
+                notebook = pending.get_nowait()
+            except queue.Empty:
+                kernel.close()
+                return
+            try:
+                result = kernel.run(notebook, parameters)
+            except Exception as error:
+                result = NotebookResult(notebook, 0.0, 1, f"{type(error).__name__}: {error}\n")
+            finish(result)
+            # A notebook that kills its kernel must not fail the rest of the queue.
+            if not kernel.manager.is_alive():
+                kernel.close()
+                kernel = start(number)
+
+    threads = [threading.Thread(target=work, args=(number,)) for number in range(1, min(jobs, len(notebooks)) + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[notebook] for notebook in notebooks]
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    """Run every notebook in a group and summarise the timings.
+
+    :param arguments: Optional argument sequence; defaults to the process arguments.
+    :return: Zero when every notebook succeeded, otherwise one.
+    """
+    parsed = parse_arguments(arguments)
+    if not parsed.notebook_root.is_dir():
+        print(f"Error: notebook folder not found: {parsed.notebook_root}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    runner = run_notebooks_warm if parsed.warm else run_notebooks
+    results = runner(find_notebooks(parsed.notebook_root), parsed.output_folder.resolve(),
+                     parsed.papermill_arguments, parsed.jobs)
+    failures = [result for result in results if result.return_code != 0]
+    print(f"Ran {len(results)} notebook(s) in {time.perf_counter() - started:.1f} s "
+          f"({sum(result.seconds for result in results):.1f} s of notebook time), {len(failures)} failed")
+    for result in results:
+        status = "ok" if result.return_code == 0 else "FAILED"
+        print(f"  {result.seconds:8.1f} s  {status:6}  {result.notebook.relative_to(parsed.notebook_root)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
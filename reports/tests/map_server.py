@@ -0,0 +1,72 @@
+"""Local stand-in for the Mapbox static images API, shared by the report tests."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MapServer:
+    """Serve fake map images locally and record every requested path.
+
+    The response settings are read on every request, so a test can change them between runs.
+    """
+
+    def __init__(
+        self, content: bytes | None = None, status: int = 200, barrier: threading.Barrier | None = None
+    ) -> None:
+        """Start the server on an ephemeral port.
+
+        :param content: Body of every image; None numbers them "image 1", "image 2" and so on.
+        :param status: HTTP status of every response, such as 500 to simulate an unavailable API.
+        :param barrier: Optional barrier each request waits on before responding.
+        :return: None.
+        """
+        self.content = content
+        self.status = status
+        self.barrier = barrier
+        paths = self.paths = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                paths.append(self.path)
+                if stand_in.barrier is not None:
+                    stand_in.barrier.wait()
+                body = stand_in.content if stand_in.content is not None else f"image {len(paths)}".encode("ascii")
+                self.send_response(stand_in.status)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *arguments) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/styles/v1/mapbox"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> MapServer:
+        """Use the running server in a with statement.
+
+        :return: This server.
+        """
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Stop the server when the with statement ends.
+
+        :param exception: Exception details, if the block raised.
+        :return: None.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Stop the server and release its socket.
+
+        :return: None.
+        """
+        self.server.shutdown()
+        self.server.server_close()
@@ -5,21 +5,36 @@ from __future__ import annotations
 import csv
 import sqlite3
 import tempfile
+import threading
 import unittest
 from contextlib import closing
+from io import BytesIO
 from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from PIL import Image
 
 import sys
 
-# Import the report module directly without requiring reports to be an installed package.
+# Import the report module and the shared map server without requiring reports to be an installed package.
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import contact_sheet  # noqa: E402
 from contact_sheet import (  # noqa: E402
     AircraftRequest,
+    FlightPath,
+    decimation_indices,
+    fetch_ground_map,
     generate_contact_sheets,
     load_flight_path,
+    load_session_flight_paths,
+    prefetch_ground_maps,
     read_requests,
 )
+from map_server import MapServer  # noqa: E402
+from mapbox_cache import StaticMap, StaticMapCache  # noqa: E402
 
 
 class ContactSheetTests(unittest.TestCase):
@@ -105,6 +120,61 @@ class ContactSheetTests(unittest.TestCase):
         self.assertEqual(path.callsign, "NONE")
         self.assertEqual(path.latitudes.size, 0)
 
+    def test_load_session_flight_paths_matches_requests_in_order(self) -> None:
+        """Load several aircraft in one query and return them in request order.
+
+        :return: None.
+        """
+        # A lower-case stored address and unusable coordinates exercise the per-row filters.
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.executescript(
+                """
+                INSERT INTO TRACKED_AIRCRAFT VALUES (3, 7, 'fed321', '');
+                INSERT INTO TRACKED_AIRCRAFT VALUES (4, 8, 'FED321', 'OTHER');
+                INSERT INTO POSITION VALUES (3, 3, 52.0, 0.5, NULL, '2026-01-01T10:05:00');
+                INSERT INTO POSITION VALUES (4, 3, NULL, 0.6, 100, '2026-01-01T10:04:00');
+                INSERT INTO POSITION VALUES (5, 3, 52.2, 'bad', 100, '2026-01-01T10:06:00');
+                INSERT INTO POSITION VALUES (6, 4, 40.0, 1.0, 100, '2026-01-01T10:00:00');
+                """
+            )
+            paths = load_session_flight_paths(
+                connection,
+                7,
+                [
+                    AircraftRequest("FED321", 7),
+                    AircraftRequest("DEF456", 7),
+                    AircraftRequest("ABC123", 7),
+                ],
+            )
+
+        self.assertEqual([path.callsign for path in paths], ["NONE", "NONE", "BA123"])
+        self.assertEqual(paths[0].latitudes.tolist(), [52.0])
+        self.assertEqual(paths[0].altitudes.tolist(), [0.0])
+        self.assertEqual(paths[1].latitudes.size, 0)
+        self.assertEqual(paths[2].longitudes.tolist(), [-0.2, -0.1])
+
+    def test_decimation_keeps_endpoints_and_corners_within_budget(self) -> None:
+        """Simplify a long path to the point budget without losing its defining corners.
+
+        :return: None.
+        """
+        # Two straight legs joined at a right-angled turn, sampled far more densely than needed.
+        leg = np.linspace(0.0, 1000.0, 500)
+        points = np.vstack(
+            (
+                np.column_stack((leg, np.zeros_like(leg), np.full_like(leg, 300.0))),
+                np.column_stack((np.full_like(leg, 1000.0), leg, np.full_like(leg, 300.0)))[1:],
+            )
+        )
+        indices = decimation_indices(points, 10)
+
+        self.assertLessEqual(len(indices), 10)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(points) - 1)
+        self.assertIn(499, indices)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertEqual(decimation_indices(points[:5], 10).tolist(), [0, 1, 2, 3, 4])
+
     def test_generate_contact_sheets_paginates(self) -> None:
         """Create additional PNG pages when the grid capacity is exceeded.
 
@@ -123,6 +193,197 @@ class ContactSheetTests(unittest.TestCase):
         self.assertEqual([path.name for path in paths], ["contact-sheet-7-1.png", "contact-sheet-7-2.png"])
         self.assertTrue(all(path.stat().st_size > 0 for path in paths))
 
+    def test_flat_style_uses_the_same_page_names(self) -> None:
+        """Render top-down pages with the same pagination and filenames as 3D pages.
+
+        :return: None.
+        """
+        # Include an empty path so the flat renderer's no-data cell is exercised too.
+        paths = generate_contact_sheets(
+            [AircraftRequest("ABC123", 7), AircraftRequest("DEF456", 7)],
+            self.database_path,
+            self.root / "output",
+            rows=1,
+            columns=1,
+            style="flat",
+        )
+
+        self.assertEqual([path.name for path in paths], ["contact-sheet-7-1.png", "contact-sheet-7-2.png"])
+        self.assertTrue(all(path.stat().st_size > 0 for path in paths))
+
+    def test_regenerates_only_pages_whose_inputs_changed(self) -> None:
+        """Skip unchanged pages and re-render a page once its aircraft gains positions.
+
+        :return: None.
+        """
+        # Wrap the renderer so each run reports which pages it actually drew.
+        requests = [AircraftRequest("ABC123", 7), AircraftRequest("DEF456", 7)]
+        output_directory = self.root / "output"
+
+        def rendered_pages(**options) -> list[str]:
+            with mock.patch.object(contact_sheet, "render_page", wraps=contact_sheet.render_page) as render:
+                paths = generate_contact_sheets(
+                    requests, self.database_path, output_directory, rows=1, columns=1, **options
+                )
+            self.assertEqual([path.name for path in paths], ["contact-sheet-7-1.png", "contact-sheet-7-2.png"])
+            return [f"{call.args[1]}-{call.args[2]}" for call in render.call_args_list]
+
+        self.assertEqual(rendered_pages(), ["7-1", "7-2"])
+        self.assertEqual(rendered_pages(), [])
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("INSERT INTO POSITION VALUES (3, 1, 51.2, 0.0, 3000, '2026-01-01T10:02:00')")
+            connection.commit()
+        self.assertEqual(rendered_pages(), ["7-1"])
+        self.assertEqual(rendered_pages(style="flat"), ["7-1", "7-2"])
+        (output_directory / "contact-sheet-7-2.png").unlink()
+        self.assertEqual(rendered_pages(style="flat"), ["7-2"])
+        self.assertEqual(rendered_pages(style="flat", force=True), ["7-1", "7-2"])
+
+        # Positions filled in place and a changed callsign alter the drawn page without adding rows.
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("UPDATE POSITION SET Altitude = 2500 WHERE Id = 2")
+            connection.commit()
+        self.assertEqual(rendered_pages(style="flat"), ["7-1"])
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("UPDATE TRACKED_AIRCRAFT SET Callsign = 'BAW9' WHERE Id = 2")
+            connection.commit()
+        self.assertEqual(rendered_pages(style="flat"), ["7-2"])
+
+    def test_forced_run_keeps_other_sessions_in_the_manifest(self) -> None:
+        """Leave pages of sessions outside a forced run up to date.
+
+        :return: None.
+        """
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("INSERT INTO TRACKED_AIRCRAFT VALUES (3, 9, 'FED321', 'EZY1')")
+            connection.commit()
+        output_directory = self.root / "output"
+        both_sessions = [AircraftRequest("ABC123", 7), AircraftRequest("FED321", 9)]
+        generate_contact_sheets(both_sessions, self.database_path, output_directory, rows=1, columns=1)
+        generate_contact_sheets(both_sessions[:1], self.database_path, output_directory, rows=1, columns=1, force=True)
+
+        with mock.patch.object(contact_sheet, "render_page", wraps=contact_sheet.render_page) as render:
+            generate_contact_sheets(both_sessions, self.database_path, output_directory, rows=1, columns=1)
+        render.assert_not_called()
+
+    def test_parallel_rendering_keeps_session_and_page_order(self) -> None:
+        """Return pages rendered by worker processes in session and page order.
+
+        :return: None.
+        """
+        # Interleave sessions in the request order so grouping and pagination are both exercised.
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("INSERT INTO TRACKED_AIRCRAFT VALUES (3, 9, 'FED321', 'EZY1')")
+            connection.commit()
+        requests = [
+            AircraftRequest("ABC123", 7),
+            AircraftRequest("FED321", 9),
+            AircraftRequest("DEF456", 7),
+        ]
+        paths = generate_contact_sheets(
+            requests, self.database_path, self.root / "output", rows=1, columns=1, jobs=3
+        )
+
+        self.assertEqual(
+            [path.name for path in paths],
+            ["contact-sheet-7-1.png", "contact-sheet-7-2.png", "contact-sheet-9-1.png"],
+        )
+        self.assertTrue(all(path.stat().st_size > 0 for path in paths))
+
+    def test_rerendering_a_session_reuses_cached_maps(self) -> None:
+        """Download each ground map once and serve repeat renders from the cache.
+
+        :return: None.
+        """
+        # A local stand-in for the Mapbox static API counts requests without network access.
+        image = BytesIO()
+        Image.new("RGB", (8, 8), "#4a7f3a").save(image, format="PNG")
+        with MapServer(image.getvalue()) as server:
+            map_cache = StaticMapCache(self.root / "map-cache", base_url=server.url)
+            for _ in range(2):
+                generate_contact_sheets(
+                    [AircraftRequest("ABC123", 7)],
+                    self.database_path,
+                    self.root / "output",
+                    rows=1,
+                    columns=1,
+                    mapbox_token="token",
+                    map_cache=map_cache,
+                    force=True,
+                )
+
+        self.assertEqual(len(server.paths), 1)
+
+    def test_page_rendered_without_its_map_is_retried(self) -> None:
+        """Render a page again once a map that failed to download becomes available.
+
+        :return: None.
+        """
+        image = BytesIO()
+        Image.new("RGB", (8, 8), "#4a7f3a").save(image, format="PNG")
+        with MapServer(image.getvalue(), status=500) as server:
+            map_cache = StaticMapCache(self.root / "map-cache", base_url=server.url)
+
+            def rendered_pages() -> list[str]:
+                with mock.patch.object(contact_sheet, "render_page", wraps=contact_sheet.render_page) as render:
+                    generate_contact_sheets(
+                        [AircraftRequest("ABC123", 7)], self.database_path, self.root / "output", rows=1,
+                        columns=1, mapbox_token="token", map_cache=map_cache, style="flat",
+                    )
+                return [f"{call.args[1]}-{call.args[2]}" for call in render.call_args_list]
+
+            self.assertEqual(rendered_pages(), ["7-1"])
+            server.status = 200
+            self.assertEqual(rendered_pages(), ["7-1"])
+            self.assertEqual(rendered_pages(), [])
+
+    def test_prefetch_downloads_ground_maps_concurrently(self) -> None:
+        """Keep several map downloads in flight at once and return them in path order.
+
+        :return: None.
+        """
+        # Every response waits until all three requests have arrived, so serial fetching would fail.
+        image = BytesIO()
+        Image.new("RGB", (8, 8), "#4a7f3a").save(image, format="PNG")
+        flight_paths = [
+            FlightPath(f"ABC12{number}", "NONE", np.array([50.0 + number]), np.array([float(number)]),
+                       np.array([300.0]))
+            for number in range(3)
+        ]
+        empty_path = FlightPath("DEF456", "NONE", np.empty(0), np.empty(0), np.empty(0))
+        with MapServer(image.getvalue(), barrier=threading.Barrier(3, timeout=5)) as server:
+            map_cache = StaticMapCache(self.root / "map-cache", base_url=server.url)
+            ground_maps = prefetch_ground_maps([*flight_paths, empty_path], "token", map_cache, workers=4)
+
+        self.assertTrue(all(ground_map.ndim == 3 and ground_map.shape[2] == 3 for ground_map in ground_maps[:3]))
+        self.assertIsNone(ground_maps[3])
+
+    def test_ground_map_is_cropped_to_the_drawn_area(self) -> None:
+        """Crop a map widened by the cache back to the padded ranges each cell draws over.
+
+        :return: None.
+        """
+        # The cached image shows twice the requested span; only its red centre covers the request.
+        image = Image.new("RGB", (512, 512), "blue")
+        image.paste((255, 0, 0), (128, 128, 384, 384))
+        content = BytesIO()
+        image.save(content, format="PNG")
+
+        class WideningCache:
+            def fetch(self, style, size, bounds, token):
+                west, south, east, north = bounds
+                half_width, half_height = east - west, north - south
+                centre_x, centre_y = (west + east) / 2, (south + north) / 2
+                widened = (centre_x - half_width, centre_y - half_height, centre_x + half_width, centre_y + half_height)
+                return StaticMap(content.getvalue(), widened)
+
+        flight_path = FlightPath("ABC123", "NONE", np.array([0.0, 0.01]), np.array([0.0, 0.01]), np.array([300.0, 400.0]))
+
+        ground_map = fetch_ground_map(flight_path, "token", WideningCache())
+
+        self.assertGreater(float(np.min(ground_map[..., 0])), 0.9)
+        self.assertLess(float(np.max(ground_map[..., 2])), 0.1)
+
 
 if __name__ == "__main__":
     # unittest provides a dependency-free entry point for the reporting environment.
@@ -0,0 +1,139 @@
+"""Tests for the shared Mapbox static-map cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Import the cache module and the shared map server without requiring reports to be an installed package.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from map_server import MapServer  # noqa: E402
+from mapbox_cache import StaticMap, StaticMapCache, quantise_bounds  # noqa: E402
+
+
+class StaticMapCacheTests(unittest.TestCase):
+    """Verify cache keys, expiry, offline use, and eviction."""
+
+    def setUp(self) -> None:
+        """Create an empty cache directory and a local map server.
+
+        :return: None.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temporary_directory.name) / "cache"
+        self.server = MapServer()
+
+    def tearDown(self) -> None:
+        """Stop the server and remove the cache directory.
+
+        :return: None.
+        """
+        self.server.close()
+        self.temporary_directory.cleanup()
+
+    def cache(self, **options) -> StaticMapCache:
+        """Create a cache that downloads from the local server.
+
+        :param options: Additional StaticMapCache keyword arguments.
+        :return: Configured cache.
+        """
+        return StaticMapCache(self.directory, base_url=self.server.url, **options)
+
+    def test_nearby_bounds_share_one_download(self) -> None:
+        """Reuse an image for bounds that quantise to the same grid cells.
+
+        :return: None.
+        """
+        # The bounds differ by far less than one grid step of a one-degree span.
+        cache = self.cache()
+        first = cache.fetch("outdoors-v12", "512x512", (-0.99, 51.01, -0.01, 51.99), "secret")
+        second = cache.fetch("outdoors-v12", "512x512", (-0.991, 51.012, -0.012, 51.99), "other")
+
+        self.assertEqual(first.content, b"image 1")
+        self.assertEqual(second, first)
+        self.assertEqual(first.bounds, quantise_bounds((-0.99, 51.01, -0.01, 51.99)))
+        self.assertEqual(len(self.server.paths), 1)
+        self.assertIn("/outdoors-v12/static/[", self.server.paths[0])
+        self.assertFalse(any("secret" in path.name for path in self.directory.iterdir()))
+
+    def test_quantised_bounds_cover_the_request(self) -> None:
+        """Only ever widen the requested bounds.
+
+        :return: None.
+        """
+        west, south, east, north = quantise_bounds((-0.4321, 51.1234, 0.1234, 51.5678))
+        self.assertLessEqual(west, -0.4321)
+        self.assertLessEqual(south, 51.1234)
+        self.assertGreaterEqual(east, 0.1234)
+        self.assertGreaterEqual(north, 51.5678)
+        self.assertLess(east - west, (0.1234 + 0.4321) * 1.2)
+
+    def test_pixel_box_locates_bounds_within_the_fitted_image(self) -> None:
+        """Map bounds to pixels, allowing for the side Mapbox widens to the image's aspect ratio.
+
+        :return: None.
+        """
+        # Near the equator a two-by-one degree map is about twice as wide as it is tall in Web Mercator.
+        static_map = StaticMap(b"", (-1.0, -0.5, 1.0, 0.5))
+        for bounds, expected in (
+            ((-1.0, -0.5, 1.0, 0.5), (0.0, 100.0, 400.0, 300.0)),
+            ((0.0, 0.0, 0.5, 0.5), (200.0, 100.0, 300.0, 200.0)),
+        ):
+            for edge, value in zip(static_map.pixel_box((400, 400), bounds), expected):
+                self.assertAlmostEqual(edge, value, delta=0.01)
+
+    def test_expired_images_are_downloaded_again_unless_offline(self) -> None:
+        """Refresh stale images online and keep using them offline.
+
+        :return: None.
+        """
+        bounds = (-1.0, 51.0, 0.0, 52.0)
+        self.cache().fetch("outdoors-v12", "512x512", bounds, "token")
+        path = next(self.directory.glob("*.img"))
+        stale = time.time() - 3600
+        os.utime(path, (stale, stale))
+
+        offline = self.cache(ttl_seconds=60, offline=True)
+        self.assertEqual(offline.fetch("outdoors-v12", "512x512", bounds, None).content, b"image 1")
+        self.assertEqual(self.cache(ttl_seconds=60).fetch("outdoors-v12", "512x512", bounds, "token").content, b"image 2")
+
+    def test_offline_miss_does_not_use_the_network(self) -> None:
+        """Return None rather than downloading when offline.
+
+        :return: None.
+        """
+        cache = self.cache(offline=True)
+        self.assertIsNone(cache.fetch("outdoors-v12", "512x512", (-1.0, 51.0, 0.0, 52.0), "token"))
+        self.assertEqual(self.server.paths, [])
+
+    def test_evicts_least_recently_used_images(self) -> None:
+        """Remove the image used longest ago once the size cap is exceeded.
+
+        :return: None.
+        """
+        # Each fake image is seven bytes, so the cap holds exactly two of them.
+        cache = self.cache(max_bytes=14)
+        first, second, third = ((-1.0, 51.0, 0.0, 52.0), (1.0, 51.0, 2.0, 52.0), (3.0, 51.0, 4.0, 52.0))
+        cache.fetch("outdoors-v12", "512x512", first, "token")
+        cache.fetch("outdoors-v12", "512x512", second, "token")
+        for number, path in enumerate(sorted(self.directory.glob("*.img"), key=os.path.getmtime)):
+            os.utime(path, (1_000 + number, path.stat().st_mtime))
+        # Reading the first image makes the second the least recently used.
+        cache.fetch("outdoors-v12", "512x512", first, "token")
+        cache.fetch("outdoors-v12", "512x512", third, "token")
+
+        self.assertEqual(len(list(self.directory.glob("*.img"))), 2)
+        self.assertEqual(cache.fetch("outdoors-v12", "512x512", first, "token").content, b"image 1")
+        self.assertEqual(cache.fetch("outdoors-v12", "512x512", second, "token").content, b"image 4")
+        self.assertEqual(len(self.server.paths), 4)
+
+
+if __name__ == "__main__":
+    # unittest provides a dependency-free entry point for the reporting environment.
+    unittest.main()
@@ -1,4 +1,5 @@
 import importlib.util
+import io
 from pathlib import Path
 import sys
 
@@ -14,6 +15,8 @@ assert SPEC.loader is not None
 sys.modules[SPEC.name] = MODULE
 SPEC.loader.exec_module(MODULE)
 
+from mapbox_cache import StaticMap  # noqa: E402
+
 
 def test_loads_gx_track_and_linestring(tmp_path):
     kml = tmp_path / "flight.kml"
@@ -80,6 +83,62 @@ def test_builds_three_plot_traces_per_track(tmp_path):
     assert figure.layout.scene.zaxis.title.text == "Altitude (m)"
 
 
+def test_max_points_simplifies_traces_and_shares_hover_timestamps():
+    count = 5000
+    longitude = np.linspace(-1.0, 0.0, count)
+    latitude = 52.0 + 0.01 * np.sin(np.linspace(0.0, 20.0, count))
+    altitude = 1000.0 + np.linspace(0.0, 2000.0, count)
+    timestamps = [f"2026-01-01T12:{index // 60 % 60:02d}:{index % 60:02d}Z" for index in range(count)]
+    track = MODULE.Track("Flight", longitude, latitude, altitude, timestamps)
+
+    figure = MODULE.build_figure([track], "Test", max_points=200)
+
+    line = figure.data[1]
+    assert len(line.x) == 200
+    assert line.x.dtype == np.float32
+    assert line.customdata[0] == timestamps[0] and line.customdata[-1] == timestamps[-1]
+    assert "%{customdata}" in line.hovertemplate
+    assert line.text is None
+    # Plotly serialises float32 arrays as base64 typed arrays rather than JSON number lists.
+    assert '"bdata"' in figure.to_json()
+
+
+def test_map_floor_extent_comes_from_the_full_tracks(monkeypatch):
+    track = MODULE.Track(
+        "Flight", np.array([0.0, 0.5, 1.0]), np.array([52.0, 53.0, 52.0]), np.array([1000.0, 1500.0, 1000.0]), []
+    )
+    floors = []
+    # Drop the middle vertex, which alone sets the northern extent of the track.
+    monkeypatch.setattr(MODULE, "decimate_track", lambda track, max_points: MODULE.Track(
+        track.name, track.longitude[[0, -1]], track.latitude[[0, -1]], track.altitude[[0, -1]], []))
+    image = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(image, format="PNG")
+    monkeypatch.setattr(MODULE, "fetch_mapbox", lambda bbox, token, map_cache: StaticMap(image.getvalue(), bbox))
+    monkeypatch.setattr(MODULE, "add_map_floor", lambda figure, image, *extent: floors.append(extent))
+
+    MODULE.build_figure([track], "Test", mapbox_token="token", max_points=2)
+
+    _, y = MODULE.coordinates_to_local_xy(53.0, 0.5, 52.0, 0.0)
+    assert floors[0][3] == y
+
+
+def test_map_floor_is_cropped_to_the_floor_extent(monkeypatch):
+    # The fetched image shows twice the tracks' span; only its red centre lies under the floor.
+    track = MODULE.Track("Flight", np.array([-0.01, 0.01]), np.array([-0.01, 0.01]), np.array([1000.0, 1100.0]), [])
+    image = Image.new("RGB", (64, 64), "blue")
+    image.paste((255, 0, 0), (16, 16, 48, 48))
+    content = io.BytesIO()
+    image.save(content, format="PNG")
+    monkeypatch.setattr(MODULE, "fetch_mapbox", lambda bbox, token, map_cache: StaticMap(
+        content.getvalue(), (-0.02, -0.02, 0.02, 0.02)))
+
+    figure = MODULE.build_figure([track], "Test", mapbox_token="token")
+
+    floor = figure.data[-1]
+    assert floor.surfacecolor.shape == (32, 32)
+    assert {colour for _, colour in floor.colorscale} == {"rgb(255,0,0)"}
+
+
 def test_range_filter_uses_nautical_miles_and_splits_excluded_sections():
     track = MODULE.Track(
         "Flight",
@@ -116,4 +175,70 @@ def test_map_floor_retains_notebook_resolution(tmp_path):
 
     MODULE.add_map_floor(figure, image_path.read_bytes(), 0, 100, 0, 100, 0)
 
-    assert len(figure.data[0].x) == 512 * 512
+    assert figure.data[0].z.shape == (512, 512)
+
+
+def test_map_floor_colours_pixels_through_a_palette(tmp_path):
+    image = Image.new("RGB", (4, 2), "white")
+    image.paste((0, 0, 255), (0, 0, 2, 2))
+    image_path = tmp_path / "map.png"
+    image.save(image_path)
+    figure = go.Figure()
+
+    MODULE.add_map_floor(figure, image_path.read_bytes(), 0, 100, 0, 100, 25.5)
+
+    floor = figure.data[0]
+    # Each palette index owns a flat band of two equal stops, centred on the index by cmin and cmax.
+    count = len(floor.colorscale) // 2
+    assert (floor.cmin, floor.cmax) == (-0.5, count - 0.5)
+    colours = {}
+    for index in range(count):
+        (start, colour), (end, end_colour) = floor.colorscale[2 * index:2 * index + 2]
+        assert (start, end, end_colour) == (index / count, (index + 1) / count, colour)
+        colours[index] = colour
+    assert [[colours[index] for index in row] for row in floor.surfacecolor] == [
+        ["rgb(0,0,255)", "rgb(0,0,255)", "rgb(255,255,255)", "rgb(255,255,255)"]
+    ] * 2
+    assert np.all(floor.z == np.float32(25.5))
+
+
+def test_batch_renders_each_kml_and_indexes_failures(tmp_path):
+    track = """<?xml version="1.0"?>
+        <kml xmlns="http://www.opengis.net/kml/2.2"><Document>
+          <Placemark><name>Path</name><LineString><coordinates>-1.0,52.0,1000 -0.9,52.1,1100 -0.8,52.2,1200</coordinates></LineString></Placemark>
+        </Document></kml>"""
+    for folder in ("first", "second"):
+        (tmp_path / "kml" / folder).mkdir(parents=True)
+        (tmp_path / "kml" / folder / "flight.kml").write_text(track, encoding="utf-8")
+    (tmp_path / "kml" / "second" / "empty.kml").write_text("<kml><Document/></kml>", encoding="utf-8")
+
+    sources = MODULE.find_kml_files(tmp_path / "kml" / "*" / "*.kml")
+    results = MODULE.render_batch(sources, tmp_path / "html", MODULE.PlotOptions(), jobs=2)
+    MODULE.write_index(tmp_path / "html" / "index.html", "Flights", results)
+
+    # Equal file names in different folders keep separate outputs, in input order.
+    assert [(result.output.relative_to(tmp_path).as_posix(), result.points) for result in results] == [
+        ("html/first/flight.html", 3), ("html/second/empty.html", 0), ("html/second/flight.html", 3)
+    ]
+    assert "no gx:Track or LineString" in results[1].error
+    assert (tmp_path / "html" / "first" / "flight.html").is_file()
+    assert not (tmp_path / "html" / "second" / "empty.html").exists()
+    index = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+    assert '<a href="first/flight.html">flight.kml</a></td><td>1</td><td>3</td>' in index
+    assert "2 of 3 KML file(s), 6 points" in index
+
+
+def test_batch_records_unexpected_errors_and_keeps_going(tmp_path, monkeypatch):
+    sources = [tmp_path / "first.kml", tmp_path / "second.kml"]
+
+    def fail_first(source, output, title, options):
+        if source.name == "first.kml":
+            raise RuntimeError("renderer crashed")
+        return MODULE.RenderResult(source, output, tracks=1, points=2)
+
+    monkeypatch.setattr(MODULE, "render_kml", fail_first)
+    results = MODULE.render_batch(sources, None, MODULE.PlotOptions())
+    MODULE.write_index(tmp_path / "index.html", "Flights", results)
+
+    assert [result.error for result in results] == ["renderer crashed", None]
+    assert "1 of 2 KML file(s), 2 points" in (tmp_path / "index.html").read_text(encoding="utf-8")
@@ -0,0 +1,207 @@
+"""Tests for the on-disk query result cache defined in database.ipynb."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+from unittest import mock
+
+
+NOTEBOOK_PATH = Path(__file__).parents[1] / "notebooks" / "database.ipynb"
+QUERY = "SELECT Id, Name FROM AIRCRAFT ORDER BY Id"
+
+
+def load_database_notebook(data_folder: Path) -> dict[str, object]:
+    """Run the notebook's code cells, as %run does, into a fresh namespace.
+
+    :param data_folder: Folder returned by the get_data_folder_path helper the cache expects.
+    :return: Namespace holding the notebook's functions and settings.
+    """
+    namespace: dict[str, object] = {"get_data_folder_path": lambda: data_folder}
+    for cell in json.loads(NOTEBOOK_PATH.read_text(encoding="utf-8"))["cells"]:
+        if cell["cell_type"] == "code":
+            exec("".join(cell["source"]), namespace)
+    return namespace
+
+
+@unittest.skipUnless(
+    all(importlib.util.find_spec(name) for name in ("pandas", "sqlparse")),
+    "the database notebook needs pandas and sqlparse",
+)
+class QueryCacheTests(unittest.TestCase):
+    """Verify cache hits, invalidation, opting out, eviction and recovery from bad entries."""
+
+    def setUp(self) -> None:
+        """Create a tracker database and load the notebook against it.
+
+        :return: None.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.database_path = self.root / "tracker.db"
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.executescript(
+                """
+                CREATE TABLE AIRCRAFT (Id INTEGER PRIMARY KEY, Name TEXT NOT NULL);
+                INSERT INTO AIRCRAFT VALUES (1, 'Alpha'), (2, 'Bravo');
+                """
+            )
+        environment = mock.patch.dict(os.environ, {"AIRCRAFT_TRACKER_DB": str(self.database_path)})
+        environment.start()
+        self.addCleanup(environment.stop)
+        for name in ("REPORT_CACHE", "REPORT_CACHE_MAX_BYTES"):
+            os.environ.pop(name, None)
+        self.namespace = load_database_notebook(self.root / "data")
+        # Count the queries that reach the database rather than the cache.
+        self.read_sql = mock.Mock(wraps=self.namespace["read_sql"])
+        self.namespace["read_sql"] = self.read_sql
+
+    def tearDown(self) -> None:
+        """Remove the database and cached results.
+
+        :return: None.
+        """
+        self.temporary_directory.cleanup()
+
+    def query(self, query: str = QUERY):
+        """Run a query through the cache.
+
+        :param query: SQL query to run against the tracker database.
+        :return: Result dataframe.
+        """
+        return self.namespace["read_sql_cached"]("tracker", query)
+
+    def cache_files(self) -> list[Path]:
+        """List the cached result files.
+
+        :return: Paths of the cached results.
+        """
+        return sorted((self.root / "data" / "cache" / "queries").glob("*.pkl"))
+
+    def insert_aircraft(self, connection: sqlite3.Connection, aircraft_id: int) -> None:
+        """Commit one more aircraft row.
+
+        :param connection: Open connection to the tracker database.
+        :param aircraft_id: Identifier of the new row.
+        :return: None.
+        """
+        connection.execute("INSERT INTO AIRCRAFT VALUES (?, 'New')", (aircraft_id,))
+        connection.commit()
+
+    def test_repeated_query_is_read_from_the_cache(self) -> None:
+        """Query the database once and serve the identical query from the cache.
+
+        :return: None.
+        """
+        first = self.query()
+        second = self.query()
+
+        self.assertEqual(self.read_sql.call_count, 1)
+        self.assertTrue(first.equals(second))
+        self.assertEqual(len(self.cache_files()), 1)
+
+    def test_database_write_invalidates_cached_results(self) -> None:
+        """Query again once a committed write changes the database file.
+
+        :return: None.
+        """
+        self.query()
+        status = self.database_path.stat()
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            self.insert_aircraft(connection, 3)
+        # Filesystem timestamps can be coarser than the gap between the two writes.
+        os.utime(self.database_path, ns=(status.st_atime_ns, status.st_mtime_ns + 1_000_000))
+
+        result = self.query()
+
+        self.assertEqual(self.read_sql.call_count, 2)
+        self.assertEqual(result["Id"].tolist(), [1, 2, 3])
+
+    def test_write_ahead_log_change_invalidates_cached_results(self) -> None:
+        """Query again when a write reaches only the write-ahead log.
+
+        :return: None.
+        """
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+        self.query()
+        # Disabling checkpoints keeps the committed row in the -wal file while the writer is open.
+        with closing(sqlite3.connect(self.database_path)) as writer:
+            writer.execute("PRAGMA wal_autocheckpoint=0")
+            self.insert_aircraft(writer, 3)
+
+            result = self.query()
+
+        self.assertEqual(self.read_sql.call_count, 2)
+        self.assertEqual(result["Id"].tolist(), [1, 2, 3])
+
+    def test_cache_can_be_switched_off(self) -> None:
+        """Always query the database, and store nothing, with REPORT_CACHE=off.
+
+        :return: None.
+        """
+        os.environ["REPORT_CACHE"] = "Off"
+
+        self.query()
+        self.query()
+
+        self.assertEqual(self.read_sql.call_count, 2)
+        self.assertEqual(self.cache_files(), [])
+
+    def test_evicts_least_recently_used_results_over_the_size_cap(self) -> None:
+        """Remove the result used longest ago once the cache exceeds its cap.
+
+        :return: None.
+        """
+        self.query(f"{QUERY} LIMIT 1")
+        (first_path,) = self.cache_files()
+        os.utime(first_path, (1_000, first_path.stat().st_mtime))
+        # Room for one result of this shape, but not two.
+        self.namespace["QUERY_CACHE_MAX_BYTES"] = first_path.stat().st_size * 3 // 2
+
+        self.query(f"{QUERY} LIMIT 2")
+
+        (remaining_path,) = self.cache_files()
+        self.assertNotEqual(remaining_path, first_path)
+        self.query(f"{QUERY} LIMIT 1")
+        self.assertEqual(self.read_sql.call_count, 3)
+
+    def test_replaces_an_unreadable_entry(self) -> None:
+        """Query again and rewrite an entry that cannot be unpickled.
+
+        :return: None.
+        """
+        self.query()
+        (cache_path,) = self.cache_files()
+        cache_path.write_bytes(b"not a pickle")
+
+        result = self.query()
+
+        self.assertEqual(self.read_sql.call_count, 2)
+        self.assertEqual(result["Name"].tolist(), ["Alpha", "Bravo"])
+        self.assertEqual(self.cache_files(), [cache_path])
+        self.assertTrue(self.query().equals(result))
+        self.assertEqual(self.read_sql.call_count, 2)
+
+    def test_rejects_an_invalid_size_cap(self) -> None:
+        """Name the variable when REPORT_CACHE_MAX_BYTES is set but empty or not a byte count.
+
+        :return: None.
+        """
+        for value in ("", "1GB", "-1"):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"REPORT_CACHE_MAX_BYTES": value}):
+                with self.assertRaisesRegex(ValueError, "REPORT_CACHE_MAX_BYTES must be a whole number of bytes"):
+                    load_database_notebook(self.root / "data")
+        with mock.patch.dict(os.environ, {"REPORT_CACHE_MAX_BYTES": "4096"}):
+            self.assertEqual(load_database_notebook(self.root / "data")["QUERY_CACHE_MAX_BYTES"], 4096)
+
+
+if __name__ == "__main__":
+    # unittest provides a dependency-free entry point for the reporting environment.
+    unittest.main()
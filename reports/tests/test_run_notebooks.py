@@ -0,0 +1,220 @@
+"""Tests for the parallel report notebook runner."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPT_PATH = Path(__file__).parents[1] / "scripts" / "run-notebooks.py"
+SPEC = importlib.util.spec_from_file_location("run_notebooks", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+# Stand in for papermill: record the working folder and arguments, and fail for "broken" notebooks.
+FAKE_PAPERMILL = """
+import os, sys
+from pathlib import Path
+notebook = sys.argv[-2]
+print("Kernel is running over TCP without encryption")
+print(f"executing {notebook}")
+(Path(os.environ["REPORT_OUTPUT_FOLDER"]) / f"{notebook}.txt").write_text(
+    " ".join([os.path.basename(os.getcwd()), *sys.argv[1:-1]]), encoding="utf-8"
+)
+sys.exit(1 if "broken" in notebook else 0)
+"""
+
+
+class RunNotebooksTest(unittest.TestCase):
+    """Exercise notebook discovery, parallel execution and failure reporting."""
+
+    def setUp(self) -> None:
+        """Create a notebook group containing reports and shared helpers.
+
+        :return: None.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.notebooks = self.root / "notebooks"
+        (self.notebooks / "nested").mkdir(parents=True)
+        for name in ("b-report.ipynb", "a-report.ipynb", "database.ipynb", "nested/c-report.ipynb",
+                     "nested/export.ipynb"):
+            (self.notebooks / name).write_text("{}", encoding="utf-8")
+        self.output = self.root / "output"
+
+    def tearDown(self) -> None:
+        """Remove temporary notebooks and outputs.
+
+        :return: None.
+        """
+        self.temporary_directory.cleanup()
+
+    def run_main(self, *arguments: str) -> tuple[int, str, str]:
+        """Run the command-line entry point with the fake papermill command.
+
+        :param arguments: Command-line arguments after the notebook folder and output folder.
+        :return: Exit status, standard output and standard error.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(MODULE, "PAPERMILL_COMMAND", (sys.executable, "-c", FAKE_PAPERMILL)):
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                status = MODULE.main([str(self.notebooks), str(self.output), *arguments])
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_finds_reports_in_path_order_without_shared_helpers(self) -> None:
+        """Skip the excluded helper notebooks wherever they appear.
+
+        :return: None.
+        """
+        notebooks = MODULE.find_notebooks(self.notebooks)
+        self.assertEqual(
+            [path.relative_to(self.notebooks).as_posix() for path in notebooks],
+            ["a-report.ipynb", "b-report.ipynb", "nested/c-report.ipynb"],
+        )
+
+    def test_runs_each_notebook_from_its_folder_with_papermill_arguments(self) -> None:
+        """Pass parameters through and point every notebook at the group output folder.
+
+        :return: None.
+        """
+        status, stdout, stderr = self.run_main("--jobs", "3", "--", "--parameters", "session_id", "7")
+
+        self.assertEqual(status, 0)
+        self.assertEqual(stderr, "")
+        self.assertEqual(
+            (self.output / "c-report.ipynb.txt").read_text(encoding="utf-8"),
+            "nested --parameters session_id 7 c-report.ipynb",
+        )
+        self.assertEqual(len(list(self.output.glob("*.txt"))), 3)
+        self.assertIn("Ran 3 notebook(s)", stdout)
+        self.assertRegex(stdout, r"Finished notebooks/a-report\.ipynb in \d+\.\d s")
+
+    def test_reports_failures_and_still_runs_the_other_notebooks(self) -> None:
+        """Return a failure status while keeping the results of successful notebooks.
+
+        :return: None.
+        """
+        (self.notebooks / "broken-report.ipynb").write_text("{}", encoding="utf-8")
+
+        status, stdout, stderr = self.run_main("-j", "2")
+
+        self.assertEqual(status, 1)
+        self.assertEqual(len(list(self.output.glob("*.txt"))), 4)
+        # Only the failed notebook's output is shown, without the kernel transport warning.
+        self.assertIn("executing broken-report.ipynb", stderr)
+        self.assertNotIn("executing a-report.ipynb", stderr)
+        self.assertNotIn("without encryption", stderr)
+        self.assertIn("Error: notebook failed", stderr)
+        self.assertRegex(stdout, r"FAILED\s+broken-report\.ipynb")
+
+
+def write_notebook(path: Path, *cells: str, parameters: bool = False) -> None:
+    """Write a minimal Python notebook.
+
+    :param path: Destination notebook path.
+    :param cells: Source of each code cell.
+    :param parameters: Tag the first cell as the papermill parameters cell.
+    :return: None.
+    """
+    document = {
+        "cells": [
+            {"id": f"cell-{number}", "cell_type": "code", "execution_count": None, "metadata": {}, "outputs": [],
+             "source": source}
+            for number, source in enumerate(cells)
+        ],
+        "metadata": {"kernelspec": {"name": "python3", "language": "python", "display_name": "Python 3"}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    if parameters:
+        document["cells"][0]["metadata"]["tags"] = ["parameters"]
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+
+@unittest.skipUnless(
+    all(importlib.util.find_spec(name) for name in ("papermill", "jupyter_client", "ipykernel")),
+    "warm kernels need papermill, jupyter_client and ipykernel",
+)
+class WarmKernelTest(unittest.TestCase):
+    """Exercise helper preloading and namespace isolation on warm kernels."""
+
+    def setUp(self) -> None:
+        """Create reports that share a helper notebook.
+
+        :return: None.
+        """
+        # The helper counts its loads, and each report checks no name or environment variable leaked
+        # from an earlier report.
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.notebooks = self.root / "notebooks" / "group"
+        self.notebooks.mkdir(parents=True)
+        self.output = self.root / "output"
+        write_notebook(
+            self.notebooks.parent / "helper.ipynb",
+            "import os\nHELPER_LOADS = globals().get('HELPER_LOADS', 0) + 1\n"
+            "def export(name, text):\n"
+            "    open(os.path.join(os.environ['REPORT_OUTPUT_FOLDER'], name), 'w').write(text)",
+        )
+        for name in ("first", "second"):
+            write_notebook(
+                self.notebooks / f"{name}.ipynb",
+                "session_id = 0",
+                "%run ../helper.ipynb",
+                "assert HELPER_LOADS == 1 and 'report_name' not in globals() and 'REPORT_NAME' not in os.environ\n"
+                f"report_name = os.environ['REPORT_NAME'] = '{name}'\n"
+                "export(f'{report_name}-{session_id}.txt', os.path.basename(os.getcwd()))",
+                parameters=True,
+            )
+        write_notebook(self.notebooks / "broken.ipynb", "%run ../helper.ipynb", "raise ValueError('broken report')")
+
+    def tearDown(self) -> None:
+        """Remove temporary notebooks and outputs.
+
+        :return: None.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_runs_reports_in_fresh_namespaces_on_one_warm_kernel(self) -> None:
+        """Load the helper once, inject parameters and report failures.
+
+        :return: None.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = MODULE.main([str(self.notebooks), str(self.output), "--warm", "--", "-p", "session_id", "7"])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout.getvalue().count("Warmed kernel"), 1)
+        self.assertEqual((self.output / "first-7.txt").read_text(encoding="utf-8"), "group")
+        self.assertEqual((self.output / "second-7.txt").read_text(encoding="utf-8"), "group")
+        self.assertIn("broken report", stderr.getvalue())
+        self.assertRegex(stdout.getvalue(), r"FAILED\s+broken\.ipynb")
+
+    def test_fails_queued_reports_when_no_kernel_starts(self) -> None:
+        """Report every notebook as failed, whatever error stops the kernels starting.
+
+        :return: None.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(MODULE, "WarmKernel", side_effect=OSError("no such kernel")):
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                status = MODULE.main([str(self.notebooks), str(self.output), "--warm", "--jobs", "2"])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(len(re.findall(r"FAILED", stdout.getvalue())), 3)
+        self.assertIn("OSError: no such kernel", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
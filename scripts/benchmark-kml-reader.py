@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare peak memory and parse time of tree-based and streaming KML reading."""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from kml_reader import iter_placemarks
+
+
+def write_synthetic_kml(kml_path: Path, placemarks: int) -> None:
+    """Write a Flightradar24-shaped KML file with the requested number of Point placemarks.
+
+    :param kml_path: Destination path.
+    :param placemarks: Number of timestamped Point placemarks to write.
+    :return: None.
+    """
+    # Buffer placemarks in blocks so generating the fixture is not the slowest part of a run.
+    start = datetime(2026, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    with kml_path.open("w", encoding="utf-8") as destination:
+        destination.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<kml xmlns="http://www.opengis.net/kml/2.2">\n'
+            "<Document><name>-/BENCH1</name><Folder><name>Route</name>\n"
+        )
+        block: list[str] = []
+        for number in range(placemarks):
+            when = (start + timedelta(seconds=number)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            longitude = -1.0 + (number % 10_000) * 1e-4
+            latitude = 51.0 + (number % 10_000) * 1e-4
+            block.append(
+                "<Placemark><description><![CDATA[<span><b>Altitude:</b></span> "
+                f"<span>{number % 40_000:,} ft</span>]]></description>"
+                f"<TimeStamp><when>{when}</when></TimeStamp>"
+                f"<Point><coordinates>{longitude:.5f},{latitude:.5f},{number % 12_000}</coordinates></Point>"
+                "</Placemark>\n"
+            )
+            if len(block) == 10_000:
+                destination.write("".join(block))
+                block.clear()
+        destination.write("".join(block))
+        destination.write("</Folder></Document></kml>\n")
+
+
+def read_with_tree(kml_path: Path) -> int:
+    """Read every Point placemark after parsing the whole document, as the scripts used to.
+
+    :param kml_path: Source KML path.
+    :return: Number of Point placemarks read.
+    """
+    tree = ET.parse(kml_path)
+    count = 0
+    for placemark in tree.findall(".//{*}Placemark"):
+        if placemark.find("./{*}TimeStamp/{*}when") is not None and placemark.find(
+            "./{*}Point/{*}coordinates"
+        ) is not None:
+            count += 1
+    return count
+
+
+def read_with_stream(kml_path: Path) -> int:
+    """Read every Point placemark using the shared streaming reader.
+
+    :param kml_path: Source KML path.
+    :return: Number of Point placemarks read.
+    """
+    count = 0
+    for placemark in iter_placemarks(kml_path):
+        if placemark.element.find("./{*}TimeStamp/{*}when") is not None and placemark.element.find(
+            "./{*}Point/{*}coordinates"
+        ) is not None:
+            count += 1
+    return count
+
+
+def measure(reader_name: str, kml_path: Path, results) -> None:
+    """Run one reader in this process and report its elapsed time and peak RSS.
+
+    :param reader_name: Either "tree" or "stream".
+    :param kml_path: Source KML path.
+    :param results: Queue receiving the reader name, point count, seconds and peak RSS in MiB.
+    :return: None.
+    """
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    count = read_with_tree(kml_path) if reader_name == "tree" else read_with_stream(kml_path)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    results.put((reader_name, count, elapsed, peak / divisor, (peak - baseline) / divisor))
+
+
+def main() -> int:
+    """Generate a synthetic KML file and benchmark both readers in fresh processes.
+
+    :return: Process exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-p", "--placemarks", type=int, default=500_000, help="synthetic placemark count")
+    parser.add_argument("-k", "--kml", type=Path, help="benchmark an existing KML file instead")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        kml_path = arguments.kml
+        if kml_path is None:
+            kml_path = Path(temporary_directory) / "synthetic.kml"
+            write_synthetic_kml(kml_path, arguments.placemarks)
+        print(f"{kml_path.name}: {kml_path.stat().st_size / (1024 * 1024):,.1f} MiB")
+
+        # Each reader runs in its own process so one reader's peak cannot mask the other's.
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        for reader_name in ("tree", "stream"):
+            process = context.Process(target=measure, args=(reader_name, kml_path, results))
+            process.start()
+            name, count, elapsed, peak, growth = results.get()
+            process.join()
+            print(
+                f"{name:>6}: {count:,} points in {elapsed:.2f}s, "
+                f"peak RSS {peak:,.1f} MiB (+{growth:,.1f} MiB while parsing)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Time populate-aircraft-manufactured.py against a synthetic FAA file and AIRCRAFT table."""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).with_name("populate-aircraft-manufactured.py")
+SPEC = importlib.util.spec_from_file_location("populate_aircraft_manufactured", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+def write_synthetic_master(master_path: Path, records: int) -> None:
+    """Write a MASTER.txt file with sequential N-numbers and a blank year on every tenth record.
+
+    :param master_path: Destination path.
+    :param records: Number of FAA records to write.
+    :return: None.
+    """
+    with master_path.open("w", encoding="utf-8", newline="") as destination:
+        destination.write("N-NUMBER,YEAR MFR,NAME\n")
+        destination.writelines(
+            f"{number:<5},{'' if number % 10 == 0 else 1950 + number % 70:>4},OWNER {number}\n"
+            for number in range(1, records + 1)
+        )
+
+
+def write_synthetic_database(database_path: Path, aircraft: int, records: int) -> None:
+    """Create an AIRCRAFT table mixing FAA registrations with non-US ones.
+
+    :param database_path: Destination SQLite database.
+    :param aircraft: Number of AIRCRAFT rows to create.
+    :param records: Number of FAA records, so roughly half of them find a match.
+    :return: None.
+    """
+    # Pad and lower-case some registrations so the lookup has to normalise them.
+    def rows():
+        for identifier in range(1, aircraft + 1):
+            if identifier % 2 and identifier <= 2 * records:
+                registration = f"n{identifier} " if identifier % 3 == 0 else f"N{identifier}"
+            else:
+                registration = f"G-{identifier:07d}"
+            yield identifier, registration, None if identifier % 5 == 0 else 1950 + identifier % 60
+
+    with sqlite3.connect(database_path) as connection:
+        connection.execute(
+            "CREATE TABLE AIRCRAFT (Id INTEGER PRIMARY KEY, Registration TEXT, Manufactured INTEGER)"
+        )
+        connection.executemany("INSERT INTO AIRCRAFT VALUES (?, ?, ?)", rows())
+
+
+def main() -> int:
+    """Generate the synthetic inputs and time a full population run.
+
+    :return: Process exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--records", type=int, default=300_000, help="synthetic MASTER.txt records")
+    parser.add_argument("-a", "--aircraft", type=int, default=1_000_000, help="synthetic AIRCRAFT rows")
+    parser.add_argument(
+        "-s", "--scan-sample", type=int, default=20,
+        help="time this many per-row UPPER(TRIM()) lookups to estimate the previous approach",
+    )
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        root = Path(temporary_directory)
+        master_path = root / "MASTER.txt"
+        database_path = root / "tracker.db"
+        write_synthetic_master(master_path, arguments.records)
+        write_synthetic_database(database_path, arguments.aircraft, arguments.records)
+
+        # A full run of the per-row query takes hours at this size, so extrapolate from a sample.
+        if arguments.scan_sample > 0:
+            with sqlite3.connect(database_path) as connection:
+                started = time.perf_counter()
+                for number in range(1, arguments.scan_sample + 1):
+                    connection.execute(
+                        "SELECT Id, Manufactured FROM AIRCRAFT WHERE UPPER(TRIM(Registration)) = ?",
+                        (f"N{number}",),
+                    ).fetchall()
+                per_lookup = (time.perf_counter() - started) / arguments.scan_sample
+            print(
+                f"per-row lookup: {per_lookup * 1000:.1f} ms each, "
+                f"~{per_lookup * arguments.records / 60:,.1f} min for {arguments.records:,} records"
+            )
+
+        started = time.perf_counter()
+        result = MODULE.populate(master_path, database_path)
+        elapsed = time.perf_counter() - started
+        print(
+            f"in-memory index: {result.processed:,} records against {arguments.aircraft:,} aircraft "
+            f"in {elapsed:.2f}s ({result.updated:,} updated, {result.not_found:,} not found)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
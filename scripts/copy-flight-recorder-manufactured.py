@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import argparse
 import os
 import sqlite3
 import sys
@@ -9,7 +10,7 @@ import time
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Callable, TextIO
+from typing import Callable, Sequence, TextIO
 
 
 class CopyError(Exception):
@@ -28,7 +29,8 @@ class CopyResult:
     not_found: int = 0
 
 
-ProgressCallback = Callable[[CopyResult, int], None]
+# Called with the running result, recorder rows read and the number of staged recorder rows.
+ProgressCallback = Callable[[CopyResult, int, int], None]
 
 
 class ProgressBar:
@@ -39,18 +41,18 @@ class ProgressBar:
         self.width = width
         self.last_refresh = 0.0
 
-    def update(self, result: CopyResult, total: int) -> None:
+    def update(self, result: CopyResult, consumed: int, total: int) -> None:
         now = time.monotonic()
-        if result.processed not in (1, total) and now - self.last_refresh < 0.1:
+        if consumed < total and now - self.last_refresh < 0.1:
             return
         self.last_refresh = now
-        fraction = result.processed / total if total else 1.0
+        fraction = consumed / total if total else 1.0
         completed = min(self.width, int(fraction * self.width))
         bar = "#" * completed + "-" * (self.width - completed)
-        ending = "\n" if result.processed >= total else ""
+        ending = "\n" if consumed >= total else ""
         print(
             f"\r[{bar}] {fraction:6.1%} "
-            f"({result.processed:,}/{total:,}) updated {result.updated:,}",
+            f"({consumed:,}/{total:,}) updated {result.updated:,}",
             end=ending,
             file=self.output,
             flush=True,
@@ -107,99 +109,233 @@ def find_table(
     return matches[0]
 
 
+def parse_manufactured(registration: object, manufactured: object) -> int:
+    """Convert a flight-recorder manufacture year to an integer."""
+    try:
+        return int(manufactured)
+    except (TypeError, ValueError) as error:
+        raise CopyError(
+            f"Invalid manufactured value for registration {registration!r}: "
+            f"{manufactured!r}"
+        ) from error
+
+
+def stage_source_years(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    source_table_sql: str,
+    year_now: int,
+) -> None:
+    """Stage the first eligible recorder year for each registration in TEMP tables."""
+    # Integer years are used in place; any other stored type is converted with int() exactly
+    # as the row-wise copy does, so both engines accept and reject the same values.
+    target.execute(
+        "CREATE TEMP TABLE COPY_CONVERTED (SourceRow INTEGER PRIMARY KEY, Year INTEGER)"
+    )
+    target.executemany(
+        "INSERT INTO temp.COPY_CONVERTED VALUES (?, ?)",
+        (
+            (rowid, parse_manufactured(registration, manufactured))
+            for rowid, registration, manufactured in source.execute(
+                f'SELECT rowid, "registration", "manufactured" FROM {source_table_sql} '
+                "WHERE typeof(\"manufactured\") NOT IN ('integer', 'null') ORDER BY rowid"
+            )
+        ),
+    )
+    target.execute(
+        f"""CREATE TEMP VIEW COPY_SOURCE AS
+            SELECT s.rowid AS SourceRow,
+                   s."registration" AS Registration,
+                   s."manufactured" AS Manufactured,
+                   COALESCE(c.Year, s."manufactured") AS Year
+            FROM recorder.{source_table_sql} AS s
+            LEFT JOIN temp.COPY_CONVERTED AS c ON c.SourceRow = s.rowid"""
+    )
+
+    # The earliest eligible row for a registration sets the year; later rows only find it populated.
+    target.execute(
+        """CREATE TEMP TABLE COPY_YEAR (
+               Registration TEXT PRIMARY KEY, Year INTEGER NOT NULL, SourceRows INTEGER NOT NULL
+           )"""
+    )
+    target.execute(
+        """INSERT INTO temp.COPY_YEAR (Registration, Year, SourceRows)
+           SELECT Registration, Year, SourceRows
+           FROM (
+               SELECT Registration,
+                      Year,
+                      ROW_NUMBER() OVER (PARTITION BY Registration ORDER BY SourceRow) AS Position,
+                      COUNT(*) OVER (PARTITION BY Registration) AS SourceRows
+               FROM temp.COPY_SOURCE
+               WHERE Manufactured IS NOT NULL AND Year <> ?
+           )
+           WHERE Position = 1""",
+        (year_now,),
+    )
+
+
+def count_set_based(target: sqlite3.Connection, target_table_sql: str, year_now: int) -> CopyResult:
+    """Classify every staged recorder row with a few aggregate queries."""
+    processed, no_manufactured, age_zero = target.execute(
+        """SELECT COUNT(*),
+                  COALESCE(SUM(Manufactured IS NULL), 0),
+                  COALESCE(SUM(Manufactured IS NOT NULL AND Year = ?), 0)
+           FROM temp.COPY_SOURCE""",
+        (year_now,),
+    ).fetchone()
+
+    # Every eligible row after the first for a registration sees all of its matches populated.
+    updated, already_populated, not_found = target.execute(
+        f"""SELECT COALESCE(SUM(CASE WHEN Matches > 0 THEN Missing END), 0),
+                   COALESCE(SUM(CASE WHEN Matches > 0
+                                     THEN Matches - Missing + (SourceRows - 1) * Matches END), 0),
+                   COALESCE(SUM(CASE WHEN Matches = 0 THEN SourceRows END), 0)
+            FROM (
+                SELECT y.SourceRows,
+                       COUNT(t."Registration") AS Matches,
+                       COALESCE(SUM(t."Registration" IS NOT NULL AND t."Manufactured" IS NULL), 0)
+                           AS Missing
+                FROM temp.COPY_YEAR AS y
+                LEFT JOIN main.{target_table_sql} AS t ON t."Registration" = y.Registration
+                GROUP BY y.rowid
+            )"""
+    ).fetchone()
+    return CopyResult(processed, updated, already_populated, age_zero, no_manufactured, not_found)
+
+
+def copy_row_wise(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    source_table_sql: str,
+    target_table_sql: str,
+    year_now: int,
+    total: int,
+    progress: ProgressCallback | None,
+) -> CopyResult:
+    """Look up and update the tracker one flight-recorder row at a time."""
+    processed = updated = already_populated = age_zero = no_manufactured = not_found = 0
+    rows = source.execute(
+        f'SELECT "registration", "manufactured" FROM {source_table_sql}'
+    )
+    for registration, manufactured in rows:
+        processed += 1
+        if manufactured is None:
+            no_manufactured += 1
+        else:
+            manufactured_year = parse_manufactured(registration, manufactured)
+            if manufactured_year == year_now:
+                age_zero += 1
+            else:
+                matches = target.execute(
+                    f'SELECT "Manufactured" FROM {target_table_sql} '
+                    'WHERE "Registration" = ?',
+                    (registration,),
+                ).fetchall()
+                if not matches:
+                    not_found += 1
+                else:
+                    populated = sum(value is not None for (value,) in matches)
+                    already_populated += populated
+                    if len(matches) > populated:
+                        cursor = target.execute(
+                            f'UPDATE {target_table_sql} SET "Manufactured" = ? '
+                            'WHERE "Registration" = ? AND "Manufactured" IS NULL',
+                            (manufactured_year, registration),
+                        )
+                        updated += cursor.rowcount
+        if progress:
+            progress(
+                CopyResult(
+                    processed, updated, already_populated, age_zero, no_manufactured, not_found
+                ),
+                processed,
+                total,
+            )
+    return CopyResult(processed, updated, already_populated, age_zero, no_manufactured, not_found)
+
+
 def copy_manufactured(
     flight_recorder_path: Path,
     aircraft_tracker_path: Path,
     progress: ProgressCallback | None = None,
     current_year: int | None = None,
+    verify: bool = False,
 ) -> CopyResult:
-    """Copy manufacture years by iterating over the smaller recorder database."""
+    """Copy manufacture years from the recorder, set-based unless verifying row by row."""
     if flight_recorder_path.resolve() == aircraft_tracker_path.resolve():
         raise CopyError("The flight recorder and aircraft tracker must be different files")
 
     year_now = current_year if current_year is not None else date.today().year
-    result = CopyResult()
+    recorder_uri = f"{flight_recorder_path.resolve().as_uri()}?mode=ro"
     with (
-        sqlite3.connect(f"file:{flight_recorder_path.resolve()}?mode=ro", uri=True) as source,
-        sqlite3.connect(aircraft_tracker_path.resolve()) as target,
+        sqlite3.connect(recorder_uri, uri=True) as source,
+        sqlite3.connect(aircraft_tracker_path.resolve().as_uri(), uri=True) as target,
     ):
         source_table = find_table(source, "registration", "manufactured", "flight recorder")
         target_table = find_table(target, "Registration", "Manufactured", "aircraft tracker")
         source_table_sql = quote_identifier(source_table)
         target_table_sql = quote_identifier(target_table)
-        total = source.execute(f"SELECT COUNT(*) FROM {source_table_sql}").fetchone()[0]
 
+        # ATTACH is not allowed inside a transaction, so join the recorder before locking.
+        target.execute("ATTACH DATABASE ? AS recorder", (recorder_uri,))
         target.execute("BEGIN IMMEDIATE")
         try:
-            rows = source.execute(
-                f'SELECT "registration", "manufactured" FROM {source_table_sql}'
-            )
-            for registration, manufactured in rows:
-                result = CopyResult(
-                    processed=result.processed + 1,
-                    updated=result.updated,
-                    already_populated=result.already_populated,
-                    age_zero=result.age_zero,
-                    no_manufactured=result.no_manufactured,
-                    not_found=result.not_found,
+            stage_source_years(source, target, source_table_sql, year_now)
+            result = count_set_based(target, target_table_sql, year_now)
+            # Staging has already counted the recorder rows, so no separate COUNT(*) pass is needed.
+            total = result.processed
+            if verify:
+                # Apply the original row-wise copy and require it to agree with the SQL counters.
+                expected = result
+                result = copy_row_wise(
+                    source, target, source_table_sql, target_table_sql, year_now, total, progress
+                )
+                if result != expected:
+                    raise CopyError(
+                        f"Row-wise result {result} does not match set-based result {expected}"
+                    )
+            else:
+                target.execute(
+                    f"""UPDATE main.{target_table_sql}
+                        SET "Manufactured" = y.Year
+                        FROM temp.COPY_YEAR AS y
+                        WHERE {target_table_sql}."Registration" = y.Registration
+                          AND {target_table_sql}."Manufactured" IS NULL"""
                 )
 
-                if manufactured is None:
-                    result = CopyResult(**{**result.__dict__, "no_manufactured": result.no_manufactured + 1})
-                else:
-                    try:
-                        manufactured_year = int(manufactured)
-                    except (TypeError, ValueError) as error:
-                        raise CopyError(
-                            f"Invalid manufactured value for registration {registration!r}: "
-                            f"{manufactured!r}"
-                        ) from error
-
-                    if manufactured_year == year_now:
-                        result = CopyResult(**{**result.__dict__, "age_zero": result.age_zero + 1})
-                    else:
-                        matches = target.execute(
-                            f'SELECT "Manufactured" FROM {target_table_sql} '
-                            'WHERE "Registration" = ?',
-                            (registration,),
-                        ).fetchall()
-                        if not matches:
-                            result = CopyResult(**{**result.__dict__, "not_found": result.not_found + 1})
-                        else:
-                            populated = sum(value is not None for (value,) in matches)
-                            missing = len(matches) - populated
-                            if populated:
-                                result = CopyResult(
-                                    **{**result.__dict__, "already_populated": result.already_populated + populated}
-                                )
-                            if missing:
-                                cursor = target.execute(
-                                    f'UPDATE {target_table_sql} SET "Manufactured" = ? '
-                                    'WHERE "Registration" = ? AND "Manufactured" IS NULL',
-                                    (manufactured_year, registration),
-                                )
-                                result = CopyResult(
-                                    **{**result.__dict__, "updated": result.updated + cursor.rowcount}
-                                )
-                if progress:
-                    progress(result, total)
-
-            if progress and total == 0:
-                progress(result, total)
+            if progress and (not verify or total == 0):
+                progress(result, total, total)
             target.commit()
         except Exception:
             target.rollback()
             raise
+        finally:
+            target.execute("DROP VIEW IF EXISTS temp.COPY_SOURCE")
+            target.execute("DROP TABLE IF EXISTS temp.COPY_YEAR")
+            target.execute("DROP TABLE IF EXISTS temp.COPY_CONVERTED")
+            target.execute("DETACH DATABASE recorder")
     return result
 
 
-def main() -> int:
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-v", "--verify", action="store_true",
+        help="apply the copy row by row and check it against the set-based counters",
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
     """Copy manufacture years using database paths from the environment."""
+    options = parse_arguments(arguments)
     try:
         result = copy_manufactured(
             database_path("FLIGHT_RECORDER_DB"),
             database_path("AIRCRAFT_TRACKER_DB"),
             ProgressBar().update,
+            verify=options.verify,
         )
     except (CopyError, sqlite3.Error, OSError) as error:
         print(f"Error: {error}", file=sys.stderr)
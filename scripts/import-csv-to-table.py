@@ -1,8 +1,20 @@
 import argparse
 import csv
+import os
+import queue
 import sqlite3
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import Manager
 from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+DEFAULT_BATCH_SIZE = 5000
+FAST_CACHE_SIZE_KIB = 262144
+LOCK_TIMEOUT_SECONDS = 5.0
+QUEUED_BATCHES_PER_FILE = 4
+QUEUE_POLL_SECONDS = 0.1
 
 
 def get_table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
@@ -15,88 +27,482 @@ def get_table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
     return [row[1] for row in rows]
 
 
+def apply_fast_load_profile(conn: sqlite3.Connection) -> None:
+    # WAL persists in the database file. The remaining settings last only
+    # for this connection, so the live tracker keeps its own durability.
+    journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+
+    if str(journal_mode).lower() != "wal":
+        raise ValueError(
+            f"Unable to switch the database to WAL mode (journal mode is {journal_mode})."
+        )
+
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(f"PRAGMA cache_size=-{FAST_CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection, table: str) -> list[str]:
+    # Only plain CREATE INDEX indexes are dropped. UNIQUE indexes stay live
+    # because duplicate detection and --ignore-duplicates depend on them.
+    statements = []
+
+    for _, name, unique, origin, _ in conn.execute(
+        f'PRAGMA index_list("{table}")'
+    ).fetchall():
+        if origin != "c" or unique:
+            continue
+
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (name,),
+        ).fetchone()
+
+        if row is None or not row[0]:
+            continue
+
+        statements.append(row[0])
+        conn.execute(f'DROP INDEX "{name}"')
+
+    return statements
+
+
+def insert_rows(
+    conn: sqlite3.Connection,
+    insert_sql: str,
+    rows: list[dict[str, str]],
+    first_row_number: int,
+) -> tuple[int, int]:
+    inserted = 0
+    skipped = 0
+
+    for row_number, row in enumerate(rows, start=first_row_number):
+        before = conn.total_changes
+
+        try:
+            conn.execute(insert_sql, row)
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(
+                f"Import failed at CSV row {row_number}: {exc}"
+            ) from exc
+
+        if conn.total_changes > before:
+            inserted += 1
+        else:
+            skipped += 1
+
+    return inserted, skipped
+
+
+def insert_batch(
+    conn: sqlite3.Connection,
+    insert_sql: str,
+    rows: list[dict[str, str]],
+    first_row_number: int,
+) -> tuple[int, int]:
+    # A savepoint lets a failed batch be undone and replayed one row at
+    # a time, so the error still names the offending CSV row.
+    conn.execute("SAVEPOINT import_batch")
+    before = conn.total_changes
+
+    try:
+        conn.executemany(insert_sql, rows)
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO import_batch")
+        result = insert_rows(conn, insert_sql, rows, first_row_number)
+    else:
+        inserted = conn.total_changes - before
+        result = (inserted, len(rows) - inserted)
+
+    conn.execute("RELEASE import_batch")
+    return result
+
+
+def validate_csv_columns(
+    csv_columns: list[str] | None,
+    table_columns: list[str],
+) -> list[str]:
+    if not csv_columns:
+        raise ValueError("CSV file has no header row.")
+
+    if "Id" not in csv_columns:
+        raise ValueError("CSV file must contain an 'Id' column.")
+
+    unknown_columns = [
+        column
+        for column in csv_columns
+        if column not in table_columns
+    ]
+
+    if unknown_columns:
+        raise ValueError(
+            "CSV contains columns not present in the target table: "
+            + ", ".join(unknown_columns)
+        )
+
+    return list(csv_columns)
+
+
+def build_insert_sql(
+    table: str,
+    csv_columns: list[str],
+    ignore_duplicates: bool,
+) -> str:
+    quoted_columns = ", ".join(
+        f'"{column}"' for column in csv_columns
+    )
+
+    placeholders = ", ".join(
+        f":{column}" for column in csv_columns
+    )
+
+    if ignore_duplicates:
+        return (
+            f'INSERT OR IGNORE INTO "{table}" '
+            f"({quoted_columns}) VALUES ({placeholders})"
+        )
+
+    return (
+        f'INSERT INTO "{table}" '
+        f"({quoted_columns}) VALUES ({placeholders})"
+    )
+
+
+def insert_in_batches(
+    conn: sqlite3.Connection,
+    insert_sql: str,
+    rows: Iterable[dict[str, str]],
+    batch_size: int,
+) -> tuple[int, int]:
+    inserted = 0
+    skipped = 0
+    batch: list[dict[str, str]] = []
+    first_row_number = 2
+
+    for row_number, row in enumerate(rows, start=2):
+        if not batch:
+            first_row_number = row_number
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            batch_inserted, batch_skipped = insert_batch(
+                conn, insert_sql, batch, first_row_number
+            )
+            inserted += batch_inserted
+            skipped += batch_skipped
+            batch = []
+
+    if batch:
+        batch_inserted, batch_skipped = insert_batch(
+            conn, insert_sql, batch, first_row_number
+        )
+        inserted += batch_inserted
+        skipped += batch_skipped
+
+    return inserted, skipped
+
+
 def import_csv(
     csv_path: Path,
     db_path: Path,
     table: str,
     ignore_duplicates: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fast: bool = False,
+    defer_indexes: bool = False,
 ) -> tuple[int, int]:
-    inserted = 0
-    skipped = 0
-
     with csv_path.open("r", newline="", encoding="utf-8-sig") as csv_file:
         reader = csv.DictReader(csv_file)
 
-        if not reader.fieldnames:
-            raise ValueError("CSV file has no header row.")
+        with sqlite3.connect(db_path, timeout=LOCK_TIMEOUT_SECONDS) as conn:
+            csv_columns = validate_csv_columns(
+                reader.fieldnames, get_table_columns(conn, table)
+            )
+            insert_sql = build_insert_sql(table, csv_columns, ignore_duplicates)
 
-        csv_columns = reader.fieldnames
+            if fast:
+                apply_fast_load_profile(conn)
 
-        if "Id" not in csv_columns:
-            raise ValueError("CSV file must contain an 'Id' column.")
+            try:
+                # Hold the whole import in one transaction; each batch is
+                # a savepoint within it. IMMEDIATE takes the write lock up
+                # front, so the import refuses to run alongside another writer.
+                conn.execute("BEGIN IMMEDIATE")
+                index_statements = (
+                    drop_secondary_indexes(conn, table) if defer_indexes else []
+                )
+                inserted, skipped = insert_in_batches(
+                    conn, insert_sql, reader, batch_size
+                )
 
-        with sqlite3.connect(db_path) as conn:
-            table_columns = get_table_columns(conn, table)
+                # Rebuilding each index once is cheaper than maintaining it
+                # for every inserted row.
+                for statement in index_statements:
+                    conn.execute(statement)
 
-            unknown_columns = [
-                column
-                for column in csv_columns
-                if column not in table_columns
-            ]
+            except Exception:
+                conn.rollback()
+                raise
 
-            if unknown_columns:
-                raise ValueError(
-                    "CSV contains columns not present in the target table: "
-                    + ", ".join(unknown_columns)
-                )
+            conn.commit()
+
+    return inserted, skipped
+
+
+def table_for_csv(csv_path: Path, tables: list[str]) -> str:
+    # Accept the template naming used under data/import, for example
+    # "manufacturers-template.csv" for the MANUFACTURER table.
+    stem = csv_path.stem.casefold().removesuffix("-template")
+    candidates = [stem, stem.removesuffix("s")]
+
+    for candidate in candidates:
+        for table in tables:
+            if table.casefold() == candidate:
+                return table
+
+    raise ValueError(f"No table matches CSV file name: {csv_path.name}")
+
+
+def dependency_order(conn: sqlite3.Connection, tables: list[str]) -> list[str]:
+    # Order tables so every table follows the tables its foreign keys
+    # reference, keeping the caller's order among independent tables.
+    pending = list(dict.fromkeys(tables))
+    dependencies = {
+        table: {
+            row[2].casefold()
+            for row in conn.execute(f'PRAGMA foreign_key_list("{table}")')
+        } - {table.casefold()}
+        for table in pending
+    }
+    ordered: list[str] = []
+
+    while pending:
+        remaining = {table.casefold() for table in pending}
+        ready = [
+            table
+            for table in pending
+            if not dependencies[table] & remaining
+        ]
 
-            quoted_columns = ", ".join(
-                f'"{column}"' for column in csv_columns
+        if not ready:
+            raise ValueError(
+                "Foreign keys form a cycle between tables: " + ", ".join(pending)
             )
 
-            placeholders = ", ".join(
-                f":{column}" for column in csv_columns
+        ordered.extend(ready)
+        pending = [table for table in pending if table not in ready]
+
+    return ordered
+
+
+def put_chunk(rows: Any, chunk: Any, stop: Any) -> bool:
+    # Wait for room in the bounded queue, giving up once the writer
+    # has stopped so a failed import does not leave workers blocked.
+    while not stop.is_set():
+        try:
+            rows.put(chunk, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+def read_csv_rows(
+    csv_path: Path,
+    table_columns: list[str],
+    rows: Any,
+    batch_size: int,
+    stop: Any,
+) -> None:
+    # Runs in a worker process, so parsing and header validation for
+    # independent files overlap while the writer is busy elsewhere. The
+    # validated columns go first, then rows in batches through a bounded
+    # queue, so a worker never holds more than a few batches of its file.
+    try:
+        with csv_path.open("r", newline="", encoding="utf-8-sig") as csv_file:
+            reader = csv.DictReader(csv_file)
+            csv_columns = validate_csv_columns(reader.fieldnames, table_columns)
+
+            if not put_chunk(rows, csv_columns, stop):
+                return
+
+            batch = []
+
+            for row in reader:
+                batch.append(row)
+
+                if len(batch) >= batch_size:
+                    if not put_chunk(rows, batch, stop):
+                        return
+                    batch = []
+
+            if batch:
+                put_chunk(rows, batch, stop)
+
+    except (ValueError, csv.Error) as exc:
+        raise ValueError(f"{csv_path.name}: {exc}") from exc
+
+    finally:
+        # None marks the end of the file, including one that failed to parse.
+        put_chunk(rows, None, stop)
+
+
+def take_chunk(rows: Any, future: Future) -> Any:
+    while True:
+        try:
+            return rows.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            # A worker that died without sending the end marker raises here.
+            if future.done():
+                future.result()
+                return rows.get_nowait()
+
+
+def queued_rows(rows: Any, future: Future) -> Iterator[dict[str, str]]:
+    while (chunk := take_chunk(rows, future)) is not None:
+        yield from chunk
+
+
+def import_directory(
+    directory: Path,
+    db_path: Path,
+    ignore_duplicates: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fast: bool = False,
+    defer_indexes: bool = False,
+    workers: int | None = None,
+) -> list[tuple[Path, str, int, int]]:
+    csv_paths = sorted(directory.glob("*.csv"))
+
+    if not csv_paths:
+        raise ValueError(f"No CSV files found in {directory}")
+
+    with sqlite3.connect(db_path, timeout=LOCK_TIMEOUT_SECONDS) as conn:
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
             )
+        ]
+        csv_tables = {csv_path: table_for_csv(csv_path, tables) for csv_path in csv_paths}
+        table_order = dependency_order(conn, list(csv_tables.values()))
+        csv_paths.sort(key=lambda csv_path: table_order.index(csv_tables[csv_path]))
+        table_columns = {
+            table: get_table_columns(conn, table) for table in table_order
+        }
 
-            if ignore_duplicates:
-                insert_sql = (
-                    f'INSERT OR IGNORE INTO "{table}" '
-                    f"({quoted_columns}) VALUES ({placeholders})"
-                )
-            else:
-                insert_sql = (
-                    f'INSERT INTO "{table}" '
-                    f"({quoted_columns}) VALUES ({placeholders})"
+        # Referenced rows are loaded first, so have SQLite check each
+        # reference as it is inserted rather than trusting the file order.
+        conn.execute("PRAGMA foreign_keys=ON")
+
+        if fast:
+            apply_fast_load_profile(conn)
+
+        results = []
+
+        with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+            # Every file is parsed at once; the single writer then consumes
+            # them in dependency order as their batches become available.
+            stop = manager.Event()
+            queues = [
+                manager.Queue(maxsize=QUEUED_BATCHES_PER_FILE) for _ in csv_paths
+            ]
+            futures = [
+                executor.submit(
+                    read_csv_rows,
+                    csv_path,
+                    table_columns[csv_tables[csv_path]],
+                    rows,
+                    batch_size,
+                    stop,
                 )
+                for csv_path, rows in zip(csv_paths, queues)
+            ]
 
             try:
-                for row_number, row in enumerate(reader, start=2):
-                    before = conn.total_changes
+                conn.execute("BEGIN IMMEDIATE")
+                index_statements = []
+
+                if defer_indexes:
+                    for table in table_order:
+                        index_statements.extend(drop_secondary_indexes(conn, table))
+
+                for csv_path, future, rows in zip(csv_paths, futures, queues):
+                    table = csv_tables[csv_path]
+                    csv_columns = take_chunk(rows, future)
+
+                    if csv_columns is None:
+                        # The header was rejected; raise the worker's error.
+                        future.result()
+
+                    insert_sql = build_insert_sql(table, csv_columns, ignore_duplicates)
 
                     try:
-                        conn.execute(insert_sql, row)
-                    except sqlite3.IntegrityError as exc:
-                        raise ValueError(
-                            f"Import failed at CSV row {row_number}: {exc}"
-                        ) from exc
+                        inserted, skipped = insert_in_batches(
+                            conn, insert_sql, queued_rows(rows, future), batch_size
+                        )
+                    except ValueError as exc:
+                        raise ValueError(f"{csv_path.name}: {exc}") from exc
 
-                    if conn.total_changes > before:
-                        inserted += 1
-                    else:
-                        skipped += 1
+                    # Raise any parse error found after the rows already inserted.
+                    future.result()
+                    results.append((csv_path, table, inserted, skipped))
+
+                for statement in index_statements:
+                    conn.execute(statement)
 
             except Exception:
                 conn.rollback()
+                stop.set()
+
+                for future in futures:
+                    future.cancel()
+
                 raise
 
             conn.commit()
 
-    return inserted, skipped
+    return results
+
+
+def main_directory(args: argparse.Namespace) -> int:
+    try:
+        results = import_directory(
+            directory=args.directory,
+            db_path=args.database,
+            ignore_duplicates=args.ignore_duplicates,
+            batch_size=args.batch_size,
+            fast=args.fast,
+            defer_indexes=args.defer_indexes,
+            workers=args.workers,
+        )
+
+    except (sqlite3.Error, ValueError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    for csv_path, table, inserted, skipped in results:
+        print(f"{table} ({csv_path.name}) - inserted {inserted} rows, skipped {skipped} duplicates.")
+
+    print(
+        f"Import complete - inserted {sum(result[2] for result in results)} rows, "
+        f"skipped {sum(result[3] for result in results)} duplicates "
+        f"across {len(results)} files."
+    )
+    return 0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("-c", "--csv", type=Path, help="Path to the CSV file")
+    parser.add_argument("-dir", "--directory", type=Path,
+        help=(
+            "Import every CSV file in a folder, naming each file after its "
+            "table and loading tables in foreign-key order"
+        )
+    )
     parser.add_argument("-db", "--database", type=Path, help="Path to the SQLite database")
     parser.add_argument("-t", "--table", help="Target table name")
     parser.add_argument("-id", "--ignore-duplicates",action="store_true", 
@@ -105,12 +511,58 @@ def main() -> int:
             "instead of aborting the import"
         )
     )
+    parser.add_argument("-b", "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Number of rows inserted per batch (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument("-f", "--fast", action="store_true",
+        help=(
+            "Switch the database to WAL mode and load with synchronous=OFF, "
+            "a larger page cache and in-memory temporary storage"
+        )
+    )
+    parser.add_argument("-di", "--defer-indexes", action="store_true",
+        help=(
+            "Drop the target table's non-unique indexes for the load and "
+            "recreate them before committing"
+        )
+    )
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Number of processes used to parse CSV files with --directory"
+    )
     args = parser.parse_args()
 
-    if not args.csv.is_file():
+    if args.batch_size < 1:
+        print("Error: --batch-size must be a positive integer", file=sys.stderr)
+        return 1
+
+    if args.workers < 1:
+        print("Error: --workers must be a positive integer", file=sys.stderr)
+        return 1
+
+    if (args.csv is None) == (args.directory is None):
+        print("Error: supply exactly one of --csv or --directory", file=sys.stderr)
+        return 1
+
+    if args.directory is not None and not args.directory.is_dir():
+        print(f"Error: CSV folder not found: {args.directory}", file=sys.stderr)
+        return 1
+
+    if args.csv is not None and not args.csv.is_file():
         print(f"Error: CSV file not found: {args.csv}", file=sys.stderr)
         return 1
 
+    if args.csv is not None and not args.table:
+        print("Error: --table is required with --csv", file=sys.stderr)
+        return 1
+
+    if args.directory is not None and args.table:
+        print(
+            "Error: --table cannot be used with --directory; "
+            "tables are named after the CSV files",
+            file=sys.stderr,
+        )
+        return 1
+
     if not args.database.is_file():
         print(
             f"Error: database file not found: {args.database}",
@@ -118,12 +570,18 @@ def main() -> int:
         )
         return 1
 
+    if args.directory is not None:
+        return main_directory(args)
+
     try:
         inserted, skipped = import_csv(
             csv_path=args.csv,
             db_path=args.database,
             table=args.table,
             ignore_duplicates=args.ignore_duplicates,
+            batch_size=args.batch_size,
+            fast=args.fast,
+            defer_indexes=args.defer_indexes,
         )
 
     except (sqlite3.Error, ValueError, OSError) as exc:
@@ -0,0 +1,95 @@
+"""Stream KML Placemarks without building the whole document tree."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class KmlPlacemark:
+    """Describe one Placemark and the Document and Folder containing it.
+
+    The element is complete only until the iterator advances, when it is discarded.
+    """
+
+    number: int
+    element: ET.Element
+    document_name: str | None
+    folder_name: str | None
+    folder_number: int | None
+
+
+def local_name(tag: str) -> str:
+    """Remove any XML namespace from an element tag.
+
+    :param tag: ElementTree tag, optionally prefixed with a {namespace}.
+    :return: Unqualified element name.
+    """
+    # Match on local names so KML with or without a default namespace reads identically.
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_placemarks(kml_path: Path) -> Iterator[KmlPlacemark]:
+    """Yield each Placemark in document order, discarding it once it has been consumed.
+
+    :param kml_path: Source KML path.
+    :return: Iterator of Placemarks with their containing Document and Folder details.
+    :raises ET.ParseError: If the file is not well-formed XML.
+    :raises OSError: If the file cannot be read.
+    """
+    # The open element stack locates parents, so processed elements can be detached as we go.
+    stack: list[ET.Element] = []
+    folder_numbers: list[int] = []
+    folder_names: list[str | None] = []
+    document_name: str | None = None
+    placemark_number = 0
+    folder_count = 0
+    # Tags repeat for every Placemark, so strip each distinct namespace only once.
+    names: dict[str, str] = {}
+    with kml_path.open("rb") as source:
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            tag = element.tag
+            name = names.get(tag)
+            if name is None:
+                name = names[tag] = local_name(tag)
+            if event == "start":
+                stack.append(element)
+                if name == "Folder":
+                    folder_count += 1
+                    folder_numbers.append(folder_count)
+                    folder_names.append(None)
+                continue
+
+            # Most elements are Placemark content, which callers read from the Placemark itself.
+            stack.pop()
+            if name not in ("Placemark", "Folder", "name"):
+                continue
+            parent = stack[-1] if stack else None
+            parent_name = names[parent.tag] if parent is not None else None
+            if name == "name":
+                if parent_name == "Document" and document_name is None:
+                    document_name = (element.text or "").strip()
+                elif parent_name == "Folder" and folder_names[-1] is None:
+                    folder_names[-1] = (element.text or "").strip()
+                continue
+            if name == "Placemark":
+                placemark_number += 1
+                in_folder = parent_name == "Folder"
+                yield KmlPlacemark(
+                    placemark_number,
+                    element,
+                    document_name,
+                    folder_names[-1] if in_folder else None,
+                    folder_numbers[-1] if in_folder else None,
+                )
+            else:
+                folder_numbers.pop()
+                folder_names.pop()
+
+            # Detach consumed Placemarks and Folders so memory stays flat on large archives.
+            element.clear()
+            if parent is not None:
+                parent.remove(element)
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import csv
+import io
 import os
 from pathlib import Path
 import re
@@ -44,7 +46,17 @@ def parse_arguments() -> argparse.Namespace:
         type=Path,
         help="path to the output CSV file",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="convert newline-aligned chunks of the input in this many processes",
+    )
+    arguments = parser.parse_args()
+    if arguments.workers < 1:
+        parser.error("--workers must be a positive integer")
+    return arguments
 
 
 def database_path_from_environment() -> Path:
@@ -76,46 +88,114 @@ def load_model_icao_codes(database_path: Path) -> set[str]:
         return {str(row[0]).strip().upper() for row in rows}
 
 
-def convert(input_path: Path, output_path: Path, model_codes: set[str]) -> tuple[int, int]:
+def convert_records(source, writer: csv.DictWriter, model_codes: set[str]) -> tuple[int, int]:
     read_count = 0
     written_count = 0
 
+    for fields in csv.reader(source, delimiter="\t"):
+        if not fields or all(not field.strip() for field in fields):
+            continue
+        read_count += 1
+
+        # Mictronics records are tab-delimited. A whitespace fallback
+        # makes the converter tolerant of copies with tabs expanded.
+        if len(fields) < 3:
+            fields = fields[0].split(maxsplit=3)
+        if len(fields) < 3:
+            continue
+
+        address = fields[0].strip().upper()
+        registration = fields[1].strip()
+        model_icao = fields[2].strip().upper()
+
+        if not ADDRESS_PATTERN.fullmatch(address) or model_icao not in model_codes:
+            continue
+
+        writer.writerow(
+            {
+                "Address": address,
+                "Registration": registration,
+                "IATA": "",
+                "ICAO": model_icao,
+                "Manufactured": "",
+                "Provenance": "",
+            }
+        )
+        written_count += 1
+
+    return read_count, written_count
+
+
+def convert(input_path: Path, output_path: Path, model_codes: set[str]) -> tuple[int, int]:
     with input_path.open("r", encoding="utf-8-sig", errors="replace", newline="") as source:
         with output_path.open("w", encoding="utf-8", newline="") as destination:
             writer = csv.DictWriter(destination, fieldnames=OUTPUT_HEADERS)
             writer.writeheader()
+            return convert_records(source, writer, model_codes)
+
+
+def chunk_ranges(input_path: Path, chunks: int) -> list[tuple[int, int]]:
+    size = input_path.stat().st_size
+    boundaries = [0]
+    with input_path.open("rb") as source:
+        for chunk in range(1, chunks):
+            # Move each nominal boundary forward to the start of the next line.
+            target = max(boundaries[-1], size * chunk // chunks)
+            if target >= size:
+                break
+            if target > 0:
+                source.seek(target - 1)
+                source.readline()
+            if source.tell() > boundaries[-1]:
+                boundaries.append(source.tell())
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def convert_chunk(
+    input_path: Path, start: int, end: int, model_codes: set[str]
+) -> tuple[int, int, str, bool]:
+    with input_path.open("rb") as source:
+        source.seek(start)
+        data = source.read(end - start)
+
+    # Only the first chunk can begin with a byte order mark.
+    text = data.decode("utf-8-sig" if start == 0 else "utf-8", errors="replace")
+    destination = io.StringIO(newline="")
+    writer = csv.DictWriter(destination, fieldnames=OUTPUT_HEADERS)
+    read_count, written_count = convert_records(io.StringIO(text, newline=""), writer, model_codes)
+    return read_count, written_count, destination.getvalue(), b'"' in data
+
+
+def convert_parallel(
+    input_path: Path, output_path: Path, model_codes: set[str], workers: int
+) -> tuple[int, int]:
+    ranges = chunk_ranges(input_path, workers * 4)
+    read_count = 0
+    written_count = 0
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(ranges), 1))) as executor:
+        results = list(
+            executor.map(
+                convert_chunk,
+                [input_path] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                [model_codes] * len(ranges),
+            )
+        )
 
-            for fields in csv.reader(source, delimiter="\t"):
-                if not fields or all(not field.strip() for field in fields):
-                    continue
-                read_count += 1
-
-                # Mictronics records are tab-delimited. A whitespace fallback
-                # makes the converter tolerant of copies with tabs expanded.
-                if len(fields) < 3:
-                    fields = fields[0].split(maxsplit=3)
-                if len(fields) < 3:
-                    continue
-
-                address = fields[0].strip().upper()
-                registration = fields[1].strip()
-                model_icao = fields[2].strip().upper()
-
-                if not ADDRESS_PATTERN.fullmatch(address) or model_icao not in model_codes:
-                    continue
-
-                writer.writerow(
-                    {
-                        "Address": address,
-                        "Registration": registration,
-                        "IATA": "",
-                        "ICAO": model_icao,
-                        "Manufactured": "",
-                        "Provenance": "",
-                    }
-                )
-                written_count += 1
-
+    # A quoted field may span lines, which a newline-aligned split cannot
+    # see, so quoted input is converted serially to keep the output identical.
+    if any(quoted for *_, quoted in results):
+        return convert(input_path, output_path, model_codes)
+
+    with output_path.open("w", encoding="utf-8", newline="") as destination:
+        writer = csv.DictWriter(destination, fieldnames=OUTPUT_HEADERS)
+        writer.writeheader()
+        for chunk_read, chunk_written, text, _ in results:
+            destination.write(text)
+            read_count += chunk_read
+            written_count += chunk_written
     return read_count, written_count
 
 
@@ -124,7 +204,12 @@ def main() -> int:
     try:
         database_path = database_path_from_environment()
         model_codes = load_model_icao_codes(database_path)
-        read_count, written_count = convert(arguments.input, arguments.output, model_codes)
+        if arguments.workers > 1:
+            read_count, written_count = convert_parallel(
+                arguments.input, arguments.output, model_codes, arguments.workers
+            )
+        else:
+            read_count, written_count = convert(arguments.input, arguments.output, model_codes)
     except (OSError, sqlite3.Error, ValueError) as error:
         print(f"error: {error}", file=sys.stderr)
         return 1
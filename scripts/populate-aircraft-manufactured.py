@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 import sqlite3
 import sys
 import time
@@ -29,7 +30,8 @@ class PopulationResult:
     updated: int = 0
 
 
-ProgressCallback = Callable[[PopulationResult, int], None]
+# Called with the running result, MASTER.txt bytes consumed and the file size in bytes.
+ProgressCallback = Callable[[PopulationResult, int, int], None]
 
 
 class ProgressBar:
@@ -40,19 +42,19 @@ class ProgressBar:
         self.width = width
         self.last_refresh = 0.0
 
-    def update(self, result: PopulationResult, total: int) -> None:
-        """Refresh periodically, and always render the first and last records."""
+    def update(self, result: PopulationResult, consumed: int, total: int) -> None:
+        """Refresh periodically, and always render the end of the file."""
         now = time.monotonic()
-        if result.processed not in (1, total) and now - self.last_refresh < 0.1:
+        if consumed < total and now - self.last_refresh < 0.1:
             return
         self.last_refresh = now
-        fraction = result.processed / total if total else 1.0
+        fraction = consumed / total if total else 1.0
         completed = min(self.width, int(fraction * self.width))
         bar = "#" * completed + "-" * (self.width - completed)
-        ending = "\n" if result.processed >= total else ""
+        ending = "\n" if consumed >= total else ""
         print(
             f"\r[{bar}] {fraction:6.1%} "
-            f"({result.processed:,}/{total:,}) updated {result.updated:,}",
+            f"({result.processed:,} records) updated {result.updated:,}",
             end=ending,
             file=self.output,
             flush=True,
@@ -105,15 +107,16 @@ def parse_year(value: str, row_number: int) -> int | None:
     return int(stripped)
 
 
-def count_records(master_path: Path) -> int:
-    """Count CSV data records so progress can be displayed as a percentage."""
-    try:
-        with master_path.open("r", encoding="utf-8-sig", newline="") as source:
-            reader = csv.reader(source)
-            next(reader, None)
-            return sum(1 for _ in reader)
-    except OSError as error:
-        raise PopulationError(f"Unable to read MASTER.txt: {error}") from error
+def load_registrations(connection: sqlite3.Connection) -> dict[str, list[list]]:
+    """Index AIRCRAFT by normalised registration as [Id, Manufactured] pairs."""
+    # Normalise in SQL so keys match UPPER(TRIM()) exactly, including its ASCII-only folding.
+    registrations: dict[str, list[list]] = {}
+    for identifier, manufactured, registration in connection.execute(
+        "SELECT Id, Manufactured, UPPER(TRIM(Registration)) FROM AIRCRAFT"
+    ):
+        if registration is not None:
+            registrations.setdefault(registration, []).append([identifier, manufactured])
+    return registrations
 
 
 def populate(
@@ -124,11 +127,11 @@ def populate(
     """Apply FAA manufacture years in a single database transaction."""
     master_path = validate_file(master_path, "MASTER.txt file")
     database_path = validate_file(database_path, "Tracker database")
-    total_records = count_records(master_path) if progress else 0
-    result = PopulationResult()
+    processed = blank_year = not_found = unchanged = updated = 0
 
     try:
         source = master_path.open("r", encoding="utf-8-sig", newline="")
+        total_bytes = os.fstat(source.fileno()).st_size
     except OSError as error:
         raise PopulationError(f"Unable to read MASTER.txt: {error}") from error
 
@@ -146,66 +149,51 @@ def populate(
 
         connection.execute("BEGIN IMMEDIATE")
         try:
+            # Match in memory: the UPPER(TRIM()) lookup cannot use an index, so each query scanned AIRCRAFT.
+            registrations = load_registrations(connection)
+            changes: dict[int, int] = {}
+            # The binary buffer advances a chunk at a time, so report once per chunk read.
+            reported_bytes = 0
             for row_number, row in enumerate(reader, start=2):
-                result = PopulationResult(
-                    processed=result.processed + 1,
-                    blank_year=result.blank_year,
-                    not_found=result.not_found,
-                    unchanged=result.unchanged,
-                    updated=result.updated,
-                )
+                processed += 1
                 year = parse_year(row["YEAR MFR"], row_number)
                 if year is None:
-                    result = PopulationResult(
-                        result.processed, result.blank_year + 1,
-                        result.not_found, result.unchanged, result.updated
-                    )
-                    if progress:
-                        progress(result, total_records)
-                    continue
-
-                n_number = row["N-NUMBER"].strip().upper()
-                if not n_number:
-                    raise PopulationError(
-                        f"YEAR MFR is set but N-NUMBER is blank at MASTER.txt row {row_number}"
-                    )
-                registration = "N" + n_number
-                rows = connection.execute(
-                    """SELECT Id, Manufactured FROM AIRCRAFT
-                       WHERE UPPER(TRIM(Registration)) = ?""",
-                    (registration,),
-                ).fetchall()
-                if not rows:
-                    result = PopulationResult(
-                        result.processed, result.blank_year,
-                        result.not_found + 1, result.unchanged, result.updated
-                    )
-                    if progress:
-                        progress(result, total_records)
-                    continue
-
-                changed_ids = [identifier for identifier, current_year in rows if current_year != year]
-                if not changed_ids:
-                    result = PopulationResult(
-                        result.processed, result.blank_year,
-                        result.not_found, result.unchanged + 1, result.updated
-                    )
-                    if progress:
-                        progress(result, total_records)
-                    continue
-
-                connection.executemany(
-                    "UPDATE AIRCRAFT SET Manufactured = ? WHERE Id = ?",
-                    ((year, identifier) for identifier in changed_ids),
-                )
-                result = PopulationResult(
-                    result.processed, result.blank_year, result.not_found,
-                    result.unchanged, result.updated + len(changed_ids)
-                )
+                    blank_year += 1
+                else:
+                    n_number = row["N-NUMBER"].strip().upper()
+                    if not n_number:
+                        raise PopulationError(
+                            f"YEAR MFR is set but N-NUMBER is blank at MASTER.txt row {row_number}"
+                        )
+                    aircraft = registrations.get("N" + n_number)
+                    if not aircraft:
+                        not_found += 1
+                    else:
+                        # Record changes in the index too, so a repeated N-NUMBER sees earlier updates.
+                        changed = [entry for entry in aircraft if entry[1] != year]
+                        if not changed:
+                            unchanged += 1
+                        for entry in changed:
+                            entry[1] = year
+                            changes[entry[0]] = year
+                        updated += len(changed)
                 if progress:
-                    progress(result, total_records)
-            if progress and total_records == 0:
-                progress(result, total_records)
+                    consumed_bytes = source.buffer.tell()
+                    if consumed_bytes != reported_bytes:
+                        reported_bytes = consumed_bytes
+                        progress(
+                            PopulationResult(processed, blank_year, not_found, unchanged, updated),
+                            min(consumed_bytes, total_bytes - 1),
+                            total_bytes,
+                        )
+
+            connection.executemany(
+                "UPDATE AIRCRAFT SET Manufactured = ? WHERE Id = ?",
+                ((year, identifier) for identifier, year in changes.items()),
+            )
+            result = PopulationResult(processed, blank_year, not_found, unchanged, updated)
+            if progress:
+                progress(result, total_bytes, total_bytes)
             connection.commit()
         except Exception:
             connection.rollback()
@@ -218,7 +206,6 @@ def main(arguments: Sequence[str] | None = None) -> int:
     """Run the importer and print its summary."""
     options = parse_arguments(arguments)
     try:
-        print("Counting MASTER.txt records...", file=sys.stderr)
         progress_bar = ProgressBar()
         result = populate(options.master, options.database, progress_bar.update)
     except (PopulationError, csv.Error, sqlite3.Error, OSError) as error:
@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import argparse
+import csv
 import math
 import os
 import re
 import sqlite3
 import sys
+import time
 import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, replace
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Sequence
+from typing import Iterator, Sequence
+
+# The streaming KML reader lives beside this script and is shared with the reporting suite.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from kml_reader import iter_placemarks  # noqa: E402
+
+# NumPy is optional: without it the same calculations run as scalar Python loops.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 EARTH_RADIUS_METRES = 6_371_000.0
@@ -49,6 +64,28 @@ class DatabasePosition:
     distance: float | None
 
 
+@dataclass(frozen=True)
+class BatchEntry:
+    """Identify one KML file and the session it populates in a batch run."""
+
+    session: int
+    kml: Path
+    address: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Report the outcome of populating one batch entry."""
+
+    entry: BatchEntry
+    points: int = 0
+    address: str | None = None
+    mappings: int = 0
+    rows: int = 0
+    fields: int = 0
+    error: str | None = None
+
+
 def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
     """Parse command-line options.
 
@@ -57,15 +94,35 @@ def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespac
     """
     # Keep the existing named options while changing the source format to KML.
     parser = argparse.ArgumentParser()
-    parser.add_argument("-s", "--session", type=int, required=True, help="SESSION.Id to update")
-    parser.add_argument(
-        "-k", "--kml", type=Path, required=True, help="KML file containing the flight path"
+    parser.add_argument("-s", "--session", type=int, help="SESSION.Id to update")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-k", "--kml", type=Path, help="KML file containing the flight path")
+    source.add_argument(
+        "-b",
+        "--batch",
+        type=Path,
+        help="folder of KML files for --session, or a manifest CSV with Session ID,KML[,Address] columns",
     )
     parser.add_argument("-a", "--address", help="ICAO address, required when callsign lookup is inconclusive")
     parser.add_argument("-db", "--database",type=Path,help="SQLite database path")
     parser.add_argument("-dr", "--dry-run",action="store_true",
                         help="validate and report changes without committing them")
-    return parser.parse_args(arguments)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes used to parse KML files in batch mode")
+    options = parser.parse_args(arguments)
+
+    # A manifest names the session and address for each file; every other source needs the session on
+    # the command line.
+    manifest = options.batch is not None and not options.batch.is_dir()
+    if options.session is None and not manifest:
+        parser.error("--session is required unless --batch names a manifest CSV")
+    if manifest and options.session is not None:
+        parser.error("--session cannot be used with a manifest CSV; use its Session ID column")
+    if manifest and options.address is not None:
+        parser.error("--address cannot be used with a manifest CSV; use its Address column")
+    if options.workers < 1:
+        parser.error("--workers must be a positive integer")
+    return options
 
 
 def resolve_database_path(argument_path: Path | None) -> Path:
@@ -186,49 +243,51 @@ def read_kml_positions(kml_path: Path) -> list[KmlPosition]:
     # Validate the path before parsing it to provide a concise diagnostic.
     if not kml_path.is_file():
         raise PopulationError(f"KML file does not exist: {kml_path}")
+
+    # Stream Placemarks so large archives never hold the whole element tree in memory.
+    observations: list[tuple[datetime, float, float, float, int]] = []
+    document_name: str | None = None
     try:
-        tree = ET.parse(kml_path)
+        for placemark in iter_placemarks(kml_path):
+            document_name = placemark.document_name
+            # Only timestamped Point placemarks represent individual flight observations.
+            when = placemark.element.find("./{*}TimeStamp/{*}when")
+            coordinates = placemark.element.find("./{*}Point/{*}coordinates")
+            if when is None or coordinates is None:
+                continue
+            placemark_number = placemark.number
+            latitude, longitude, altitude_metres = parse_kml_coordinates(
+                coordinates.text or "", placemark_number
+            )
+            description = placemark.element.find("./{*}description")
+            observations.append(
+                (
+                    parse_kml_timestamp(when.text or "", placemark_number),
+                    latitude,
+                    longitude,
+                    parse_kml_altitude(
+                        description.text if description is not None and description.text else "",
+                        altitude_metres,
+                        placemark_number,
+                    ),
+                    placemark_number,
+                )
+            )
     except ET.ParseError as error:
         raise PopulationError(f"KML is not valid XML: {error}") from error
     except OSError as error:
         raise PopulationError(f"Unable to read KML file: {error}") from error
 
-    # Read the aircraft callsign once from the document-level metadata.
-    document_name = tree.find(".//{*}Document/{*}name")
-    if document_name is None or not document_name.text:
-        raise PopulationError("KML has no Document/name callsign.")
-    callsign = parse_kml_callsign(document_name.text)
-
-    positions: list[KmlPosition] = []
-    for placemark_number, placemark in enumerate(tree.findall(".//{*}Placemark"), start=1):
-        # Only timestamped Point placemarks represent individual flight observations.
-        when = placemark.find("./{*}TimeStamp/{*}when")
-        coordinates = placemark.find("./{*}Point/{*}coordinates")
-        if when is None or coordinates is None:
-            continue
-        latitude, longitude, altitude_metres = parse_kml_coordinates(
-            coordinates.text or "", placemark_number
-        )
-        description = placemark.find("./{*}description")
-        positions.append(
-            KmlPosition(
-                parse_kml_timestamp(when.text or "", placemark_number),
-                callsign,
-                latitude,
-                longitude,
-                parse_kml_altitude(
-                    description.text if description is not None and description.text else "",
-                    altitude_metres,
-                    placemark_number,
-                ),
-                placemark_number,
-            )
-        )
-
     # Aircraft inference uses the document callsign and requires at least one usable point.
-    if not positions:
+    if not observations:
         raise PopulationError("KML contains no timestamped Point position records.")
-    return positions
+    if not document_name:
+        raise PopulationError("KML has no Document/name callsign.")
+    callsign = parse_kml_callsign(document_name)
+    return [
+        KmlPosition(timestamp, callsign, latitude, longitude, altitude, placemark_number)
+        for timestamp, latitude, longitude, altitude, placemark_number in observations
+    ]
 
 
 def validate_schema(connection: sqlite3.Connection) -> None:
@@ -358,24 +417,76 @@ def map_positions(
     :param database_positions: Candidate POSITION records.
     :return: Mapping from POSITION identifier to its closest KML point.
     """
+    # Collapse equal timestamps to their lowest identifier, which always wins the tie-break.
+    timestamps: list[datetime] = []
+    identifiers: list[int] = []
+    for position in sorted(
+        database_positions, key=lambda position: (position.timestamp, position.identifier)
+    ):
+        if timestamps and timestamps[-1] == position.timestamp:
+            continue
+        timestamps.append(position.timestamp)
+        identifiers.append(position.identifier)
+
     # Retain only the closest KML point when several source points select one POSITION record.
     mappings: dict[int, KmlPosition] = {}
     differences: dict[int, float] = {}
     for kml_position in kml_positions:
-        closest = min(
-            database_positions,
-            key=lambda position: (
-                abs((position.timestamp - kml_position.timestamp).total_seconds()),
-                position.identifier,
-            ),
+        # The nearest record is one of the two neighbours either side of the insertion point.
+        index = bisect_left(timestamps, kml_position.timestamp)
+        difference, identifier = min(
+            (
+                abs((timestamps[candidate] - kml_position.timestamp).total_seconds()),
+                identifiers[candidate],
+            )
+            for candidate in (index - 1, index)
+            if 0 <= candidate < len(timestamps)
         )
-        difference = abs((closest.timestamp - kml_position.timestamp).total_seconds())
-        if closest.identifier not in differences or difference < differences[closest.identifier]:
-            mappings[closest.identifier] = kml_position
-            differences[closest.identifier] = difference
+        if identifier not in differences or difference < differences[identifier]:
+            mappings[identifier] = kml_position
+            differences[identifier] = difference
     return mappings
 
 
+def local_clock_offset(kml_positions: Sequence[KmlPosition]) -> timedelta | None:
+    """Find the host UTC offset shared by every KML timestamp.
+
+    :param kml_positions: Validated source positions.
+    :return: Offset to add to each UTC clock value, or None if it may vary across the track.
+    """
+    # Zone transitions are months apart, so equal offsets at both ends of a day-long span hold throughout.
+    earliest = min(position.timestamp for position in kml_positions)
+    latest = max(position.timestamp for position in kml_positions)
+    if latest - earliest > timedelta(days=1):
+        return None
+    offsets = {
+        timestamp.replace(tzinfo=timezone.utc).astimezone().utcoffset()
+        for timestamp in (earliest, latest)
+    }
+    return offsets.pop() if len(offsets) == 1 else None
+
+
+def to_local_clock(timestamp: datetime, offset: timedelta | None) -> datetime:
+    """Convert a naive UTC clock value to the host's naive local clock.
+
+    :param timestamp: Naive UTC datetime.
+    :param offset: Precomputed local offset, or None to look it up for this instant.
+    :return: Naive local datetime.
+    """
+    if offset is not None:
+        return timestamp + offset
+    return timestamp.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def to_epoch_microseconds(timestamps: Sequence[datetime]) -> np.ndarray:
+    """Convert naive datetimes to an int64 array of microseconds since the epoch.
+
+    :param timestamps: Naive datetimes.
+    :return: Integer array with one element per timestamp.
+    """
+    return np.array(timestamps, dtype="datetime64[us]").astype(np.int64)
+
+
 def restrict_kml_positions_to_database_range(
     kml_positions: Sequence[KmlPosition],
     database_positions: Sequence[DatabasePosition],
@@ -389,28 +500,48 @@ def restrict_kml_positions_to_database_range(
     # SQLite does not retain DateTime.Kind, and tracker hosts may store either local or UTC clocks.
     first_timestamp = database_positions[0].timestamp
     last_timestamp = database_positions[-1].timestamp
-    local_positions = [
-        replace(
-            position,
-            timestamp=position.timestamp.replace(tzinfo=timezone.utc).astimezone().replace(
-                tzinfo=None
-            ),
-        )
-        for position in kml_positions
-    ]
+    offset = local_clock_offset(kml_positions)
+
+    if np is not None:
+        # Compare integer epoch columns, shifting by the shared offset rather than per point.
+        utc_clock = to_epoch_microseconds([position.timestamp for position in kml_positions])
+        if offset is not None:
+            local_clock = utc_clock + offset // timedelta(microseconds=1)
+        else:
+            local_clock = to_epoch_microseconds(
+                [to_local_clock(position.timestamp, None) for position in kml_positions]
+            )
+        first, last = to_epoch_microseconds([first_timestamp, last_timestamp])
+        utc_inside = (utc_clock >= first) & (utc_clock <= last)
+        local_inside = (local_clock >= first) & (local_clock <= last)
+        utc_overlap = int(np.count_nonzero(utc_inside))
+        local_overlap = int(np.count_nonzero(local_inside))
+        use_local = local_overlap > utc_overlap
+        retained = np.flatnonzero(local_inside if use_local else utc_inside).tolist()
+    else:
+        local_timestamps = [to_local_clock(position.timestamp, offset) for position in kml_positions]
+        utc_retained = [
+            index
+            for index, position in enumerate(kml_positions)
+            if first_timestamp <= position.timestamp <= last_timestamp
+        ]
+        local_retained = [
+            index
+            for index, timestamp in enumerate(local_timestamps)
+            if first_timestamp <= timestamp <= last_timestamp
+        ]
+        use_local = len(local_retained) > len(utc_retained)
+        retained = local_retained if use_local else utc_retained
 
     # Select the interpretation with the greatest inclusive overlap; prefer UTC on a tie.
-    utc_overlap = sum(
-        first_timestamp <= position.timestamp <= last_timestamp for position in kml_positions
-    )
-    local_overlap = sum(
-        first_timestamp <= position.timestamp <= last_timestamp for position in local_positions
-    )
-    aligned_positions = local_positions if local_overlap > utc_overlap else kml_positions
+    if not use_local:
+        return [kml_positions[index] for index in retained]
     return [
-        position
-        for position in aligned_positions
-        if first_timestamp <= position.timestamp <= last_timestamp
+        replace(
+            kml_positions[index],
+            timestamp=to_local_clock(kml_positions[index].timestamp, offset),
+        )
+        for index in retained
     ]
 
 
@@ -437,74 +568,175 @@ def great_circle_distance_nautical_miles(
     return central_angle * EARTH_RADIUS_METRES / METRES_PER_NAUTICAL_MILE
 
 
-def run(options: argparse.Namespace) -> tuple[str, int, int, int]:
-    """Execute retrospective population in one transaction.
+def great_circle_distances_nautical_miles(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+) -> list[float]:
+    """Calculate great-circle distances from one origin to many coordinates.
 
-    :param options: Parsed command-line options.
+    :param latitude: Origin latitude in degrees.
+    :param longitude: Origin longitude in degrees.
+    :param latitudes: Destination latitudes in degrees.
+    :param longitudes: Destination longitudes in degrees.
+    :return: Great-circle distances in nautical miles, in input order.
+    """
+    if np is None:
+        return [
+            great_circle_distance_nautical_miles(latitude, longitude, latitude2, longitude2)
+            for latitude2, longitude2 in zip(latitudes, longitudes, strict=True)
+        ]
+
+    # Apply the scalar haversine formula to whole columns at once.
+    latitude2 = np.asarray(latitudes, dtype=float)
+    longitude2 = np.asarray(longitudes, dtype=float)
+    phi1, phi2 = math.radians(latitude), np.radians(latitude2)
+    delta_phi = np.radians(latitude2 - latitude)
+    delta_lambda = np.radians(longitude2 - longitude)
+    haversine = (
+        np.sin(delta_phi / 2.0) ** 2
+        + math.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2.0) ** 2
+    )
+    central_angle = 2.0 * np.arctan2(np.sqrt(haversine), np.sqrt(1.0 - haversine))
+    return (central_angle * EARTH_RADIUS_METRES / METRES_PER_NAUTICAL_MILE).tolist()
+
+
+def apply_updates(
+    connection: sqlite3.Connection,
+    updates: Sequence[tuple[int, float, float, float, float]],
+) -> tuple[int, int]:
+    """Stage candidate values and fill NULL POSITION columns with one UPDATE.
+
+    :param connection: Open SQLite connection inside a write transaction.
+    :param updates: POSITION identifier with altitude, latitude, longitude and distance.
+    :return: Changed row count and changed field count.
+    """
+    # A TEMP table keeps the staged values private to this connection and out of the tracker file.
+    connection.execute("DROP TABLE IF EXISTS temp.POSITION_UPDATE")
+    connection.execute(
+        """CREATE TEMP TABLE POSITION_UPDATE (
+               Id INTEGER PRIMARY KEY,
+               Altitude REAL,
+               Latitude REAL,
+               Longitude REAL,
+               Distance REAL
+           )"""
+    )
+    try:
+        connection.executemany(
+            "INSERT INTO temp.POSITION_UPDATE VALUES (?, ?, ?, ?, ?)", updates
+        )
+
+        # Count against the locked rows so the report matches exactly what the UPDATE fills.
+        changed_rows, changed_fields = connection.execute(
+            """SELECT COUNT(*), COALESCE(SUM(Changed), 0)
+               FROM (
+                   SELECT (p.Altitude IS NULL AND u.Altitude IS NOT NULL)
+                        + (p.Latitude IS NULL AND u.Latitude IS NOT NULL)
+                        + (p.Longitude IS NULL AND u.Longitude IS NOT NULL)
+                        + (p.Distance IS NULL AND u.Distance IS NOT NULL) AS Changed
+                   FROM temp.POSITION_UPDATE AS u
+                   INNER JOIN POSITION AS p ON p.Id = u.Id
+               )
+               WHERE Changed > 0"""
+        ).fetchone()
+        connection.execute(
+            """UPDATE POSITION
+               SET Altitude = COALESCE(POSITION.Altitude, u.Altitude),
+                   Latitude = COALESCE(POSITION.Latitude, u.Latitude),
+                   Longitude = COALESCE(POSITION.Longitude, u.Longitude),
+                   Distance = COALESCE(POSITION.Distance, u.Distance)
+               FROM temp.POSITION_UPDATE AS u
+               WHERE POSITION.Id = u.Id
+                 AND (POSITION.Altitude IS NULL OR POSITION.Latitude IS NULL
+                      OR POSITION.Longitude IS NULL OR POSITION.Distance IS NULL)"""
+        )
+    finally:
+        connection.execute("DROP TABLE temp.POSITION_UPDATE")
+    return changed_rows, changed_fields
+
+
+def load_receiver(connection: sqlite3.Connection, session_id: int) -> tuple[float, float]:
+    """Read the receiver position used to calculate distances for a session.
+
+    :param connection: Open SQLite connection.
+    :param session_id: Target observation session identifier.
+    :return: Receiver latitude and longitude.
+    :raises PopulationError: If the session has no complete receiver position.
+    """
+    # Distance is meaningless without both receiver coordinates, so refuse a partial position.
+    receiver = connection.execute(
+        "SELECT ReceiverLatitude, ReceiverLongitude FROM SESSION WHERE Id = ?",
+        (session_id,),
+    ).fetchone()
+    if receiver is None or receiver[0] is None or receiver[1] is None:
+        raise PopulationError(f"Session {session_id} has no complete receiver position.")
+    return float(receiver[0]), float(receiver[1])
+
+
+def populate_positions(
+    connection: sqlite3.Connection,
+    session_id: int,
+    kml_positions: Sequence[KmlPosition],
+    supplied_address: str | None,
+    receivers: dict[int, tuple[float, float]],
+    dry_run: bool,
+) -> tuple[str, int, int, int]:
+    """Populate one aircraft's NULL position values in a single transaction.
+
+    :param connection: Open SQLite connection with a validated schema.
+    :param session_id: Target observation session identifier.
+    :param kml_positions: Validated source positions for one aircraft.
+    :param supplied_address: Optional ICAO address overriding callsign inference.
+    :param receivers: Receiver positions already read, keyed by session identifier.
+    :param dry_run: Whether to roll back rather than commit the changes.
     :return: Address, mapping count, changed row count and changed field count.
     """
-    # Validate external inputs before taking a write lock on the database.
-    database_path = resolve_database_path(options.database)
-    kml_positions = read_kml_positions(options.kml)
-    connection = sqlite3.connect(database_path)
     try:
-        validate_schema(connection)
-        connection.execute("BEGIN IMMEDIATE")
+        # Reads and matching run outside the write lock so the live tracker is not kept waiting.
         address = identify_address(
-            connection, options.session, kml_positions[0].callsign, options.address
+            connection, session_id, kml_positions[0].callsign, supplied_address
         )
-        database_positions = load_database_positions(connection, options.session, address)
+        database_positions = load_database_positions(connection, session_id, address)
         eligible_kml_positions = restrict_kml_positions_to_database_range(
             kml_positions, database_positions
         )
         mappings = map_positions(eligible_kml_positions, database_positions)
+        if session_id not in receivers:
+            receivers[session_id] = load_receiver(connection, session_id)
+        receiver_latitude, receiver_longitude = receivers[session_id]
 
-        # Snapshot original nullable values before applying updates for accurate reporting.
-        originals = {
-            position.identifier: (
-                position.altitude,
-                position.latitude,
-                position.longitude,
-                position.distance,
-            )
+        # Skip rows with no NULL column to fill, which also keeps the staging table small.
+        incomplete = {
+            position.identifier
             for position in database_positions
+            if None
+            in (position.altitude, position.latitude, position.longitude, position.distance)
         }
-        receiver = connection.execute(
-            "SELECT ReceiverLatitude, ReceiverLongitude FROM SESSION WHERE Id = ?",
-            (options.session,),
-        ).fetchone()
-        if receiver is None or receiver[0] is None or receiver[1] is None:
-            raise PopulationError(f"Session {options.session} has no complete receiver position.")
-
-        changed_rows = 0
-        changed_fields = 0
-        for position_id, source in mappings.items():
-            # Populate only NULL columns and calculate distance in nautical miles.
-            distance = great_circle_distance_nautical_miles(
-                float(receiver[0]), float(receiver[1]), source.latitude, source.longitude
-            )
-            old_values = originals[position_id]
-            new_values = (source.altitude, source.latitude, source.longitude, distance)
-            changed = sum(
-                old is None and new is not None
-                for old, new in zip(old_values, new_values, strict=True)
-            )
-            if not changed:
-                continue
-            connection.execute(
-                """UPDATE POSITION
-                   SET Altitude = COALESCE(Altitude, ?),
-                       Latitude = COALESCE(Latitude, ?),
-                       Longitude = COALESCE(Longitude, ?),
-                       Distance = COALESCE(Distance, ?)
-                   WHERE Id = ?""",
-                (*new_values, position_id),
-            )
-            changed_rows += 1
-            changed_fields += changed
+        pending = [
+            (position_id, source)
+            for position_id, source in mappings.items()
+            if position_id in incomplete
+        ]
+        # Populate only NULL columns and calculate distance in nautical miles.
+        distances = great_circle_distances_nautical_miles(
+            receiver_latitude,
+            receiver_longitude,
+            [source.latitude for _, source in pending],
+            [source.longitude for _, source in pending],
+        )
+        updates = [
+            (position_id, source.altitude, source.latitude, source.longitude, distance)
+            for (position_id, source), distance in zip(pending, distances, strict=True)
+        ]
+
+        # The write lock now covers only staging and a single set-based UPDATE.
+        connection.execute("BEGIN IMMEDIATE")
+        changed_rows, changed_fields = apply_updates(connection, updates)
 
         # A dry run exercises the full mapping and update path, then discards it atomically.
-        if options.dry_run:
+        if dry_run:
             connection.rollback()
         else:
             connection.commit()
@@ -512,10 +744,170 @@ def run(options: argparse.Namespace) -> tuple[str, int, int, int]:
     except Exception:
         connection.rollback()
         raise
+
+
+def run(options: argparse.Namespace) -> tuple[str, int, int, int]:
+    """Execute retrospective population in one transaction.
+
+    :param options: Parsed command-line options.
+    :return: Address, mapping count, changed row count and changed field count.
+    """
+    # Validate external inputs before opening the database.
+    database_path = resolve_database_path(options.database)
+    kml_positions = read_kml_positions(options.kml)
+    connection = sqlite3.connect(database_path)
+    try:
+        validate_schema(connection)
+        return populate_positions(
+            connection, options.session, kml_positions, options.address, {}, options.dry_run
+        )
+    finally:
+        connection.close()
+
+
+def read_batch_entries(
+    batch_path: Path, session_id: int | None, address: str | None
+) -> list[BatchEntry]:
+    """List the KML files and sessions named by a batch folder or manifest.
+
+    :param batch_path: Folder of KML files or manifest CSV path.
+    :param session_id: Session applied to every file in a folder.
+    :param address: Optional ICAO address applied to every file in a folder.
+    :return: Batch entries in processing order.
+    :raises PopulationError: If the folder or manifest is unusable.
+    """
+    if batch_path.is_dir():
+        # Sort folder contents so repeated runs report files in a stable order.
+        if session_id is None:
+            raise PopulationError("--session is required when --batch is a folder.")
+        entries = [
+            BatchEntry(session_id, kml_path, address)
+            for kml_path in sorted(batch_path.glob("*.kml"))
+            if kml_path.is_file()
+        ]
+        if not entries:
+            raise PopulationError(f"Batch folder contains no KML files: {batch_path}")
+        return entries
+
+    if not batch_path.is_file():
+        raise PopulationError(f"Batch folder or manifest does not exist: {batch_path}")
+
+    # Relative KML paths in a manifest are resolved from the manifest's own folder.
+    entries = []
+    try:
+        with batch_path.open("r", encoding="utf-8-sig", newline="") as manifest:
+            reader = csv.DictReader(manifest)
+            missing = {"Session ID", "KML"}.difference(reader.fieldnames or [])
+            if missing:
+                raise PopulationError(
+                    f"Batch manifest is missing required column(s): {', '.join(sorted(missing))}"
+                )
+            for row_number, row in enumerate(reader, start=2):
+                session_text = (row.get("Session ID") or "").strip()
+                kml_text = (row.get("KML") or "").strip()
+                if not session_text and not kml_text:
+                    continue
+                try:
+                    session = int(session_text)
+                except ValueError as error:
+                    raise PopulationError(
+                        f"Batch manifest row {row_number} has an invalid Session ID: {session_text}"
+                    ) from error
+                if not kml_text:
+                    raise PopulationError(f"Batch manifest row {row_number} has no KML path.")
+                entries.append(
+                    BatchEntry(
+                        session,
+                        batch_path.parent / kml_text,
+                        (row.get("Address") or "").strip() or None,
+                    )
+                )
+    except OSError as error:
+        raise PopulationError(f"Unable to read batch manifest: {error}") from error
+    if not entries:
+        raise PopulationError("Batch manifest contains no entries.")
+    return entries
+
+
+def read_batch_kml(kml_path: Path) -> list[KmlPosition] | str:
+    """Read one batch KML file, returning a failure as its message.
+
+    :param kml_path: Source KML path.
+    :return: Validated positions, or the error message if the file is unusable.
+    """
+    # Returning the message keeps one bad file from aborting the remaining worker results.
+    try:
+        return read_kml_positions(kml_path)
+    except PopulationError as error:
+        return str(error)
+
+
+def run_batch(options: argparse.Namespace) -> Iterator[BatchResult]:
+    """Populate every batch entry through one database connection.
+
+    :param options: Parsed command-line options.
+    :return: Iterator yielding each entry's result as soon as it has been applied.
+    """
+    # Resolve everything shared by the batch once, before any worker is started.
+    database_path = resolve_database_path(options.database)
+    entries = read_batch_entries(options.batch, options.session, options.address)
+    connection = sqlite3.connect(database_path)
+    try:
+        validate_schema(connection)
+        receivers: dict[int, tuple[float, float]] = {}
+        with ProcessPoolExecutor(max_workers=min(options.workers, len(entries))) as executor:
+            # Workers parse ahead while earlier files are matched and written in manifest order.
+            parsed_files = executor.map(read_batch_kml, [entry.kml for entry in entries])
+            for entry, parsed in zip(entries, parsed_files):
+                if isinstance(parsed, str):
+                    yield BatchResult(entry, error=parsed)
+                    continue
+                try:
+                    address, mappings, rows, fields = populate_positions(
+                        connection, entry.session, parsed, entry.address, receivers, options.dry_run
+                    )
+                except (PopulationError, sqlite3.Error) as error:
+                    yield BatchResult(entry, len(parsed), error=str(error))
+                    continue
+                yield BatchResult(entry, len(parsed), address, mappings, rows, fields)
     finally:
         connection.close()
 
 
+def main_batch(options: argparse.Namespace, mode: str) -> int:
+    """Run a batch, rendering one line per file and a throughput summary.
+
+    :param options: Parsed command-line options.
+    :param mode: Verb describing whether changes are committed.
+    :return: Process exit status; non-zero when any file failed.
+    """
+    # Per-file failures are reported in place so the remaining files are still processed.
+    started = time.perf_counter()
+    files = failed = points = rows = fields = 0
+    for result in run_batch(options):
+        files += 1
+        points += result.points
+        label = f"Session {result.entry.session}, {result.entry.kml.name}"
+        if result.error is not None:
+            failed += 1
+            print(f"{label}: Error: {result.error}", file=sys.stderr)
+            continue
+        rows += result.rows
+        fields += result.fields
+        print(
+            f"{label}: aircraft {result.address}, mapped {result.mappings} POSITION record(s). "
+            f"{mode} {result.rows} row(s) and {result.fields} NULL field(s)."
+        )
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"Batch complete - {files} file(s), {failed} failed. "
+        f"{mode} {rows} row(s) and {fields} NULL field(s) from {points} KML point(s) "
+        f"in {elapsed:.2f}s ({points / elapsed:,.0f} points/s, {rows / elapsed:,.0f} rows/s)."
+    )
+    return 1 if failed else 0
+
+
 def main(arguments: Sequence[str] | None = None) -> int:
     """Run the command-line program and render a concise result.
 
@@ -525,8 +917,10 @@ def main(arguments: Sequence[str] | None = None) -> int:
     # Convert expected operational failures into user-facing messages without tracebacks.
     try:
         options = parse_arguments(arguments)
-        address, mappings, rows, fields = run(options)
         mode = "Would update" if options.dry_run else "Updated"
+        if options.batch is not None:
+            return main_batch(options, mode)
+        address, mappings, rows, fields = run(options)
         print(
             f"Aircraft {address}: mapped {mappings} POSITION record(s). "
             f"{mode} {rows} row(s) and {fields} NULL field(s)."
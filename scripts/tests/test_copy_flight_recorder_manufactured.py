@@ -65,6 +65,47 @@ class CopyFlightRecorderManufacturedTest(unittest.TestCase):
             [("G-NEW", 2012), ("G-KEEP", 1998), ("G-BABY", None), ("G-BLANK", None)],
         )
 
+    def test_verify_mode_matches_set_based_counters(self) -> None:
+        with sqlite3.connect(self.source) as connection:
+            connection.executescript(
+                """
+                INSERT INTO flights VALUES ('G-NEW', 2015);
+                INSERT INTO flights VALUES ('G-TEXT', '2003');
+                INSERT INTO flights VALUES ('G-REAL', 2026.0);
+                INSERT INTO flights VALUES (NULL, 2000);
+                """
+            )
+        with sqlite3.connect(self.target) as connection:
+            connection.executescript(
+                """
+                INSERT INTO AIRCRAFT VALUES (5, 'G-NEW', NULL);
+                INSERT INTO AIRCRAFT VALUES (6, 'G-TEXT', NULL);
+                INSERT INTO AIRCRAFT VALUES (7, 'G-REAL', NULL);
+                """
+            )
+        backup = self.target.read_bytes()
+        result = MODULE.copy_manufactured(self.source, self.target, current_year=2026)
+        with sqlite3.connect(self.target) as connection:
+            values = connection.execute("SELECT Id, Manufactured FROM AIRCRAFT ORDER BY Id").fetchall()
+
+        self.target.write_bytes(backup)
+        verified = MODULE.copy_manufactured(self.source, self.target, current_year=2026, verify=True)
+        with sqlite3.connect(self.target) as connection:
+            verified_values = connection.execute(
+                "SELECT Id, Manufactured FROM AIRCRAFT ORDER BY Id"
+            ).fetchall()
+
+        self.assertEqual(result, MODULE.CopyResult(9, 3, 3, 2, 1, 2))
+        self.assertEqual(verified, result)
+        self.assertEqual(verified_values, values)
+        self.assertEqual(values[4:], [(5, 2012), (6, 2003), (7, None)])
+
+    def test_rejects_an_invalid_manufacture_year(self) -> None:
+        with sqlite3.connect(self.source) as connection:
+            connection.execute("INSERT INTO flights VALUES ('G-BAD', '20x6')")
+        with self.assertRaisesRegex(MODULE.CopyError, "G-BAD"):
+            MODULE.copy_manufactured(self.source, self.target, current_year=2026)
+
     def test_progress_bar_reaches_one_hundred_percent(self) -> None:
         output = StringIO()
         bar = MODULE.ProgressBar(output=output, width=10)
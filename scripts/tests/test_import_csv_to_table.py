@@ -0,0 +1,223 @@
+"""Tests for batched CSV reference-data imports."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+SCRIPT_PATH = Path(__file__).parents[1] / "import-csv-to-table.py"
+SPEC = importlib.util.spec_from_file_location("import_csv_to_table", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+class ImportCsvToTableTest(unittest.TestCase):
+    """Exercise batch counting, duplicate handling and failure reporting."""
+
+    def setUp(self) -> None:
+        """Create a tracker database with an indexed MANUFACTURER table and one existing row.
+
+        :return: None.
+        """
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.database = self.root / "tracker.db"
+        self.csv_path = self.root / "manufacturers.csv"
+        with sqlite3.connect(self.database) as connection:
+            connection.executescript(
+                """
+                CREATE TABLE MANUFACTURER (Id INTEGER PRIMARY KEY, Name TEXT NOT NULL);
+                CREATE INDEX IX_MANUFACTURER_Name ON MANUFACTURER (Name);
+                INSERT INTO MANUFACTURER VALUES (3, 'Existing');
+                """
+            )
+
+    def tearDown(self) -> None:
+        """Remove the temporary database and CSV files.
+
+        :return: None.
+        """
+        self.temporary_directory.cleanup()
+
+    def write_csv(self, *rows: str) -> None:
+        """Write the MANUFACTURER CSV with its header row.
+
+        :param rows: CSV data lines without the header.
+        :return: None.
+        """
+        self.csv_path.write_text("Id,Name\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+    def names(self) -> list[tuple[int, str]]:
+        """Read every manufacturer.
+
+        :return: Identifier and name of each MANUFACTURER row, in identifier order.
+        """
+        with sqlite3.connect(self.database) as connection:
+            return connection.execute("SELECT Id, Name FROM MANUFACTURER ORDER BY Id").fetchall()
+
+    def test_counts_inserted_and_skipped_rows_across_batches(self) -> None:
+        """Count duplicates skipped by --ignore-duplicates separately from inserted rows.
+
+        :return: None.
+        """
+        self.write_csv("1,Airbus", "2,Boeing", "3,Duplicate", "4,Embraer", "5,Fokker")
+        result = MODULE.import_csv(
+            self.csv_path, self.database, "MANUFACTURER", ignore_duplicates=True, batch_size=2
+        )
+        self.assertEqual(result, (4, 1))
+        self.assertEqual(len(self.names()), 5)
+
+    def test_failed_batch_names_the_csv_row_and_rolls_back(self) -> None:
+        """Replay a failed batch row by row to name the CSV row, then roll back the import.
+
+        :return: None.
+        """
+        self.write_csv("1,Airbus", "2,Boeing", "4,Embraer", "3,Duplicate", "5,Fokker")
+        with self.assertRaisesRegex(ValueError, "CSV row 5"):
+            MODULE.import_csv(self.csv_path, self.database, "MANUFACTURER", batch_size=3)
+        self.assertEqual(self.names(), [(3, "Existing")])
+
+    def test_rejects_a_csv_without_an_id_column(self) -> None:
+        """Validate the header before importing anything.
+
+        :return: None.
+        """
+        self.csv_path.write_text("Name\nAirbus\n", encoding="utf-8")
+        with self.assertRaisesRegex(ValueError, "must contain an 'Id' column"):
+            MODULE.import_csv(self.csv_path, self.database, "MANUFACTURER")
+        self.assertEqual(self.names(), [(3, "Existing")])
+
+    def test_fast_load_recreates_deferred_indexes(self) -> None:
+        """Switch to WAL and rebuild the dropped secondary index before committing.
+
+        :return: None.
+        """
+        self.write_csv("1,Airbus", "2,Boeing")
+        result = MODULE.import_csv(
+            self.csv_path, self.database, "MANUFACTURER", fast=True, defer_indexes=True
+        )
+        self.assertEqual(result, (2, 0))
+        with sqlite3.connect(self.database) as connection:
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'MANUFACTURER'"
+            ).fetchall()
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(indexes, [("IX_MANUFACTURER_Name",)])
+
+    def test_refuses_to_load_while_another_writer_holds_the_database(self) -> None:
+        """Fail on the write lock rather than importing alongside another writer.
+
+        :return: None.
+        """
+        self.write_csv("1,Airbus")
+        MODULE.import_csv(self.csv_path, self.database, "MANUFACTURER", fast=True)
+        self.write_csv("2,Boeing")
+        writer = sqlite3.connect(self.database)
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            with mock.patch.object(MODULE, "LOCK_TIMEOUT_SECONDS", 0):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    MODULE.import_csv(self.csv_path, self.database, "MANUFACTURER", fast=True)
+        finally:
+            writer.rollback()
+            writer.close()
+        self.assertEqual(len(self.names()), 2)
+
+    def test_directory_import_follows_foreign_key_order(self) -> None:
+        """Load referenced tables first, whatever the file names sort as.
+
+        :return: None.
+        """
+        with sqlite3.connect(self.database) as connection:
+            connection.executescript(
+                """
+                CREATE TABLE MODEL (
+                    Id INTEGER PRIMARY KEY,
+                    ManufacturerId INTEGER NOT NULL REFERENCES MANUFACTURER (Id)
+                );
+                CREATE TABLE AIRCRAFT (
+                    Id INTEGER PRIMARY KEY,
+                    ModelId INTEGER NOT NULL REFERENCES MODEL (Id)
+                );
+                """
+            )
+        folder = self.root / "reference"
+        folder.mkdir()
+        (folder / "aircraft.csv").write_text("Id,ModelId\n1,10\n", encoding="utf-8")
+        (folder / "models-template.csv").write_text("Id,ManufacturerId\n10,1\n", encoding="utf-8")
+        (folder / "manufacturers.csv").write_text("Id,Name\n1,Airbus\n", encoding="utf-8")
+
+        results = MODULE.import_directory(folder, self.database, workers=2)
+
+        self.assertEqual(
+            [(table, inserted, skipped) for _, table, inserted, skipped in results],
+            [("MANUFACTURER", 1, 0), ("MODEL", 1, 0), ("AIRCRAFT", 1, 0)],
+        )
+
+    def test_directory_import_rolls_back_every_table_on_failure(self) -> None:
+        """Name the failing file and row, and leave the database unchanged.
+
+        :return: None.
+        """
+        folder = self.root / "reference"
+        folder.mkdir()
+        (folder / "manufacturers.csv").write_text("Id,Name\n1,Airbus\n3,Duplicate\n", encoding="utf-8")
+
+        with self.assertRaisesRegex(ValueError, "manufacturers.csv: Import failed at CSV row 3"):
+            MODULE.import_directory(folder, self.database, workers=1)
+        self.assertEqual(self.names(), [(3, "Existing")])
+
+    def test_directory_import_streams_rows_in_batches(self) -> None:
+        """Insert every row of a file that spans more queued batches than the queue holds.
+
+        :return: None.
+        """
+        folder = self.root / "reference"
+        folder.mkdir()
+        rows = "".join(f"{number},Maker {number}\n" for number in range(10, 30))
+        (folder / "manufacturers.csv").write_text("Id,Name\n" + rows, encoding="utf-8")
+
+        results = MODULE.import_directory(folder, self.database, batch_size=2, workers=1)
+
+        self.assertEqual([(table, inserted) for _, table, inserted, _ in results], [("MANUFACTURER", 20)])
+        self.assertEqual(len(self.names()), 21)
+
+    def test_directory_import_rejects_unknown_columns_from_the_worker(self) -> None:
+        """Report a header rejected by a worker with the file name and import nothing.
+
+        :return: None.
+        """
+        folder = self.root / "reference"
+        folder.mkdir()
+        (folder / "manufacturers.csv").write_text("Id,Name,Country\n1,Airbus,FR\n", encoding="utf-8")
+
+        with self.assertRaisesRegex(ValueError, "manufacturers.csv: .*Country"):
+            MODULE.import_directory(folder, self.database, workers=1)
+        self.assertEqual(self.names(), [(3, "Existing")])
+
+    def test_rejects_table_with_directory(self) -> None:
+        """Refuse --table with --directory, where tables are named after the files.
+
+        :return: None.
+        """
+        folder = self.root / "reference"
+        folder.mkdir()
+        arguments = ["import-csv-to-table.py", "-dir", str(folder), "-db", str(self.database), "-t", "MANUFACTURER"]
+
+        with mock.patch.object(sys, "argv", arguments), mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(MODULE.main(), 1)
+        self.assertIn("--table cannot be used with --directory", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
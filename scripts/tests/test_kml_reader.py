@@ -0,0 +1,91 @@
+"""Tests for the streaming KML Placemark reader."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from kml_reader import iter_placemarks  # noqa: E402
+
+
+class KmlReaderTest(unittest.TestCase):
+    """Exercise Placemark context tracking and element release."""
+
+    def setUp(self) -> None:
+        """Create a KML file with nested and top-level Placemarks.
+
+        :return: None.
+        """
+        # Cover namespaced Folders, a nested Folder and a Placemark outside any Folder.
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.kml_path = Path(self.temporary_directory.name) / "track.kml"
+        self.kml_path.write_text(
+            """<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <name>-/TEST1</name>
+    <Folder>
+      <name>Outer</name>
+      <Placemark><name>first</name></Placemark>
+      <Folder>
+        <name>Inner</name>
+        <Placemark><name>second</name></Placemark>
+      </Folder>
+      <Placemark><name>third</name></Placemark>
+    </Folder>
+    <Placemark><name>fourth</name></Placemark>
+  </Document>
+</kml>
+""",
+            encoding="utf-8",
+        )
+
+    def tearDown(self) -> None:
+        """Remove temporary test files.
+
+        :return: None.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_reports_document_and_direct_folder(self) -> None:
+        """Number Placemarks in document order with their immediate Folder.
+
+        :return: None.
+        """
+        # Read each element while it is current, because the reader discards it afterwards.
+        placemarks = [
+            (
+                placemark.number,
+                placemark.element.findtext("{*}name"),
+                placemark.document_name,
+                placemark.folder_name,
+                placemark.folder_number,
+            )
+            for placemark in iter_placemarks(self.kml_path)
+        ]
+        self.assertEqual(
+            placemarks,
+            [
+                (1, "first", "-/TEST1", "Outer", 1),
+                (2, "second", "-/TEST1", "Inner", 2),
+                (3, "third", "-/TEST1", "Outer", 1),
+                (4, "fourth", "-/TEST1", None, None),
+            ],
+        )
+
+    def test_discards_consumed_placemarks(self) -> None:
+        """Clear each Placemark once the iterator has moved past it.
+
+        :return: None.
+        """
+        elements = [placemark.element for placemark in iter_placemarks(self.kml_path)]
+        self.assertTrue(all(len(element) == 0 for element in elements))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the Mictronics ICAO24 converter."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).parents[1] / "parse-mictronics-icao24.py"
+SPEC = importlib.util.spec_from_file_location("parse_mictronics_icao24", SCRIPT_PATH)
+MODULE = importlib.util.module_from_spec(SPEC)
+assert SPEC and SPEC.loader
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+class ParseMictronicsIcao24Test(unittest.TestCase):
+    """Check that chunked conversion reproduces the serial output exactly."""
+
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.temporary_directory.name)
+        self.input = self.root / "aircrafts.txt"
+        lines = []
+        for number in range(400):
+            address = f"{number:06X}" if number % 7 else f"{number:05x}z"
+            model = ("A320", "b738", "ZZZZ")[number % 3]
+            if number % 11 == 0:
+                lines.append("")
+            elif number % 13 == 0:
+                lines.append(f"{address}   G-É{number}   {model}")
+            else:
+                lines.append(f"{address.lower()}\tN{number}\t{model}\t")
+        self.input.write_bytes(("\ufeff" + "\r\n".join(lines) + "\r\n").encode("utf-8"))
+        self.model_codes = {"A320", "B738"}
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def convert_serial(self) -> tuple[tuple[int, int], bytes]:
+        output = self.root / "serial.csv"
+        counts = MODULE.convert(self.input, output, self.model_codes)
+        return counts, output.read_bytes()
+
+    def test_parallel_output_matches_serial(self) -> None:
+        expected = self.convert_serial()
+        for workers in (1, 2, 3, 8):
+            with self.subTest(workers=workers):
+                output = self.root / f"parallel-{workers}.csv"
+                counts = MODULE.convert_parallel(self.input, output, self.model_codes, workers)
+                self.assertEqual((counts, output.read_bytes()), expected)
+
+    def test_chunks_start_on_line_boundaries(self) -> None:
+        data = self.input.read_bytes()
+        ranges = MODULE.chunk_ranges(self.input, 16)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1 : start], b"\n")
+
+    def test_quoted_input_falls_back_to_serial_conversion(self) -> None:
+        with self.input.open("a", encoding="utf-8", newline="") as source:
+            source.write('ABCDEF\t"N1\nSPLIT"\tA320\r\n')
+        expected = self.convert_serial()
+        output = self.root / "parallel.csv"
+        counts = MODULE.convert_parallel(self.input, output, self.model_codes, 4)
+        self.assertEqual((counts, output.read_bytes()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
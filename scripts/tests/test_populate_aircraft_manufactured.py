@@ -60,6 +60,20 @@ class PopulateAircraftManufacturedTest(unittest.TestCase):
             ).fetchall()
         self.assertEqual(values, [(1, 1940), (2, 1928), (3, 1955)])
 
+    def test_repeated_registration_sees_earlier_update(self) -> None:
+        with sqlite3.connect(self.database) as connection:
+            connection.execute("INSERT INTO AIRCRAFT VALUES (4, ' N100', 1940)")
+        self.master.write_text(
+            "N-NUMBER,YEAR MFR\n100,1940\n100,1941\n100,1941\n", encoding="utf-8"
+        )
+        result = MODULE.populate(self.master, self.database)
+        self.assertEqual(result, MODULE.PopulationResult(3, 0, 0, 1, 3))
+        with sqlite3.connect(self.database) as connection:
+            values = connection.execute(
+                "SELECT Id, Manufactured FROM AIRCRAFT WHERE Id IN (1, 4) ORDER BY Id"
+            ).fetchall()
+        self.assertEqual(values, [(1, 1941), (4, 1941)])
+
     def test_invalid_year_rolls_back_all_updates(self) -> None:
         self.master.write_text(
             "N-NUMBER,YEAR MFR\n100,1940\n10006,unknown\n", encoding="utf-8"
@@ -82,9 +96,20 @@ class PopulateAircraftManufacturedTest(unittest.TestCase):
         progress_bar = MODULE.ProgressBar(output=output, width=10)
         result = MODULE.populate(self.master, self.database, progress_bar.update)
         rendered = output.getvalue()
-        self.assertIn("[##########] 100.0% (5/5) updated 2", rendered)
+        self.assertIn("[##########] 100.0% (5 records) updated 2", rendered)
         self.assertTrue(rendered.endswith("\n"))
 
+    def test_progress_is_measured_in_bytes_read(self) -> None:
+        calls = []
+        MODULE.populate(
+            self.master,
+            self.database,
+            lambda result, consumed, total: calls.append((result.processed, consumed, total)),
+        )
+        size = self.master.stat().st_size
+        self.assertEqual(calls[-1], (5, size, size))
+        self.assertTrue(all(consumed < total for _, consumed, total in calls[:-1]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import importlib.util
+import io
+import os
+import random
 import sqlite3
 import sys
 import tempfile
+import time
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
+from unittest import mock
 
 
 SCRIPT_PATH = Path(__file__).parents[1] / "populate-retrospective-flight-path.py"
@@ -148,6 +153,16 @@ class RetrospectiveFlightPathTest(unittest.TestCase):
         connection.close()
         self.assertIsNone(value)
 
+    def test_repeat_run_reports_no_changes(self) -> None:
+        """Report zero changes once every mapped NULL field has been filled.
+
+        :return: None.
+        """
+        # Counts come from the staged bulk update, so a second pass must find nothing to fill.
+        MODULE.run(self.options())
+        _, mappings, rows, fields = MODULE.run(self.options())
+        self.assertEqual((mappings, rows, fields), (2, 0, 0))
+
     def test_collision_uses_closest_kml_point(self) -> None:
         """Resolve two KML mappings to one position using the closest point.
 
@@ -159,6 +174,62 @@ class RetrospectiveFlightPathTest(unittest.TestCase):
         mapping = MODULE.map_positions(sources, [target])
         self.assertEqual(mapping[1].altitude, 2000)
 
+    def test_mapping_matches_brute_force_on_random_inputs(self) -> None:
+        """Match the original exhaustive nearest-timestamp search exactly.
+
+        :return: None.
+        """
+        # Whole-second offsets on a narrow range force duplicate timestamps and equidistant ties.
+        def brute_force(kml_positions, database_positions):
+            mappings = {}
+            differences = {}
+            for kml_position in kml_positions:
+                closest = min(
+                    database_positions,
+                    key=lambda position: (
+                        abs((position.timestamp - kml_position.timestamp).total_seconds()),
+                        position.identifier,
+                    ),
+                )
+                difference = abs((closest.timestamp - kml_position.timestamp).total_seconds())
+                if closest.identifier not in differences or difference < differences[closest.identifier]:
+                    mappings[closest.identifier] = kml_position
+                    differences[closest.identifier] = difference
+            return mappings
+
+        generator = random.Random(20260115)
+        start = datetime(2026, 1, 15, 10, 0, 0)
+        for _ in range(200):
+            database_positions = sorted(
+                (
+                    MODULE.DatabasePosition(
+                        identifier,
+                        start + timedelta(seconds=generator.randint(0, 60)),
+                        None,
+                        None,
+                        None,
+                        None,
+                    )
+                    for identifier in generator.sample(range(1, 1000), generator.randint(1, 40))
+                ),
+                key=lambda position: (position.timestamp, position.identifier),
+            )
+            kml_positions = [
+                MODULE.KmlPosition(
+                    start + timedelta(seconds=generator.randint(-10, 70)),
+                    "TEST1",
+                    51.0,
+                    -1.0,
+                    1000.0,
+                    number,
+                )
+                for number in range(1, generator.randint(1, 80))
+            ]
+            self.assertEqual(
+                MODULE.map_positions(kml_positions, database_positions),
+                brute_force(kml_positions, database_positions),
+            )
+
     def test_restricts_kml_points_to_database_timestamp_range(self) -> None:
         """Exclude KML points before the first and after the last database position.
 
@@ -205,6 +276,103 @@ class RetrospectiveFlightPathTest(unittest.TestCase):
         eligible = MODULE.restrict_kml_positions_to_database_range([source], targets)
         self.assertEqual(eligible, [source])
 
+    def test_batch_manifest_reports_each_file(self) -> None:
+        """Populate manifest entries through one connection and report per-file failures.
+
+        :return: None.
+        """
+        # A missing KML must be reported without preventing the valid entry from being applied.
+        manifest = self.root / "manifest.csv"
+        manifest.write_text("Session ID,KML,Address\n7,track.kml,\n7,missing.kml,abc123\n", encoding="utf-8")
+        options = MODULE.parse_arguments(
+            ["--batch", str(manifest), "--database", str(self.database), "--workers", "1"]
+        )
+        results = list(MODULE.run_batch(options))
+        self.assertEqual(
+            [(result.address, result.mappings, result.rows, result.fields) for result in results],
+            [("ABC123", 2, 2, 6), (None, 0, 0, 0)],
+        )
+        self.assertEqual(results[1].entry.address, "abc123")
+        self.assertRegex(results[1].error, "does not exist")
+
+    def test_batch_manifest_rejects_command_line_session_and_address(self) -> None:
+        """Refuse options a manifest would otherwise silently override.
+
+        :return: None.
+        """
+        # The manifest's own columns name each file's session and address.
+        manifest = self.root / "manifest.csv"
+        manifest.write_text("Session ID,KML,Address\n7,track.kml,\n", encoding="utf-8")
+        for option, value in (("--address", "abc123"), ("--session", "7")):
+            with self.subTest(option=option), mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit):
+                    MODULE.parse_arguments(
+                        ["--batch", str(manifest), option, value, "--database", str(self.database)]
+                    )
+                self.assertIn(f"{option} cannot be used with a manifest CSV", stderr.getvalue())
+
+    def test_batch_folder_requires_session(self) -> None:
+        """Reject a folder batch when no session identifies its KML files.
+
+        :return: None.
+        """
+        # argparse reports the problem as a usage error before any database work starts.
+        with self.assertRaises(SystemExit):
+            MODULE.parse_arguments(["--batch", str(self.root), "--database", str(self.database)])
+        options = MODULE.parse_arguments(
+            ["--batch", str(self.root), "--session", "7", "--database", str(self.database)]
+        )
+        self.assertEqual(MODULE.main_batch(options, "Updated"), 0)
+
+    @unittest.skipIf(MODULE.np is None, "NumPy is not installed")
+    def test_vectorised_distances_match_scalar_formula(self) -> None:
+        """Keep column distances within 1e-9 NM of the scalar haversine result.
+
+        :return: None.
+        """
+        generator = random.Random(1852)
+        latitudes = [generator.uniform(-90.0, 90.0) for _ in range(500)]
+        longitudes = [generator.uniform(-180.0, 180.0) for _ in range(500)]
+        distances = MODULE.great_circle_distances_nautical_miles(51.5, -1.0, latitudes, longitudes)
+        for distance, latitude, longitude in zip(distances, latitudes, longitudes):
+            self.assertAlmostEqual(
+                distance,
+                MODULE.great_circle_distance_nautical_miles(51.5, -1.0, latitude, longitude),
+                delta=1e-9,
+            )
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "changing the local zone needs time.tzset")
+    def test_restriction_matches_without_numpy(self) -> None:
+        """Select the same aligned KML points with and without the NumPy path.
+
+        :return: None.
+        """
+        # Run in a zone five hours behind UTC, so the local-clock interpretation differs from UTC.
+        with mock.patch.dict(os.environ, {"TZ": "EST+05"}):
+            time.tzset()
+            self.addCleanup(time.tzset)
+            start = datetime(2026, 8, 15, 10, 0, 0)
+            targets = [
+                MODULE.DatabasePosition(1, start, None, None, None, None),
+                MODULE.DatabasePosition(2, start + timedelta(hours=1), None, None, None, None),
+            ]
+            # Both clock interpretations retain some points, but more fall in range on the local clock.
+            # Spanning more than a day makes the offset vary, which exercises the per-point lookup too.
+            for last_day in (0, 2):
+                minutes = [*range(-30, 60, 20), *range(300, 360, 5), last_day * 24 * 60]
+                sources = [
+                    MODULE.KmlPosition(start + timedelta(minutes=minute), "TEST1", 51.0, -1.0, 1000, minute)
+                    for minute in minutes
+                ]
+                with self.subTest(last_day=last_day):
+                    expected = MODULE.restrict_kml_positions_to_database_range(sources, targets)
+                    self.assertEqual(
+                        [position.timestamp for position in expected],
+                        [start + timedelta(minutes=minute - 300) for minute in range(300, 360, 5)],
+                    )
+                    with mock.patch.object(MODULE, "np", None):
+                        self.assertEqual(MODULE.restrict_kml_positions_to_database_range(sources, targets), expected)
+
     def test_ambiguous_callsign_requires_address(self) -> None:
         """Reject callsigns associated with distinct addresses.
 